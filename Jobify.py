@@ -1,92 +1,153 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from bs4 import BeautifulSoup
 import csv
+import os
+
+from job_record import JobRecord
+from sites import SITES
+
+
+class JobifyConfig:
+    # Path to Chrome WebDriver; None lets Selenium Manager find a matching driver
+    CHROME_DRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH")
+    OUTPUT_FILENAME = "job4.csv"
+
+    # Job IDs are scraped from START_ID down to END_ID (inclusive)
+    START_ID = 1086
+    END_ID = 501
+    JOB_IDS = None  # explicit IDs (e.g. from discovery.py) instead of the range
+    BASE_URL = SITES["jobify"]["base_url"]  # $JOBIFY_BASE_URL overrides it, see sites.py
+    WAIT_TIMEOUT = 10
+
+
+COLUMNS = ["Job Title", "Job Link", "Salary", "Job Type", "Job Level", "Gender", "Age",
+           "Years of Experience", "Language", "Category", "Industry", "Location", "Qualification",
+           "Available Position", "Required Skills", "Job Requirement"]
+
+# Labels shown in the job detail block, in CSV column order (after title and link)
+DETAIL_LABELS = ["Salary:", "Job Type:", "Job Level:", "Gender:", "Age:", "Years of Experience:",
+                 "Language:", "Category:", "Industry:", "Location:", "Qualification:",
+                 "Available Position:", "Required Skills:"]
+
+# CSV column -> canonical field, and the fields the detail labels fill
+COLUMN_FIELDS = {column: field for field, column in SITES["jobify"]["fields"].items()}
+DETAIL_FIELDS = [COLUMN_FIELDS[column] for column in COLUMNS[2:-1]]
+
+
+def build_record(title, url, details, requirement):
+    """JobRecord from the extracted values (details in DETAIL_LABELS order, None when missing)"""
+    return JobRecord.build("jobify", title=title, url=url, requirements=requirement,
+                           **dict(zip(DETAIL_FIELDS, details)))
+
+
+def parse_job_page(html, url, parser="html.parser"):
+    """
+    Parse raw Jobify job page HTML into a JobRecord
+
+    Same fields as the Selenium scraper below; returns None when the page
+    has no job title. The requirement list is rendered by JavaScript, so on
+    plain HTTP responses it usually comes back missing.
+    """
+    soup = BeautifulSoup(html, parser)
+    title_tag = soup.find(class_="job-title")
+    if not title_tag or not title_tag.get_text(strip=True):
+        return None
+
+    details = []
+    for label in DETAIL_LABELS:
+        strong = soup.find("strong", string=label)
+        value = strong.next_sibling if strong else None
+        details.append(value.strip() if isinstance(value, str) else None)
+
+    requirement = None
+    heading = soup.find("h5", string="Job Requirement")
+    section = heading.find_next_sibling("div") if heading else None
+    if section:
+        li_elements = [li.get_text(strip=True) for ul in section.find_all("ul")
+                       for li in ul.find_all("li") if li.get_text(strip=True)]
+        requirement = " | ".join(li_elements) or None
+
+    return build_record(title_tag.get_text(strip=True), url, details, requirement)
+
+
+def main(config=JobifyConfig):
+    # Selenium is only needed for browser crawls, not for parsing
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    # Configure Selenium WebDriver
+    service = Service(config.CHROME_DRIVER_PATH)
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")  # Run in headless mode (no UI)
+
+    # Append to the CSV so discovered jobs add to earlier crawls
+    file_exists = os.path.exists(config.OUTPUT_FILENAME)
+    with open(config.OUTPUT_FILENAME, "a", encoding="utf-8", newline='') as file:
+        writer = csv.writer(file)
+        if not file_exists:
+            writer.writerow(COLUMNS)
+
+        # Open browser once
+        driver = webdriver.Chrome(service=service, options=options)
+
+        # Loop through job IDs, newest first by default
+        step = -1 if config.END_ID < config.START_ID else 1
+        job_ids = config.JOB_IDS if config.JOB_IDS is not None else range(config.START_ID, config.END_ID + step, step)
+        for job_id in job_ids:
+            url = config.BASE_URL.format(job_id)
+            print(f"Fetching {url}...")
 
-# Path to your Chrome WebDriver (update as needed)
-chrome_driver_path = r"D:\DSE_Folder\Year_3\Sem_2\Web Scraping\chromedriver-win64\chromedriver-win64\chromedriver.exe"  # Ensure the path is correct
-
-# Configure Selenium WebDriver
-service = Service(chrome_driver_path)
-options = webdriver.ChromeOptions()
-options.add_argument("--headless")  # Run in headless mode (no UI)
-
-# Open a CSV file to store the scraped data
-with open("job4.csv", "w", encoding="utf-8", newline='') as file:
-    writer = csv.writer(file)
-    writer.writerow(["Job Title", "Job Link", "Salary", "Job Type", "Job Level", "Gender", "Age",
-                     "Years of Experience", "Language", "Category", "Industry", "Location", "Qualification",
-                     "Available Position", "Required Skills", "Job Requirement"])
-
-    # Open browser once
-    driver = webdriver.Chrome(service=service, options=options)
-
-    # Loop through job IDs from 1031 to 889
-    for job_id in range(1086, 500, -1):  # Corrected range
-        url = f"https://jobify.works/jobs/{job_id}"
-        print(f"Fetching {url}...")
-
-        try:
-            driver.get(url)
-
-            # Wait for job title to appear
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "job-title"))
-            )
-
-            # Extract job title
             try:
-                title = driver.find_element(By.CLASS_NAME, "job-title").text.strip()
-            except Exception as e:
-                title = "N/A"
-                print(f"❌ Error extracting title for {url}: {e}")
+                driver.get(url)
 
-            # Extract job details using labels
-            def get_job_detail(label):
+                # Wait for job title to appear
+                WebDriverWait(driver, config.WAIT_TIMEOUT).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, "job-title"))
+                )
+
+                # Extract job title
                 try:
-                    element = driver.find_element(By.XPATH, f"//strong[text()='{label}']")
-                    return element.find_element(By.XPATH, "./following-sibling::text()").strip()
+                    title = driver.find_element(By.CLASS_NAME, "job-title").text.strip()
                 except Exception as e:
-                    print(f"❌ Error extracting {label} for {url}: {e}")
-                    return "N/A"
-
-            salary = get_job_detail("Salary:")
-            job_type = get_job_detail("Job Type:")
-            job_level = get_job_detail("Job Level:")
-            gender = get_job_detail("Gender:")
-            age = get_job_detail("Age:")
-            experience = get_job_detail("Years of Experience:")  # Corrected label
-            language = get_job_detail("Language:")
-            category = get_job_detail("Category:")
-            industry = get_job_detail("Industry:")
-            location = get_job_detail("Location:")
-            qualification = get_job_detail("Qualification:")
-            available_position = get_job_detail("Available Position:")
-            required_skills = get_job_detail("Required Skills:")
-
-            # ✅ Extract Job Requirement (Now Works with JavaScript!)
-            job_requirement = "N/A"
-            try:
-                job_req_section = WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.XPATH, "//h5[text()='Job Requirement']/following-sibling::div"))
-                )
-                ul_elements = job_req_section.find_elements(By.TAG_NAME, "ul")
-                li_elements = [li.text.strip() for ul in ul_elements for li in ul.find_elements(By.TAG_NAME, "li") if li.text.strip()]
-                job_requirement = " | ".join(li_elements) if li_elements else "N/A"
-            except Exception as e:
-                print(f"❌ Job Requirement not found for {url}: {e}")
+                    title = None
+                    print(f"❌ Error extracting title for {url}: {e}")
+
+                # Extract job details using labels
+                def get_job_detail(label):
+                    try:
+                        element = driver.find_element(By.XPATH, f"//strong[text()='{label}']")
+                        return element.find_element(By.XPATH, "./following-sibling::text()").strip()
+                    except Exception as e:
+                        print(f"❌ Error extracting {label} for {url}: {e}")
+                        return None
+
+                details = [get_job_detail(label) for label in DETAIL_LABELS]
+
+                # ✅ Extract Job Requirement (Now Works with JavaScript!)
+                job_requirement = None
+                try:
+                    job_req_section = WebDriverWait(driver, config.WAIT_TIMEOUT).until(
+                        EC.presence_of_element_located((By.XPATH, "//h5[text()='Job Requirement']/following-sibling::div"))
+                    )
+                    ul_elements = job_req_section.find_elements(By.TAG_NAME, "ul")
+                    li_elements = [li.text.strip() for ul in ul_elements for li in ul.find_elements(By.TAG_NAME, "li") if li.text.strip()]
+                    job_requirement = " | ".join(li_elements) or None
+                except Exception as e:
+                    print(f"❌ Job Requirement not found for {url}: {e}")
 
-            print(f"Title: {title}, Job Requirement: {job_requirement}")
+                print(f"Title: {title}, Job Requirement: {job_requirement}")
 
-            # Write to CSV
-            writer.writerow([title, url, salary, job_type, job_level, gender, age, experience, language,
-                             category, industry, location, qualification, available_position, required_skills,
-                             job_requirement])
+                # Write to CSV
+                row = build_record(title, url, details, job_requirement).to_row(SITES["jobify"]["placeholder"])
+                writer.writerow([row[column] for column in COLUMNS])
+
+            except Exception as e:
+                print(f"❌ Error fetching {url}: {e}")
 
+        driver.quit()  # Close browser
 
-        except Exception as e:
-            print(f"❌ Error fetching {url}: {e}")
 
-    driver.quit()  # Close browser
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,23 @@
-import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 import time
 import csv
 import os
-from urllib.parse import urlparse
-from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from job_record import JobRecord
+from sites import SITES
 
 class ScraperConfig:
-    CHROME_DRIVER_PATH = r"D:\DSE_Folder\Year_3\Sem_2\Web Scraping\chromedriver-win64\chromedriver-win64\chromedriver.exe"
+    CHROME_DRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH")  # None: let Selenium Manager find it
     OUTPUT_FILENAME = "New_Data_workinga.csv"
     START_ID =  10755
     END_ID = 11683
-    BASE_URL = "https://workingna.com/job/{}"
+    JOB_IDS = None  # explicit IDs (e.g. from discovery.py) instead of the range
+    BASE_URL = SITES["workinga"]["base_url"]  # $WORKINGA_BASE_URL overrides it, see sites.py
     WAIT_TIMEOUT = 1
     DELAY = 0.1  # seconds between requests
     MAX_RETRIES = 2
+    API_URL = os.environ.get("WORKINGA_API_URL")  # job data URL template, see workinga_api.py
+    API_TEMPLATE_FILE = "workinga_api.json"
     
     COLUMNS = [
         "Job Title", "Company Name", "Salary", "Available", "Office", 
@@ -28,22 +25,12 @@ class ScraperConfig:
         "Job Responsibilities", "Job Requirements", "Link"
     ]
 
-class JobScraper:
+class JobParser:
+    """Page extraction for Workinga, usable without a browser"""
+
     def __init__(self, config):
         self.config = config
-        self.driver = self._init_driver()
-        self.scraped_count = 0
-        self.skipped_count = 0
-        self.error_count = 0
-        
-    def _init_driver(self):
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--window-size=1920,1080")
-        service = Service(self.config.CHROME_DRIVER_PATH)
-        return webdriver.Chrome(service=service, options=chrome_options)
-    
+
     def clean_text(self, text):
         if not text:
             return ""
@@ -66,10 +53,10 @@ class JobScraper:
         page_text = soup.get_text().lower()
         return any(msg in page_text for msg in error_messages)
     
-    def is_empty_page(self, job_info):
+    def is_empty_page(self, record):
         """Check if the page has no meaningful data"""
         required_fields = ["Job Title", "Company Name", "Job Responsibilities"]
-        return all(job_info.get(field) in [None, "Not specified", ""] for field in required_fields)
+        return all(record.get(field) in [None, "Not specified", ""] for field in required_fields)
     
     def extract_element(self, soup, find_params, next_element=None, attribute=None):
         try:
@@ -172,7 +159,79 @@ class JobScraper:
         
         return "Not specified"
     
+    def parse_soup(self, soup, url):
+        """Extract a JobRecord from a loaded page, or None for missing/empty jobs"""
+        if self.is_page_not_found(soup):
+            return None
+        
+        # Extract all fields; blanks and "Not specified" end up as None in the record
+        job_info = {
+            "title": self.clean_text(self.extract_element(soup, {"class_": "css-97a38i"})),
+            "company": self.clean_text(self.extract_element(soup, {"class_": "css-aabkpg"}, "h6")),
+            "office": self.clean_text(self.extract_element(soup, {"class_": "css-bnbs76"}, "p")),
+        }
+        
+        label_fields = {
+            "location": "Location",
+            "term": "Employment",
+            "closing_date": "Closing Date"
+        }
+        
+        for field, label in label_fields.items():
+            job_info[field] = self.clean_text(self.extract_element(soup, {"string": label}, "p"))
+        
+        salary_tag = soup.find("span", class_="css-10bh2m3")
+        if salary_tag:
+            job_info["salary"] = self.clean_text(salary_tag.text)
+            available_text = salary_tag.find_next("span")
+            if available_text:
+                job_info["openings"] = self.clean_text(available_text.text)
+        
+        # Extract sections with strict validation
+        responsibilities = self.extract_section_content(soup, "JOB RESPONSIBILITIES")
+        requirements = self.extract_section_content(soup, "JOB REQUIREMENTS")
+        
+        # Additional validation to ensure we don't get placeholder text
+        job_info["responsibilities"] = responsibilities if responsibilities != "Job Detail" else None
+        job_info["requirements"] = requirements if requirements != "Job Detail" else None
+        
+        record = JobRecord.build("workinga", url=url, **job_info)
+        
+        # Check if page has meaningful data
+        if self.is_empty_page(record):
+            return None
+        
+        return record
+
+    def parse_html(self, html, url, parser="html.parser"):
+        return self.parse_soup(BeautifulSoup(html, parser), url)
+
+class JobScraper(JobParser):
+    def __init__(self, config):
+        super().__init__(config)
+        self.driver = self._init_driver()
+        self.scraped_count = 0
+        self.skipped_count = 0
+        self.error_count = 0
+        
+    def _init_driver(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.chrome.options import Options
+
+        chrome_options = Options()
+        chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        service = Service(self.config.CHROME_DRIVER_PATH)
+        return webdriver.Chrome(service=service, options=chrome_options)
+    
     def scrape_job_page(self, job_id):
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+
         url = self.config.BASE_URL.format(job_id)
         
         for attempt in range(self.config.MAX_RETRIES + 1):
@@ -198,51 +257,8 @@ class JobScraper:
                 time.sleep(self.config.DELAY)
                 soup = BeautifulSoup(self.driver.page_source, "html.parser")
                 
-                # Double check for not found page after load
-                if self.is_page_not_found(soup):
-                    return None
-                
-                job_info = {col: None for col in self.config.COLUMNS}
-                
-                # Extract all fields
-                job_info["Job Title"] = self.clean_text(self.extract_element(soup, {"class_": "css-97a38i"}))
-                job_info["Company Name"] = self.clean_text(self.extract_element(soup, {"class_": "css-aabkpg"}, "h6"))
-                job_info["Office"] = self.clean_text(self.extract_element(soup, {"class_": "css-bnbs76"}, "p"))
-                
-                label_fields = {
-                    "Location": "Location",
-                    "Employment Type": "Employment",
-                    "Closing Date": "Closing Date"
-                }
-                
-                for field, label in label_fields.items():
-                    job_info[field] = self.clean_text(self.extract_element(soup, {"string": label}, "p"))
-                
-                salary_tag = soup.find("span", class_="css-10bh2m3")
-                if salary_tag:
-                    job_info["Salary"] = self.clean_text(salary_tag.text)
-                    available_text = salary_tag.find_next("span")
-                    if available_text:
-                        job_info["Available"] = self.clean_text(available_text.text)
-                
-                # Extract sections with strict validation
-                responsibilities = self.extract_section_content(soup, "JOB RESPONSIBILITIES")
-                requirements = self.extract_section_content(soup, "JOB REQUIREMENTS")
-                
-                # Additional validation to ensure we don't get placeholder text
-                job_info["Job Responsibilities"] = responsibilities if responsibilities != "Job Detail" else "Not specified"
-                job_info["Job Requirements"] = requirements if requirements != "Job Detail" else "Not specified"
-                
-                job_info["Link"] = url
-                
-                # Clean None values
-                job_info = {k: v if v is not None else "Not specified" for k, v in job_info.items()}
-                
-                # Check if page has meaningful data
-                if self.is_empty_page(job_info):
-                    return None
-                
-                return job_info
+                # Double check for not found page after load, then extract
+                return self.parse_soup(soup, url)
                 
             except TimeoutException:
                 if attempt == self.config.MAX_RETRIES:
@@ -268,14 +284,19 @@ class JobScraper:
             if not file_exists:
                 writer.writeheader()
                 
-            writer.writerow(data)
+            writer.writerow(data.to_row(SITES["workinga"]["placeholder"]))
     
     def run(self):
-        print(f"🚀 Starting scraping from ID {self.config.START_ID} to {self.config.END_ID}")
+        job_ids = self.config.JOB_IDS
+        if job_ids is None:
+            job_ids = range(self.config.START_ID, self.config.END_ID + 1)
+            print(f"🚀 Starting scraping from ID {self.config.START_ID} to {self.config.END_ID}")
+        else:
+            print(f"🚀 Starting scraping of {len(job_ids)} discovered job IDs")
         print(f"📁 Output will be saved to {self.config.OUTPUT_FILENAME}")
         print(f"⏳ Timeout set to {self.config.WAIT_TIMEOUT} seconds with {self.config.MAX_RETRIES} retries\n")
         
-        for job_id in range(self.config.START_ID, self.config.END_ID + 1):
+        for job_id in job_ids:
             print(f"🔍 Processing job ID {job_id}...", end=" ", flush=True)
             
             job_data = self.scrape_job_page(job_id)
@@ -299,7 +320,13 @@ class JobScraper:
         
         self.driver.quit()
 
+def parse_job_page(html, url, parser="html.parser"):
+    """Parse raw Workinga job page HTML into a JobRecord (None if not a job)"""
+    return JobParser(ScraperConfig).parse_html(html, url, parser)
+
+def main(config=None):
+    scraper = JobScraper(config or ScraperConfig())
+    scraper.run()
+
 if __name__ == "__main__":
-    config = ScraperConfig()
-    scraper = JobScraper(config)
-    scraper.run()
\ No newline at end of file
+    main()
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+Cost per new job of matching saved-search alerts
+
+Generates saved searches (one or two query words from the record_pages
+vocabulary, sometimes a location, level, site or salary floor) and streams
+synthetic CamHR jobs through:
+
+    percolator   saved_searches.Percolator: only searches filed under the job's words are checked
+    brute force  every saved search checked against every job
+
+Both must return the same matches. Reports jobs/s, microseconds per job and
+the average number of candidate searches checked per job.
+
+The synthetic vocabulary is small (a few dozen title words and skills), so
+candidates per job are higher than on real postings; scraped jobs use far
+more distinct words.
+
+Usage:
+    python benchmarks/bench_alerts.py
+    python benchmarks/bench_alerts.py --searches 1000 5000 20000 --jobs 5000
+"""
+import argparse
+import random
+import time
+
+from bench_memory import generate_rows
+from bench_utils import save_results
+from job_index import INDEXED_FIELDS, tokenize
+from job_record import JobRecord
+from record_pages import LEVELS, LOCATIONS, SKILLS, TITLES
+from saved_searches import FACETS, Percolator
+
+QUERY_WORDS = sorted({word for text in TITLES + SKILLS for word in tokenize(text)})
+
+
+def generate_searches(count, seed=0):
+    rng = random.Random(seed)
+    searches = []
+    for number in range(count):
+        search = {"id": f"s{number}", "query": " ".join(rng.sample(QUERY_WORDS, rng.choice([1, 1, 2]))),
+                  "site": "camhr" if rng.random() < 0.1 else None,
+                  "min_salary": rng.choice([None, None, 500, 800, 1000]), "max_salary": None}
+        search.update(dict.fromkeys(FACETS, ""))
+        if rng.random() < 0.4:
+            search["location"] = rng.choice(LOCATIONS)
+        if rng.random() < 0.2:
+            search["level"] = rng.choice(LEVELS)
+        if rng.random() < 0.05:
+            search["query"] = ""   # facet-only search
+        searches.append(search)
+    return searches
+
+
+def doc_freq(records):
+    """Word -> job count, as doc_freq_from_index reads it from the job index"""
+    counts = {}
+    for record in records:
+        words = set()
+        for field in INDEXED_FIELDS:
+            words.update(tokenize(record.get(field)))
+        for word in words:
+            counts[word] = counts.get(word, 0) + 1
+    return counts
+
+
+def run(percolator, records):
+    matches = 0
+    start = time.perf_counter()
+    results = []
+    for record in records:
+        matched = percolator.match(record)
+        matches += len(matched)
+        results.append(sorted(matched))
+    elapsed = time.perf_counter() - start
+    return results, elapsed, matches
+
+
+def count_candidates(percolator, records):
+    total = 0
+    for record in records:
+        words = set()
+        for field in INDEXED_FIELDS:
+            words.update(tokenize(record.get(field)))
+        facet_words = {field: frozenset(tokenize(record.get(field))) for field in FACETS}
+        total += len(percolator.candidates(words, facet_words, record["site"]))
+    return total / len(records)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Saved-search alert matching: percolator vs brute force")
+    parser.add_argument("--searches", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--jobs", type=int, default=2000)
+    args = parser.parse_args()
+
+    records = [JobRecord.from_row("camhr", row) for row in generate_rows(args.jobs, seed=1)]
+    frequencies = doc_freq(records)
+    results = []
+    for count in args.searches:
+        searches = generate_searches(count)
+        percolator = Percolator(searches, frequencies)
+        brute = Percolator(searches)
+        brute.candidates = lambda *_: set(brute.searches)   # check every search
+
+        fast, fast_seconds, matches = run(percolator, records)
+        slow, slow_seconds, _ = run(brute, records)
+        if fast != slow:
+            raise SystemExit(f"❌ Percolator and brute force disagree with {count} searches")
+        result = {"searches": count, "jobs": len(records), "matches": matches,
+                  "candidates_per_job": round(count_candidates(percolator, records), 1),
+                  "percolator_us_per_job": round(fast_seconds / len(records) * 1e6, 1),
+                  "brute_force_us_per_job": round(slow_seconds / len(records) * 1e6, 1),
+                  "percolator_jobs_per_second": round(len(records) / fast_seconds)}
+        results.append(result)
+        print(f"🔔 {count:6} searches: percolator {result['percolator_us_per_job']:9.1f} µs/job "
+              f"({result['candidates_per_job']} candidates), brute force {result['brute_force_us_per_job']:9.1f} "
+              f"µs/job, {matches} matches")
+
+    path = save_results("alerts", results)
+    print(f"💾 Results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
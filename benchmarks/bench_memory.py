@@ -0,0 +1,122 @@
+"""
+Memory cost of holding a large job history in one process
+
+Streams synthetic CamHR-style CSV rows (the record_pages vocabulary, fresh
+strings per row as csv.DictReader produces them) and keeps every job in one
+of these shapes:
+
+    csv rows         the DictReader rows themselves (column name -> string)
+    canonical dicts  sites.to_canonical dicts
+    records          job_record.JobRecord (tuple, None for missing, interned categoricals)
+    arrow            JobRecords converted to Arrow record batches
+
+Each shape is measured in a fresh process, reporting peak RSS above the
+process baseline, build time and (for records) the Arrow round trip.
+
+Usage:
+    python benchmarks/bench_memory.py                  # 500k jobs
+    python benchmarks/bench_memory.py --count 100000 --shapes records arrow
+"""
+import argparse
+import csv
+import io
+import multiprocessing
+import random
+import time
+
+from bench_utils import peak_rss_mb, save_results
+from record_pages import COMPANIES, INDUSTRIES, LEVELS, LOCATIONS, SENTENCES, SKILLS, TERMS, TITLES
+from sites import SITES
+
+SHAPES = ["csv rows", "canonical dicts", "records", "arrow"]
+BATCH_ROWS = 50000
+
+
+def generate_rows(count, seed=0):
+    """Yield CamHR CSV rows parsed from CSV text, so no string is shared between rows"""
+    rng = random.Random(seed)
+    columns = list(SITES["camhr"]["fields"].values())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    lines = []
+    for job_id in range(count):
+        buffer.seek(0)
+        buffer.truncate()
+        requirements = " • ".join(rng.choice(SENTENCES).format(skill=rng.choice(SKILLS))
+                                  for _ in range(rng.randint(3, 8)))
+        writer.writerow([
+            rng.choice(TITLES), rng.choice(COMPANIES), rng.choice(LOCATIONS), rng.choice(LEVELS),
+            rng.choice(TERMS), rng.choice(INDUSTRIES), rng.choice(["Not found", "IT", "Sales", "Finance"]),
+            rng.choice(["Negotiable", "$500-$800", "$800-$1200", "Not found"]), f"{rng.randint(0, 5)} Years",
+            "Oct-01-2026", "Nov-01-2026", requirements, f"https://www.camhr.com/a/job/{10600000 + job_id}",
+        ])
+        lines.append(buffer.getvalue())
+        if len(lines) == 1000:
+            yield from csv.DictReader(lines, fieldnames=columns)
+            lines = []
+    yield from csv.DictReader(lines, fieldnames=columns)
+
+
+def measure(shape, count):
+    from job_record import JobRecord, from_arrow, to_arrow
+    from sites import to_canonical
+
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    rows = generate_rows(count)
+    if shape == "csv rows":
+        held = list(rows)
+    elif shape == "canonical dicts":
+        held = [to_canonical("camhr", row) for row in rows]
+    else:
+        held, batch = [], []
+        for row in rows:
+            batch.append(JobRecord.from_row("camhr", row))
+            if len(batch) == BATCH_ROWS:
+                held.append(to_arrow(batch) if shape == "arrow" else batch)
+                batch = []
+        if batch:
+            held.append(to_arrow(batch) if shape == "arrow" else batch)
+    result = {"shape": shape, "jobs": count, "build_seconds": round(time.perf_counter() - start, 2),
+              "rss_mb": round(peak_rss_mb() - baseline, 1)}
+
+    if shape == "records":
+        start = time.perf_counter()
+        batches = [to_arrow(batch) for batch in held]
+        result["to_arrow_seconds"] = round(time.perf_counter() - start, 2)
+        start = time.perf_counter()
+        restored = sum(len(from_arrow(batch)) for batch in batches)
+        result["from_arrow_seconds"] = round(time.perf_counter() - start, 2)
+        assert restored == count
+    return result
+
+
+def _run(shape, count, results):
+    results.put(measure(shape, count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare memory of job history representations")
+    parser.add_argument("--count", type=int, default=500000)
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=SHAPES)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")  # fresh interpreter per shape
+    results = []
+    for shape in args.shapes:
+        queue = context.Queue()
+        process = context.Process(target=_run, args=(shape, args.count, queue))
+        process.start()
+        result = queue.get()
+        process.join()
+        results.append(result)
+        extra = "".join(f", {key} {result[key]}s" for key in ("to_arrow_seconds", "from_arrow_seconds")
+                        if key in result)
+        print(f"📦 {shape:16} {result['rss_mb']:8.1f} MB  built in {result['build_seconds']}s{extra}")
+
+    path = save_results("memory", results)
+    print(f"💾 Results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Load test for the job query service (query_service.py)
+
+Worker threads each keep one persistent HTTP/1.1 connection and send a mix
+of requests for a fixed duration:
+
+    search   /search with one or two title words, sometimes a location or site
+    filter   /jobs filtered by industry or location, random page
+    job      /jobs/<site>/<job_id>
+    stats    /stats
+
+The vocabulary (title words, locations, industries, job keys) is sampled from
+the service itself before the run, so the mix matches whatever index it
+serves. --repeat controls how skewed the mix is towards a small set of
+popular requests (the LRU's best case); --etag revalidates with
+If-None-Match the way a browser would.
+
+Reports requests/s, latency percentiles per request type, status counts and
+the cache hit ratio from the X-Cache header.
+
+Usage:
+    python benchmarks/load_test.py --url http://127.0.0.1:8080
+    python benchmarks/load_test.py --start-server job_index.json --threads 16 --duration 20
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlencode, urlparse
+
+from bench_utils import REPO_ROOT, save_results
+
+KINDS = {"search": 0.55, "filter": 0.2, "job": 0.2, "stats": 0.05}
+POPULAR = 50   # requests in the "popular" pool drawn from with probability --repeat
+
+
+def get_json(base_url, path):
+    url = urlparse(base_url)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=30)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        return json.loads(response.read())
+    finally:
+        conn.close()
+
+
+def sample_vocabulary(base_url, pages=5):
+    """Title words, locations, industries and job keys seen in the first pages of /jobs"""
+    jobs = []
+    for page in range(1, pages + 1):
+        jobs.extend(get_json(base_url, f"/jobs?per_page=100&page={page}")["results"])
+    if not jobs:
+        raise SystemExit("❌ The service has no jobs to query")
+    words = sorted({word for job in jobs for word in (job["title"] or "").lower().split()
+                    if len(word) > 2 and word.isalpha()})
+    return {
+        "words": words,
+        "locations": sorted({job["location"] for job in jobs if job["location"]}),
+        "industries": sorted({job["industry"] for job in jobs if job["industry"]}),
+        "sites": sorted({job["site"] for job in jobs}),
+        "keys": [(job["site"], job["job_id"]) for job in jobs],
+    }
+
+
+def make_request(rng, vocab):
+    """Return (kind, path) for one random request"""
+    kind = rng.choices(list(KINDS), weights=list(KINDS.values()))[0]
+    if kind == "search":
+        params = {"q": " ".join(rng.sample(vocab["words"], min(len(vocab["words"]), rng.choice([1, 1, 2]))))}
+        if rng.random() < 0.3 and vocab["locations"]:
+            params["location"] = rng.choice(vocab["locations"])
+        if rng.random() < 0.2:
+            params["site"] = rng.choice(vocab["sites"])
+        return kind, "/search?" + urlencode(params)
+    if kind == "filter":
+        if vocab["industries"] and rng.random() < 0.5:
+            params = {"industry": rng.choice(vocab["industries"])}
+        else:
+            params = {"location": rng.choice(vocab["locations"] or [""])}
+        params["page"] = rng.randint(1, 3)
+        return kind, "/jobs?" + urlencode(params)
+    if kind == "job":
+        return kind, "/jobs/%s/%s" % rng.choice(vocab["keys"])
+    return kind, "/stats"
+
+
+class Worker(threading.Thread):
+    def __init__(self, base_url, vocab, popular, deadline, repeat, etag, seed):
+        super().__init__(daemon=True)
+        self.url = urlparse(base_url)
+        self.vocab, self.popular = vocab, popular
+        self.deadline, self.repeat, self.etag = deadline, repeat, etag
+        self.rng = random.Random(seed)
+        self.latencies = {kind: [] for kind in KINDS}
+        self.statuses = Counter()
+        self.cache = Counter()
+        self.errors = 0
+        self.etags = {}
+
+    def run(self):
+        conn = http.client.HTTPConnection(self.url.hostname, self.url.port, timeout=30)
+        while time.perf_counter() < self.deadline:
+            if self.rng.random() < self.repeat:
+                kind, path = self.rng.choice(self.popular)
+            else:
+                kind, path = make_request(self.rng, self.vocab)
+            headers = {"If-None-Match": self.etags[path]} if self.etag and path in self.etags else {}
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                self.errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(self.url.hostname, self.url.port, timeout=30)
+                continue
+            self.latencies[kind].append(time.perf_counter() - start)
+            self.statuses[response.status] += 1
+            self.cache[response.getheader("X-Cache", "-")] += 1
+            if self.etag and response.getheader("ETag"):
+                self.etags[path] = response.getheader("ETag")
+        conn.close()
+
+
+def percentiles(latencies):
+    if not latencies:
+        return {}
+    latencies = sorted(latencies)
+    pick = lambda p: round(latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000, 2)
+    return {"count": len(latencies), "p50_ms": pick(50), "p90_ms": pick(90), "p99_ms": pick(99),
+            "max_ms": round(latencies[-1] * 1000, 2)}
+
+
+def start_server(index_path, port):
+    """Run query_service.py in a subprocess and wait until /health answers"""
+    process = subprocess.Popen([sys.executable, os.path.join(REPO_ROOT, "query_service.py"), "--index", index_path,
+                                "--port", str(port)], stdout=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(600):
+        try:
+            get_json(base_url, "/health")
+            return process, base_url
+        except OSError:
+            if process.poll() is not None:
+                raise SystemExit("❌ query_service.py exited before it was ready")
+            time.sleep(0.1)
+    process.terminate()
+    raise SystemExit("❌ query_service.py did not answer /health within 60s")
+
+
+def run_load(base_url, threads=8, duration=10.0, repeat=0.5, etag=False, seed=0):
+    vocab = sample_vocabulary(base_url)
+    rng = random.Random(seed)
+    popular = [make_request(rng, vocab) for _ in range(POPULAR)]
+    deadline = time.perf_counter() + duration
+    workers = [Worker(base_url, vocab, popular, deadline, repeat, etag, seed + i + 1) for i in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    statuses, cache = Counter(), Counter()
+    by_kind = {kind: [] for kind in KINDS}
+    for worker in workers:
+        statuses.update(worker.statuses)
+        cache.update(worker.cache)
+        for kind, latencies in worker.latencies.items():
+            by_kind[kind].extend(latencies)
+    every = [latency for latencies in by_kind.values() for latency in latencies]
+    cacheable = cache["HIT"] + cache["MISS"]
+    return {
+        "threads": threads, "duration_seconds": round(elapsed, 2), "repeat": repeat, "etag": etag,
+        "requests": len(every), "requests_per_second": round(len(every) / elapsed, 1),
+        "errors": sum(worker.errors for worker in workers),
+        "latency": percentiles(every), "by_kind": {kind: percentiles(v) for kind, v in by_kind.items()},
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "cache_hit_ratio": round(cache["HIT"] / cacheable, 3) if cacheable else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the job query service")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--url", help="base URL of a running query_service.py")
+    target.add_argument("--start-server", metavar="INDEX", help="start query_service.py on this index file")
+    parser.add_argument("--port", type=int, default=8090, help="port for --start-server")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--repeat", type=float, default=0.5,
+                        help="share of requests drawn from a small pool of popular ones")
+    parser.add_argument("--etag", action="store_true", help="revalidate with If-None-Match")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    process = None
+    base_url = args.url
+    if args.start_server:
+        process, base_url = start_server(args.start_server, args.port)
+    try:
+        print(f"🔥 {args.threads} threads for {args.duration:g}s against {base_url}")
+        result = run_load(base_url, args.threads, args.duration, args.repeat, args.etag, args.seed)
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    latency = result["latency"]
+    print(f"⚡ {result['requests']} requests, {result['requests_per_second']} req/s, {result['errors']} errors")
+    print(f"⏱️ p50 {latency['p50_ms']} ms  p90 {latency['p90_ms']} ms  p99 {latency['p99_ms']} ms  "
+          f"max {latency['max_ms']} ms")
+    for kind, stats in result["by_kind"].items():
+        if stats:
+            print(f"   {kind:7} {stats['count']:7}  p50 {stats['p50_ms']:7} ms  p99 {stats['p99_ms']:7} ms")
+    print(f"📊 Status {result['statuses']}, cache hit ratio {result['cache_hit_ratio']}")
+    path = save_results("load_test", result)
+    print(f"💾 Results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+Record job pages for the replay server
+
+Two modes:
+    live       fetch real pages once and store them with a manifest
+    synthetic  generate pages that mimic each site's markup (no network),
+               including 404s, slow responses and JS-rendered sections,
+               plus newest-first listing pages and a sitemap per site
+               (and CamHR company profile pages)
+
+Usage:
+    python benchmarks/record_pages.py live camhr --start 10611925 --end 10611990
+    python benchmarks/record_pages.py live workinga --start 10755 --end 10800 --browser
+    python benchmarks/record_pages.py live workinga --start 10755 --end 10800 --api
+    python benchmarks/record_pages.py synthetic --count 200
+"""
+import argparse
+import html
+import json
+import os
+import random
+import time
+from datetime import date, timedelta
+from urllib.parse import urlparse
+
+import bench_utils  # noqa: F401  (puts the repository root on sys.path)
+from replay_server import RECORDINGS_DIR
+from sites import SITES
+
+LOCATIONS = ["Phnom Penh", "Siem Reap", "Battambang", "Sihanoukville", "Kampong Cham", "Kampot"]
+LEVELS = ["Entry Level", "Junior", "Senior", "Manager", "Executive"]
+TERMS = ["Full Time", "Part Time", "Contract", "Internship"]
+INDUSTRIES = ["Information Technology", "Banking & Finance", "Hospitality", "Manufacturing",
+              "Education", "Telecommunications", "NGO", "Retail"]
+TITLES = ["Software Developer", "IT Support Officer", "Accountant", "Sales Executive", "Data Analyst",
+          "Network Engineer", "HR Manager", "Marketing Officer", "Python Developer", "Receptionist"]
+COMPANIES = ["ABC Bank Plc.", "Khmer Tech Co., Ltd.", "Angkor Hotel", "Mekong Logistics", "Smart Axiata",
+             "ACLEDA Bank Plc.", "Prince Group", "Wing Bank (Cambodia) Plc"]
+COMPANY_IDS = {name: 20001 + number for number, name in enumerate(COMPANIES)}
+COMPANY_SIZES = ["1-10 Employees", "11-50 Employees", "51-100 Employees", "101-500 Employees", "500+ Employees"]
+SKILLS = ["Python", "Java", "SQL", "Excel", "English", "Communication", "Leadership", "AWS", "Linux",
+          "Customer Service", "Accounting", "JavaScript", "React", "Networking"]
+SENTENCES = ["Bachelor's degree in a related field", "At least 2 years of experience",
+             "Good command of English", "Able to work under pressure", "Strong problem-solving skills",
+             "Familiar with {skill}", "Experience with {skill} is a plus", "Team player with {skill} knowledge"]
+
+
+def site_path(site, job_id):
+    """Request path of a job page relative to /<site>/ on the replay server"""
+    return SITES[site]["job_path"].format(job_id).strip("/")
+
+
+def write_manifest(site_dir, pages):
+    with open(os.path.join(site_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({"pages": pages}, f, indent=1, sort_keys=True)
+
+
+def _bullets(rng, count):
+    return [rng.choice(SENTENCES).format(skill=rng.choice(SKILLS)) for _ in range(count)]
+
+
+def _dates(rng):
+    published = date.today() - timedelta(days=rng.randint(0, 40))
+    closing = published + timedelta(days=rng.randint(7, 60))
+    return published, closing
+
+
+def camhr_page(rng, job_id):
+    title = rng.choice(TITLES)
+    company = rng.choice(COMPANIES)
+    published, closing = _dates(rng)
+    # A few postings carry very long requirement lists, like real outliers
+    bullets = _bullets(rng, rng.choice([4, 6, 8, 12, 200 if rng.random() < 0.03 else 10]))
+    rows = [("Level", rng.choice(LEVELS)), ("Year of Exp.", f"{rng.randint(0, 5)} Years"),
+            ("Hiring", f"{rng.randint(1, 5)} Post"), ("Salary", rng.choice(["Negotiable", f"${rng.randint(3, 20)}00-${rng.randint(21, 40)}00"])),
+            ("Sex", rng.choice(["Male/Female", "Male", "Female"])), ("Age", "18 ~ 45"),
+            ("Term", rng.choice(TERMS)), ("Function", rng.choice(["IT", "Finance", "Sales", "Admin"])),
+            ("Industry", rng.choice(INDUSTRIES)), ("Qualification", "Bachelor Degree"),
+            ("Language", "English - Good"), ("Location", rng.choice(LOCATIONS))]
+    table = "".join(f'<tr><th class="column">{k}</th><td>{html.escape(v)}</td></tr>' for k, v in rows)
+    items = "".join(f"<p>- {html.escape(b)}</p>" for b in bullets)
+    return f"""<html><head><title>{title} | CamHR</title></head><body>
+<div class="job-header-content"><span class="job-name-span">{title}</span>
+<p class="mb-1 company-headbox"><a href="../company/{COMPANY_IDS[company]}">{html.escape(company)}</a></p></div>
+<table class="mailTable">{table}</table>
+<div class="job-descript"><span class="descript-title">Job Requirements</span><div class="fs-14 descript-list">{items}</div></div>
+<div class="send-date"><span>Publish Date: {published.strftime('%b-%d-%Y')}</span><span>Closing Date: {closing.strftime('%b-%d-%Y')}</span></div>
+</body></html>"""
+
+
+def camhr_company_page(name, company_id):
+    rng = random.Random(company_id)
+    rows = [("Industry", rng.choice(INDUSTRIES)), ("Company Size", rng.choice(COMPANY_SIZES)),
+            ("Location", rng.choice(LOCATIONS)), ("Website", f"https://www.example{company_id}.com.kh")]
+    table = "".join(f'<tr><th class="column">{k}</th><td>{html.escape(v)}</td></tr>' for k, v in rows)
+    return f"""<html><head><title>{html.escape(name)} | CamHR</title></head><body>
+<div class="company-header"><h1 class="company-name">{html.escape(name)}</h1></div>
+<table class="mailTable">{table}</table>
+<div class="company-descript"><p>{html.escape(name)} is a leading employer in Cambodia.</p></div>
+</body></html>"""
+
+
+def jobify_page(rng, job_id, js_rendered):
+    details = [("Salary:", f"${rng.randint(3, 15)}00"), ("Job Type:", rng.choice(TERMS)), ("Job Level:", rng.choice(LEVELS)),
+               ("Gender:", "Male/Female"), ("Age:", "20-35"), ("Years of Experience:", f"{rng.randint(0, 5)} years"),
+               ("Language:", "English"), ("Category:", rng.choice(["IT", "Finance", "Sales"])),
+               ("Industry:", rng.choice(INDUSTRIES)), ("Location:", rng.choice(LOCATIONS)),
+               ("Qualification:", "Bachelor"), ("Available Position:", str(rng.randint(1, 4))),
+               ("Required Skills:", ", ".join(rng.sample(SKILLS, 3)))]
+    detail_html = "".join(f"<p><strong>{k}</strong> {html.escape(v)}</p>" for k, v in details)
+    items = "".join(f"<li>{html.escape(b)}</li>" for b in _bullets(rng, rng.randint(3, 10)))
+    if js_rendered:
+        # The requirement list only appears after scripts run, as on the live site
+        section = f"""<div id="job-req"></div>
+<script>document.addEventListener("DOMContentLoaded", function () {{
+  document.getElementById("job-req").innerHTML = {json.dumps("<ul>" + items + "</ul>")};
+}});</script>"""
+    else:
+        section = f'<div id="job-req"><ul>{items}</ul></div>'
+    return f"""<html><head><title>Jobify</title></head><body>
+<h1 class="job-title">{rng.choice(TITLES)} (JB-{job_id})</h1>{detail_html}
+<h5>Job Requirement</h5>{section}
+</body></html>"""
+
+
+def workinga_page(rng, job_id, js_rendered):
+    """Return (page HTML, job data payload); the client-rendered shell loads the payload like the real app"""
+    _, closing = _dates(rng)
+
+    def paragraphs(count):
+        return "".join(f"<p>- {html.escape(b)}</p>" for b in _bullets(rng, count))
+
+    long_page = rng.random() < 0.03
+    job = {"id": job_id, "title": rng.choice(TITLES), "company": {"name": rng.choice(COMPANIES)},
+           "office": {"name": f"{rng.choice(LOCATIONS)} Office"}, "salary": f"${rng.randint(3, 20)}00",
+           "available": f"{rng.randint(1, 3)} Available", "location": {"name": rng.choice(LOCATIONS)},
+           "employmentType": rng.choice(TERMS), "closingDate": closing.isoformat() + "T00:00:00Z",
+           "responsibilities": paragraphs(300 if long_page else rng.randint(3, 8)),
+           "requirements": paragraphs(rng.randint(3, 8))}
+    body = f"""<div class="MuiBox-root css-1"><h4 class="css-97a38i">{job["title"]}</h4>
+<div class="css-aabkpg"><img alt=""/><h6>{html.escape(job["company"]["name"])}</h6></div>
+<div class="css-bnbs76"><span>Office</span><p>{job["office"]["name"]}</p></div>
+<span class="css-10bh2m3">{job["salary"]}</span><span>{job["available"]}</span>
+<p>Location</p><p>{job["location"]["name"]}</p>
+<p>Employment</p><p>{job["employmentType"]}</p>
+<p>Closing Date</p><p>{closing.strftime('%d %b %Y')}</p>
+<h6>JOB RESPONSIBILITIES</h6><div class="ql-editor">{job["responsibilities"]}</div>
+<h6>JOB REQUIREMENTS</h6><div class="ql-editor">{job["requirements"]}</div></div>"""
+    payload = json.dumps({"success": True, "data": job}, ensure_ascii=False)
+    if js_rendered:
+        # Client-rendered: the HTML shell is empty until React mounts and fetches the job.
+        # The data URL is relative so it resolves under /workinga/ on the replay server.
+        return f"""<html><head><title>Workinga</title></head><body><div id="root"></div>
+<script>fetch("../api/jobs/{job_id}").then(r => r.json()).then(render);
+document.getElementById("root").innerHTML = {json.dumps(body)};</script></body></html>""", payload
+    return f"<html><head><title>Workinga</title></head><body><div id=\"root\">{body}</div></body></html>", payload
+
+
+def listing_pages(site, job_ids, per_page=20):
+    """Newest-first listing pages and a sitemap for the given live IDs; returns {path: html/xml}"""
+    from discovery import DISCOVERY_SOURCES
+
+    job_path = SITES[site]["job_path"]
+    ordered = sorted(job_ids, reverse=True)
+    pages = {}
+    for page_number, start in enumerate(range(0, len(ordered), per_page), 1):
+        cards = []
+        for rank, job_id in enumerate(ordered[start:start + per_page], start):
+            posted = date.today() - timedelta(days=rank // 5)
+            when = f"{rank // 5} days ago" if rank % 2 else posted.strftime("%b-%d-%Y")
+            cards.append(f'<div class="job-item"><a href="{job_path.format(job_id)}">Job {job_id}</a>'
+                         f'<span class="date">{when}</span></div>')
+        listing = urlparse(DISCOVERY_SOURCES[site]["listing_url"].format(page_number))
+        pages[f"{listing.path.strip('/')}?{listing.query}"] = (
+            f"<html><body><div class=\"job-list\">{''.join(cards)}</div></body></html>")
+    urls = "".join(f"<url><loc>{SITES[site]['base_url'].format(job_id)}</loc>"
+                   f"<lastmod>{(date.today() - timedelta(days=rank // 5)).isoformat()}</lastmod></url>"
+                   for rank, job_id in enumerate(ordered))
+    sitemap_path = urlparse(DISCOVERY_SOURCES[site]["sitemap_url"]).path.strip("/")
+    pages[sitemap_path] = f'<?xml version="1.0" encoding="UTF-8"?><urlset>{urls}</urlset>'
+    return pages
+
+
+def generate_synthetic(count, seed, recordings_dir=RECORDINGS_DIR):
+    """Write `count` synthetic pages per site; returns {site: manifest pages}"""
+    rng = random.Random(seed)
+    first_ids = {"camhr": 10611925, "jobify": 501, "workinga": 10755}
+    manifests = {}
+    for site, first_id in first_ids.items():
+        site_dir = os.path.join(recordings_dir, site)
+        os.makedirs(site_dir, exist_ok=True)
+        pages = {}
+        for job_id in range(first_id, first_id + count):
+            roll = rng.random()
+            path = site_path(site, job_id)
+            if roll < 0.10:
+                pages[path] = {"status": 404}
+                if site == "workinga":
+                    pages[f"api/jobs/{job_id}"] = {"status": 404, "content_type": "application/json"}
+                continue
+            js_rendered = rng.random() < 0.3
+            if site == "camhr":
+                page = camhr_page(rng, job_id)
+            elif site == "jobify":
+                page = jobify_page(rng, job_id, js_rendered)
+            else:
+                page, payload = workinga_page(rng, job_id, js_rendered)
+                with open(os.path.join(site_dir, f"{job_id}.json"), "w", encoding="utf-8") as f:
+                    f.write(payload)
+                pages[f"api/jobs/{job_id}"] = {"file": f"{job_id}.json", "status": 200,
+                                               "content_type": "application/json"}
+            filename = f"{job_id}.html"
+            with open(os.path.join(site_dir, filename), "w", encoding="utf-8") as f:
+                f.write(page)
+            entry = {"file": filename, "status": 200}
+            if roll > 0.95:
+                entry["delay"] = round(rng.uniform(0.2, 0.5), 2)
+            pages[path] = entry
+
+        if site == "camhr":
+            for name, company_id in COMPANY_IDS.items():
+                filename = f"company_{company_id}.html"
+                with open(os.path.join(site_dir, filename), "w", encoding="utf-8") as f:
+                    f.write(camhr_company_page(name, company_id))
+                pages[f"a/company/{company_id}"] = {"file": filename, "status": 200}
+
+        live_ids = [job_id for job_id in range(first_id, first_id + count)
+                    if pages[site_path(site, job_id)].get("file")]
+        for number, (path, page) in enumerate(listing_pages(site, live_ids).items()):
+            filename = f"listing_{number}.xml" if path.endswith(".xml") else f"listing_{number}.html"
+            with open(os.path.join(site_dir, filename), "w", encoding="utf-8") as f:
+                f.write(page)
+            pages[path] = {"file": filename, "status": 200}
+            if path.endswith(".xml"):
+                pages[path]["content_type"] = "application/xml"
+        write_manifest(site_dir, pages)
+        manifests[site] = pages
+    return manifests
+
+
+def record_live(site, start_id, end_id, use_browser=False, delay=0.5, recordings_dir=RECORDINGS_DIR,
+                url_template=None):
+    """
+    Fetch real pages (optionally after JavaScript runs) and add them to the site's recordings
+
+    url_template overrides the site's page URL, e.g. to record Workinga's JSON job payloads.
+    """
+    site_dir = os.path.join(recordings_dir, site)
+    os.makedirs(site_dir, exist_ok=True)
+    manifest_path = os.path.join(site_dir, "manifest.json")
+    pages = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            pages = json.load(f)["pages"]
+
+    driver = session = None
+    if use_browser:
+        from selenium import webdriver
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless")
+        driver = webdriver.Chrome(options=options)
+    else:
+        from fetching import create_session, fetch_page
+        session = create_session()
+
+    step = 1 if end_id >= start_id else -1
+    try:
+        for job_id in range(start_id, end_id + step, step):
+            url = (url_template or SITES[site]["base_url"]).format(job_id)
+            if driver:
+                driver.get(url)
+                time.sleep(2)  # let client-side rendering finish
+                status, page = 200, driver.page_source
+            else:
+                result = fetch_page(session, url)
+                status, page = result["status"], result["html"]
+            path = urlparse(url).path.strip("/") if url_template else site_path(site, job_id)
+            content_type = "application/json" if url_template else "text/html; charset=utf-8"
+            if status != 200 or not page:
+                pages[path] = {"status": status or 599, "content_type": content_type}
+                print(f"⏩ {url}: {status}")
+                continue
+            filename = f"{job_id}.json" if url_template else f"{job_id}.html"
+            with open(os.path.join(site_dir, filename), "w", encoding="utf-8") as f:
+                f.write(page)
+            pages[path] = {"file": filename, "status": 200, "content_type": content_type}
+            print(f"💾 Recorded {url}")
+            time.sleep(delay)
+    finally:
+        if driver:
+            driver.quit()
+        write_manifest(site_dir, pages)
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or synthesize pages for the replay server")
+    subparsers = parser.add_subparsers(dest="mode", required=True)
+
+    live = subparsers.add_parser("live", help="record real pages from the site")
+    live.add_argument("site", choices=list(SITES))
+    live.add_argument("--start", type=int, required=True)
+    live.add_argument("--end", type=int, required=True)
+    live.add_argument("--browser", action="store_true", help="record the page after JavaScript runs")
+    live.add_argument("--delay", type=float, default=0.5)
+    live.add_argument("--api", action="store_true",
+                      help="record Workinga's JSON job payloads (needs workinga_api.json or WORKINGA_API_URL)")
+
+    synthetic = subparsers.add_parser("synthetic", help="generate pages without network access")
+    synthetic.add_argument("--count", type=int, default=200, help="pages per site")
+    synthetic.add_argument("--seed", type=int, default=42)
+
+    args = parser.parse_args()
+    if args.mode == "live":
+        url_template = None
+        if args.api:
+            from workinga_api import load_template
+            url_template = load_template()["url"]
+        pages = record_live(args.site, args.start, args.end, args.browser, args.delay, url_template=url_template)
+        print(f"✅ {len(pages)} pages in the {args.site} manifest")
+    else:
+        manifests = generate_synthetic(args.count, args.seed)
+        for site, pages in manifests.items():
+            print(f"✅ {site}: {len(pages)} synthetic pages")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Local HTTP server that replays recorded job pages
+
+Each site has a directory under benchmarks/recordings/<site>/ holding the
+recorded responses and a manifest.json that maps request paths to them:
+
+    {"pages": {"a/job/10611925": {"file": "10611925.html", "status": 200, "delay": 0.0}}}
+
+Pages are served at http://host:port/<site>/<path>, so pointing a scraper at
+the replay is just a matter of its BASE_URL, e.g.
+
+    CAMHR_BASE_URL=http://127.0.0.1:8765/camhr/a/job/{} python camhr.py
+
+Paths missing from the manifest get the site's 404 page. A path recorded
+with its query string (listing pages, "a/job?page=2") is matched first.
+Entries can set "status" (e.g. 404, 500), "delay" (seconds, for slow
+responses) and "content_type". ETag and Last-Modified are sent so conditional requests work.
+
+Usage:
+    python benchmarks/replay_server.py --port 8765
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RECORDINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recordings")
+
+NOT_FOUND_PAGE = b"<html><head><title>404 Not Found</title></head><body><h1>404 - Page not found</h1></body></html>"
+
+
+def load_manifests(recordings_dir=RECORDINGS_DIR):
+    """Return {site: {path: entry}} for every site directory with a manifest"""
+    manifests = {}
+    if not os.path.isdir(recordings_dir):
+        return manifests
+    for site in sorted(os.listdir(recordings_dir)):
+        manifest_path = os.path.join(recordings_dir, site, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifests[site] = json.load(f)["pages"]
+    return manifests
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def do_GET(self):
+        site, _, path = self.path.lstrip("/").partition("/")
+        path, _, query = path.partition("?")
+        pages = self.server.manifests.get(site, {})
+        # Listing pages are recorded with their query string ("a/job?page=2")
+        entry = pages.get(f"{path.strip('/')}?{query}") if query else None
+        if entry is None:
+            entry = pages.get(path.strip("/"))
+
+        if entry is None:
+            self._send(404, NOT_FOUND_PAGE, "text/html; charset=utf-8")
+            return
+
+        if entry.get("delay"):
+            time.sleep(entry["delay"])
+
+        body = NOT_FOUND_PAGE
+        if entry.get("file"):
+            file_path = os.path.join(self.server.recordings_dir, site, entry["file"])
+            with open(file_path, "rb") as f:
+                body = f.read()
+        status = entry.get("status", 200)
+        content_type = entry.get("content_type", "text/html; charset=utf-8")
+
+        if status != 200:
+            self._send(status, body, content_type)
+            return
+
+        etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+        if self.headers.get("If-None-Match") == etag:
+            self._send(304, b"", content_type, etag)
+            return
+        self._send(200, body, content_type, etag, entry.get("mtime"))
+
+    def _send(self, status, body, content_type, etag=None, mtime=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", formatdate(mtime or self.server.started_at, usegmt=True))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, recordings_dir=RECORDINGS_DIR, verbose=False):
+        super().__init__((host, port), ReplayHandler)
+        self.recordings_dir = recordings_dir
+        self.manifests = load_manifests(recordings_dir)
+        self.started_at = time.time()
+        self.verbose = verbose
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serve in a background thread and return the base URL"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded job pages over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--recordings", default=RECORDINGS_DIR)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = ReplayServer(args.host, args.port, args.recordings, args.verbose)
+    print(f"🚀 Replaying {', '.join(server.manifests) or 'nothing'} at {server.base_url}")
+    for site, pages in server.manifests.items():
+        print(f"   {site}: {len(pages)} pages -> {server.base_url}/{site}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n⚠️ Server stopped")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Scraper benchmarks against the offline replay server
+
+Runs every site x engine combination over the recorded pages and reports
+jobs/sec, CPU time and peak RSS. Each case runs in a fresh process so memory
+numbers do not leak between cases; the replay server runs in this process.
+Results are written to benchmarks/results/ as JSON.
+
+Engines:
+    requests+html.parser   plain HTTP fetch, BeautifulSoup with html.parser
+    requests+lxml          plain HTTP fetch, BeautifulSoup with lxml
+    selenium+html.parser   headless Chrome (runs page JavaScript), html.parser
+    requests+api           Workinga only: JSON job payloads via workinga_api.py
+    pool+html.parser       fetch threads + parser process pool (parse_pool.py)
+
+Usage:
+    python benchmarks/record_pages.py synthetic --count 200
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --sites camhr --engines requests+lxml
+    python benchmarks/run_benchmarks.py --compare results/old.json results/new.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from queue import Empty
+
+from bench_utils import peak_rss_mb, save_results
+from replay_server import ReplayServer
+from sites import SITES, get_parser
+
+ENGINES = {
+    "requests+html.parser": ("requests", "html.parser"),
+    "requests+lxml": ("requests", "lxml"),
+    "selenium+html.parser": ("selenium", "html.parser"),
+    "requests+api": ("requests", "api"),
+    "pool+html.parser": ("pool", "html.parser"),
+}
+
+# Sites with a JSON job data endpoint in the recordings (path template under /<site>/)
+API_PATHS = {"workinga": "api/jobs/{}"}
+
+# Relative change that counts as a regression when comparing two result files
+REGRESSION_THRESHOLD = 0.10
+
+RESULT_POLL_SECONDS = 1.0  # how often the runner checks that a case process is still alive
+CASE_TIMEOUT_SECONDS = 1800  # a case still running after this long is stopped and recorded as failed
+
+
+def replay_url_template(server_url, site):
+    """BASE_URL that points a site's scraper at the replay server"""
+    return f"{server_url}/{site}/" + SITES[site]["job_path"].strip("/")
+
+
+def _open_fetcher(kind):
+    if kind == "requests":
+        from fetching import create_session, fetch_page
+        session = create_session()
+        return lambda url: fetch_page(session, url)["html"], session.close
+
+    from selenium import webdriver
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    service = webdriver.ChromeService(os.environ.get("CHROMEDRIVER_PATH"))
+    driver = webdriver.Chrome(service=service, options=options)
+
+    def fetch(url):
+        driver.get(url)
+        return driver.page_source
+
+    return fetch, driver.quit
+
+
+def run_case(site, engine, url_template, job_ids, results):
+    """Scrape job_ids with one engine; runs in a child process and puts a result dict on `results`"""
+    fetch_kind, parser = ENGINES[engine]
+    if fetch_kind == "pool":
+        from parse_pool import run_pipeline
+        cpu_start = time.process_time()
+        stats = run_pipeline(site, job_ids, url_template, parser=parser)
+        wall = stats["wall_seconds"]
+        results.put({
+            "site": site, "engine": engine, "pages": len(job_ids), "jobs": stats["jobs"],
+            "empty_or_missing": stats["missing"] + stats["empty"], "wall_seconds": round(wall, 4),
+            "fetch_seconds": round(stats["fetch_seconds"], 4), "parse_seconds": round(stats["parse_seconds"], 4),
+            # main process only; parser processes are not included
+            "cpu_seconds": round(time.process_time() - cpu_start, 4),
+            "jobs_per_sec": round(stats["jobs"] / wall, 2) if wall else 0.0,
+            "peak_rss_mb": round(peak_rss_mb(), 1),
+        })
+        return
+    if parser == "api":
+        from workinga_api import parse_payload
+        parse_job_page = lambda text, url, _: parse_payload(text, url)  # noqa: E731
+    else:
+        parse_job_page = get_parser(site)
+    try:
+        fetch, close = _open_fetcher(fetch_kind)
+    except Exception as e:
+        results.put({"site": site, "engine": engine, "skipped": str(e)})
+        return
+
+    jobs = empty = 0
+    fetch_seconds = parse_seconds = 0.0
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    try:
+        for job_id in job_ids:
+            url = url_template.format(job_id)
+            t0 = time.perf_counter()
+            page = fetch(url)
+            t1 = time.perf_counter()
+            record = parse_job_page(page, url, parser) if page else None
+            parse_seconds += time.perf_counter() - t1
+            fetch_seconds += t1 - t0
+            if record:
+                jobs += 1
+            else:
+                empty += 1
+    finally:
+        close()
+    wall = time.perf_counter() - wall_start
+
+    results.put({
+        "site": site,
+        "engine": engine,
+        "pages": len(job_ids),
+        "jobs": jobs,
+        "empty_or_missing": empty,
+        "wall_seconds": round(wall, 4),
+        "fetch_seconds": round(fetch_seconds, 4),
+        "parse_seconds": round(parse_seconds, 4),
+        "cpu_seconds": round(time.process_time() - cpu_start, 4),
+        "jobs_per_sec": round(jobs / wall, 2) if wall else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    })
+
+
+def job_ids_for(site, manifest):
+    """Job IDs of the recorded detail pages (listing, company, API and sitemap paths are skipped)"""
+    prefix = SITES[site]["job_path"].strip("/").partition("{}")[0]
+    ids = (path[len(prefix):].rstrip("/") for path in manifest if path.startswith(prefix))
+    return sorted(int(part) for part in ids if part.isdigit())
+
+
+def wait_for_result(site, engine, results, process, timeout=CASE_TIMEOUT_SECONDS):
+    """
+    The result a case process put on `results`, polling so a crashed or hung case can't block the run
+
+    A process that exits without a result (killed, out of memory, an
+    exception) or runs past `timeout` gives a {"failed": reason} result.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return results.get(timeout=RESULT_POLL_SECONDS)
+        except Empty:
+            pass
+        if process.exitcode is not None:
+            try:  # a result put just before exiting may still be in the pipe
+                return results.get(timeout=RESULT_POLL_SECONDS)
+            except Empty:
+                reason = f"exited with code {process.exitcode} without a result"
+                return {"site": site, "engine": engine, "failed": reason}
+        if time.monotonic() > deadline:
+            process.terminate()
+            return {"site": site, "engine": engine, "failed": f"no result after {timeout}s"}
+
+
+def run_benchmarks(sites, engines, limit=None):
+    server = ReplayServer()
+    server_url = server.start()
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    try:
+        for site in sites:
+            if site not in server.manifests:
+                print(f"⚠️ No recordings for {site}; run record_pages.py first")
+                continue
+            job_ids = job_ids_for(site, server.manifests[site])[:limit]
+            for engine in engines:
+                if ENGINES[engine][1] == "api":
+                    if site not in API_PATHS:
+                        continue
+                    url_template = f"{server_url}/{site}/{API_PATHS[site]}"
+                else:
+                    url_template = replay_url_template(server_url, site)
+                queue = ctx.Queue()
+                process = ctx.Process(target=run_case, args=(site, engine, url_template, job_ids, queue))
+                process.start()
+                result = wait_for_result(site, engine, queue, process)
+                process.join()
+                results.append(result)
+                if "skipped" in result:
+                    print(f"⏩ {site:<9} {engine:<22} skipped: {result['skipped']}")
+                elif "failed" in result:
+                    print(f"❌ {site:<9} {engine:<22} failed: {result['failed']}")
+                else:
+                    print(f"📊 {site:<9} {engine:<22} {result['jobs_per_sec']:>8.1f} jobs/s  "
+                          f"cpu {result['cpu_seconds']:>6.2f}s  rss {result['peak_rss_mb']:>6.1f} MB  "
+                          f"({result['jobs']}/{result['pages']} jobs)")
+    finally:
+        server.stop()
+    return results
+
+
+def compare_results(old_path, new_path, threshold=REGRESSION_THRESHOLD):
+    """Print per-case deltas between two result files; returns the number of regressions"""
+    def load(path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data, {(r["site"], r["engine"]): r for r in data["results"]
+                      if "skipped" not in r and "failed" not in r}
+
+    old_data, old = load(old_path)
+    new_data, new = load(new_path)
+    print(f"Comparing {old_data['commit']} -> {new_data['commit']}")
+    regressions = 0
+    # (metric, True when higher is better)
+    metrics = [("jobs_per_sec", True), ("cpu_seconds", False), ("peak_rss_mb", False)]
+    for key in sorted(set(old) & set(new)):
+        parts = []
+        for metric, higher_is_better in metrics:
+            before, after = old[key][metric], new[key][metric]
+            change = (after - before) / before if before else 0.0
+            worse = change < -threshold if higher_is_better else change > threshold
+            regressions += worse
+            parts.append(f"{metric} {before}->{after} ({change:+.0%}){' ❌' if worse else ''}")
+        print(f"   {key[0]:<9} {key[1]:<22} " + " | ".join(parts))
+    print(f"{'❌' if regressions else '✅'} {regressions} regression(s) beyond {threshold:.0%}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against recorded pages")
+    parser.add_argument("--sites", nargs="+", choices=list(SITES), default=list(SITES))
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument("--limit", type=int, help="pages per site")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare_results(*args.compare) else 0)
+
+    results = run_benchmarks(args.sites, args.engines, args.limit)
+    path = save_results("scrapers", results)
+    print(f"💾 Results saved to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,124 +1,188 @@
-import pandas as pd
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 import time
 import csv
 import os
-
-# Set up Chrome options
-chrome_options = Options()
-chrome_options.add_argument("--headless") 
-
-# Specify the correct path to chromedriver.exe
-service = Service(r"D:\DSE_Folder\Year_3\Sem_2\Web Scraping\chromedriver-win64\chromedriver-win64\chromedriver.exe")
-
-
-# Initialize the WebDriver
-driver = webdriver.Chrome(service=service, options=chrome_options)
-
-# Define the range of job IDs to scrapea
-start_id = 10611925
-end_id   = 10613636
-base_url = "https://www.camhr.com/a/job/{}"
-
-# Define the columns for the CSV file
-columns = [
-    "Job Title", "Company Name", "Level", "Year of Exp.", "Hiring", "Salary", "Sex", "Age",
-    "Term", "Function", "Industry", "Qualification", "Language", "Location", "Job Requirements",
-    "Publish Date", "Closing Date", "Link URL"
-]  
-
-# Define the CSV filename
-csv_filename = "New_Data_cam_4.csv"
-
-# Create the CSV file if it doesn't exist
-if not os.path.exists(csv_filename):
-    with open(csv_filename, mode="w", newline="", encoding="utf-8-sig") as file:
+from urllib.parse import urljoin
+
+from job_record import JobRecord
+from sites import SITES, read_csv_header
+
+class CamHRConfig:
+    """Configuration class for CamHR job scraper"""
+
+    # Path to chromedriver; None lets Selenium Manager find a matching driver
+    CHROME_DRIVER_PATH = os.environ.get("CHROMEDRIVER_PATH")
+
+    # Define the range of job IDs to scrape
+    START_ID = 10611925
+    END_ID = 10613636
+    JOB_IDS = None  # explicit IDs (e.g. from discovery.py) instead of the range
+    BASE_URL = SITES["camhr"]["base_url"]  # $CAMHR_BASE_URL overrides it, see sites.py
+
+    # Define the CSV filename
+    CSV_FILENAME = "New_Data_cam_4.csv"
+
+    WAIT_TIMEOUT = 5
+    DELAY = 0.0000001
+
+    # Define the columns for the CSV file
+    COLUMNS = [
+        "Job Title", "Company Name", "Level", "Year of Exp.", "Hiring", "Salary", "Sex", "Age",
+        "Term", "Function", "Industry", "Qualification", "Language", "Location", "Job Requirements",
+        "Publish Date", "Closing Date", "Link URL", "Company URL"
+    ]
+
+
+def extract_job_title(soup):
+    job_title_span = soup.find("span", class_="job-name-span")
+    return job_title_span.text.strip() if job_title_span else None
+
+
+def extract_company_name(soup):
+    company_name_tag = soup.find("p", class_="mb-1 company-headbox")
+    if company_name_tag:
+        company_link = company_name_tag.find("a")
+        return company_link.text.strip() if company_link else None
+    return None
+
+
+def extract_company_link(soup, url):
+    """Absolute URL of the company profile linked from the company-headbox"""
+    company_name_tag = soup.find("p", class_="mb-1 company-headbox")
+    company_link = company_name_tag.find("a", href=True) if company_name_tag else None
+    return urljoin(url, company_link["href"]) if company_link else None
+
+
+def extract_table_data(soup, columns):
+    """Extract job details from the mailTable, matching headers against CSV columns"""
+    table_data = {}
+    table = soup.find("table", class_="mailTable")
+    if table:
+        rows = table.find_all("tr")
+        for row in rows:
+            headers = row.find_all("th", class_="column")
+            data_cells = row.find_all("td")
+            for header, data in zip(headers, data_cells):
+                key = header.text.strip()
+                value = data.text.strip()
+                for column in columns:
+                    if key.lower() in column.lower():
+                        table_data[column] = value
+    return table_data
+
+
+def extract_job_requirements(soup):
+    job_descript_divs = soup.find_all("div", class_="job-descript")
+    for div in job_descript_divs:
+        title_span = div.find("span", class_="descript-title")
+        if title_span and "Job Requirements" in title_span.text:
+            requirements_div = div.find("div", class_="fs-14 descript-list")
+            if requirements_div:
+                return requirements_div.get_text(separator="\n").strip()
+            break
+    return None
+
+
+def extract_dates(soup):
+    """Return (publish_date, closing_date) from the send-date block"""
+    send_date_div = soup.find("div", class_="send-date")
+    if send_date_div:
+        date_spans = send_date_div.find_all("span")  # Get all span elements inside
+        if len(date_spans) >= 2:
+            publish_date = date_spans[0].text.split(": ")[-1].strip()
+            closing_date = date_spans[1].text.split(": ")[-1].strip()
+            return publish_date, closing_date
+    return None, None
+
+
+# CSV column -> canonical field, for the values read from the detail table
+COLUMN_FIELDS = {column: field for field, column in SITES["camhr"]["fields"].items()}
+
+
+def extract_job_info(soup, url, columns=CamHRConfig.COLUMNS):
+    """Build the JobRecord for one parsed CamHR job page (None for missing fields)"""
+    fields = {COLUMN_FIELDS[column]: value for column, value in extract_table_data(soup, columns).items()
+              if column in COLUMN_FIELDS}
+    publish_date, closing_date = extract_dates(soup)
+    return JobRecord.build(
+        "camhr", **dict(fields, title=extract_job_title(soup), company=extract_company_name(soup),
+                        company_url=extract_company_link(soup, url), requirements=extract_job_requirements(soup),
+                        publish_date=publish_date, closing_date=closing_date, url=url))
+
+
+def parse_job_page(html, url, parser="html.parser"):
+    """
+    Parse raw CamHR job page HTML into a JobRecord
+
+    Returns None when the page has no job header (removed or invalid ID),
+    mirroring the WebDriverWait check used by the browser scraper.
+    """
+    soup = BeautifulSoup(html, parser)
+    if not soup.find(class_="job-header-content"):
+        return None
+    return extract_job_info(soup, url)
+
+
+def main(config=CamHRConfig):
+    # Selenium is only needed for browser crawls, not for parsing
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    # Set up Chrome options
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    service = Service(config.CHROME_DRIVER_PATH)
+
+    # Initialize the WebDriver
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+
+    # Create the CSV file if it doesn't exist
+    if not os.path.exists(config.CSV_FILENAME):
+        with open(config.CSV_FILENAME, mode="w", newline="", encoding="utf-8-sig") as file:
+            writer = csv.writer(file)
+            writer.writerow(config.COLUMNS)
+
+    # Files written before a column was added keep their own layout
+    columns = read_csv_header(config.CSV_FILENAME) or config.COLUMNS
+
+    # Open the CSV file in append mode
+    with open(config.CSV_FILENAME, mode="a", newline="", encoding="utf-8-sig") as file:
         writer = csv.writer(file)
-        writer.writerow(columns)
-
-# Open the CSV file in append mode
-with open(csv_filename, mode="a", newline="", encoding="utf-8-sig") as file:
-    writer = csv.writer(file)
-    for job_id in range(start_id, end_id + 1):
-        url = base_url.format(job_id)
-        driver.get(url)
-        try:
-            WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "job-header-content"))
-            )
-        except:
-            print(f"Skipping {url} (Page not loaded properly)")
-            continue
-
-        time.sleep(0.0000001)  
-
-        # Parse the page source with BeautifulSoup
-        soup = BeautifulSoup(driver.page_source, "html.parser")
-
-        # Initialize a dictionary to store job information
-        job_info = {col: "Not found" for col in columns}
-
-        # Extract the job title
-        job_title_span = soup.find("span", class_="job-name-span")
-        job_info["Job Title"] = job_title_span.text.strip() if job_title_span else "Not found"
-
-        # Extract the company name
-        company_name_tag = soup.find("p", class_="mb-1 company-headbox")
-        if company_name_tag:
-            company_link = company_name_tag.find("a")
-            job_info["Company Name"] = company_link.text.strip() if company_link else "Not found"
-
-        # Extract job details from the table
-        table = soup.find("table", class_="mailTable")
-        if table:
-            rows = table.find_all("tr")
-            for row in rows:
-                headers = row.find_all("th", class_="column")
-                data_cells = row.find_all("td")
-                for header, data in zip(headers, data_cells):  
-                    key = header.text.strip()
-                    value = data.text.strip()
-                    for column in columns:
-                        if key.lower() in column.lower():
-                            job_info[column] = value
-
-        # Extract job requirements
-        job_descript_divs = soup.find_all("div", class_="job-descript")
-        for div in job_descript_divs:
-            title_span = div.find("span", class_="descript-title")
-            if title_span and "Job Requirements" in title_span.text:
-                job_info["Job Requirements"] = div.find("div", class_="fs-14 descript-list").get_text(separator="\n").strip()
-                break
-
-
-        # Extract Publish Date and Closing Date (Fix for "Not found" issue)
-        send_date_div = soup.find("div", class_="send-date")
-        if send_date_div:
-            date_spans = send_date_div.find_all("span")  # Get all span elements inside
-            if len(date_spans) >= 2:
-                job_info["Publish Date"] = date_spans[0].text.split(": ")[-1].strip()
-                job_info["Closing Date"] = date_spans[1].text.split(": ")[-1].strip()
-            else:
-                job_info["Publish Date"] = "Not found"
-                job_info["Closing Date"] = "Not found"
-
-        # Add the job URL to the dictionary
-        job_info["Link URL"] = url
-
-        # Print the extracted data
-        print(f"Extracted Data for {job_id}:\n", job_info)
-
-        # Write the data to the CSV file
-        row_data = [job_info.get(col, "Not found") for col in columns]
-        writer.writerow(row_data)
-        print(f"Scraped and saved data from {url}")
-
-# Close the WebDriver
-driver.quit()
-print("All job data saved successfully to camhr_jobs_name.csv")
+        job_ids = config.JOB_IDS if config.JOB_IDS is not None else range(config.START_ID, config.END_ID + 1)
+        for job_id in job_ids:
+            url = config.BASE_URL.format(job_id)
+            driver.get(url)
+            try:
+                WebDriverWait(driver, config.WAIT_TIMEOUT).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, "job-header-content"))
+                )
+            except:
+                print(f"Skipping {url} (Page not loaded properly)")
+                continue
+
+            time.sleep(config.DELAY)
+
+            # Parse the page source with BeautifulSoup
+            soup = BeautifulSoup(driver.page_source, "html.parser")
+            record = extract_job_info(soup, url, config.COLUMNS)
+
+            # Print the extracted data
+            print(f"Extracted Data for {job_id}:\n", record)
+
+            # Write the data to the CSV file
+            row = record.to_row(SITES["camhr"]["placeholder"])
+            row_data = [row.get(col, SITES["camhr"]["placeholder"]) for col in columns]
+            writer.writerow(row_data)
+            print(f"Scraped and saved data from {url}")
+
+    # Close the WebDriver
+    driver.quit()
+    print(f"All job data saved successfully to {config.CSV_FILENAME}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""
+Company profiles for job enrichment, fetched once per company
+
+Job pages only carry the company name (and on CamHR, a link to the company
+page). Size, industry and location live on the company page, and the same
+company posts dozens of jobs, so fetching it per job repeats the same
+request over and over. Instead:
+
+    1. collect   company names and profile URLs from the scraped CSVs (or
+                 live from the pipeline's CompanySink during a crawl)
+    2. refresh   fetch each company page at most once per TTL, with
+                 conditional GETs; results are kept in a JSON cache
+    3. enrich    join the cached profiles onto a CSV in one pass, one dict
+                 lookup per job
+
+Company names are normalized ("Wing Bank (Cambodia) Plc" and "WING BANK"
+share one entry), so a company seen on CamHR and Workinga gets one profile
+for both.
+
+Usage:
+    python company_profiles.py collect
+    python company_profiles.py refresh --ttl-days 30
+    python company_profiles.py enrich CamHr.csv --site camhr --output CamHr_enriched.csv
+    python company_profiles.py show --multi-site
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import time
+from datetime import datetime
+
+from job_record import drop_journal, read_journal
+from sites import SITES, get_site, is_missing
+
+
+class CompanyConfig:
+    CACHE_FILENAME = "company_profiles.json"
+    TTL_DAYS = 30        # refetch profiles older than this
+    RETRY_DAYS = 1       # retry failed fetches after this
+    TIMEOUT = 10
+    DELAY = 0.2          # seconds between requests to the same site
+    MAX_FETCHES = None   # cap per refresh run
+
+
+# Profile fields and the labels that introduce them on company pages
+PROFILE_LABELS = {
+    "size": ("company size", "employees", "number of employees", "staff"),
+    "industry": ("industry", "business type", "sector"),
+    "location": ("location", "address", "province", "city"),
+    "website": ("website", "web site", "homepage"),
+}
+
+# CSV columns added by enrich_csv
+ENRICH_COLUMNS = {"size": "Company Size", "industry": "Company Industry", "location": "Company Location",
+                  "website": "Company Website"}
+
+LEGAL_SUFFIXES = re.compile(
+    r"\b(co|company|corp|corporation|ltd|limited|plc|inc|llc|group|holdings?|cambodia|kh)\b")
+
+
+def normalize_company(name):
+    """Key that matches the same company across sites: lowercase, no punctuation or legal suffixes"""
+    if is_missing(name):
+        return None
+    key = re.sub(r"[^\w\s]", " ", str(name).lower())
+    stripped = LEGAL_SUFFIXES.sub(" ", key)
+    # A name made only of suffix words ("Group Co., Ltd") keeps them
+    key = stripped if stripped.strip() else key
+    return re.sub(r"\s+", " ", key).strip() or None
+
+
+def label_field(label):
+    label = label.strip().rstrip(":").strip().lower()
+    for field, labels in PROFILE_LABELS.items():
+        if label in labels:
+            return field
+    return None
+
+
+def parse_company_page(html, url=None):
+    """
+    Profile fields from a company page
+
+    Reads label/value pairs from tables (th/td), definition lists (dt/dd) and
+    "Label: value" lines; the name comes from the page heading.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    profile = {}
+    for label_tag in soup.find_all(["th", "dt"]):
+        field = label_field(label_tag.get_text())
+        value_tag = label_tag.find_next_sibling(["td", "dd"])
+        if field and value_tag and field not in profile:
+            link = value_tag.find("a", href=True) if field == "website" else None
+            profile[field] = link["href"] if link else value_tag.get_text(" ", strip=True)
+    for line in soup.get_text("\n").splitlines():
+        label, separator, value = line.partition(":")
+        field = label_field(label) if separator and len(label) < 30 else None
+        if field and value.strip() and field not in profile:
+            profile[field] = value.strip()
+
+    heading = soup.find(class_=re.compile("company-name")) or soup.find("h1")
+    if heading and heading.get_text(strip=True):
+        profile["name"] = heading.get_text(" ", strip=True)
+    return {field: value for field, value in profile.items() if not is_missing(value)}
+
+
+class CompanyCache:
+    """
+    Company entries keyed by normalize_company(name), saved as JSON
+
+    Each entry: {"name", "aliases": {site: [names]}, "urls": {site: url},
+    "profile", "fetched_at", "status", "etag", "last_modified"}
+    """
+
+    def __init__(self, companies=None):
+        self.companies = companies or {}
+
+    @classmethod
+    def load(cls, path=CompanyConfig.CACHE_FILENAME):
+        cache = cls()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                cache.companies = json.load(f)["companies"]
+        for record, _ in read_journal(path):  # companies the pipeline saw since the last full save
+            cache.add(record["site"], record["company"], record.get("company_url"))
+        return cache
+
+    def save(self, path=CompanyConfig.CACHE_FILENAME):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time(), "companies": self.companies}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        drop_journal(path)
+
+    def add(self, site, name, url=None):
+        """Register a company name seen on a site (and its profile URL if known); returns the key"""
+        key = normalize_company(name)
+        if key is None:
+            return None
+        entry = self.companies.get(key)
+        if entry is None:
+            entry = self.companies[key] = {"name": name.strip(), "aliases": {}, "urls": {}, "profile": None,
+                                           "fetched_at": None, "status": None, "etag": None, "last_modified": None}
+        aliases = entry["aliases"].setdefault(site, [])
+        if name.strip() not in aliases:
+            aliases.append(name.strip())
+        if url and not is_missing(url) and entry["urls"].get(site) != url:
+            entry["urls"][site] = url
+            entry["fetched_at"] = None  # new profile page: fetch it on the next refresh
+        return key
+
+    def profile(self, name):
+        entry = self.companies.get(normalize_company(name))
+        return entry["profile"] if entry else None
+
+    def due(self, ttl_days=CompanyConfig.TTL_DAYS, retry_days=CompanyConfig.RETRY_DAYS, now=None):
+        """Keys of companies with a profile URL whose cached profile is missing or expired"""
+        now = now or time.time()
+        keys = []
+        for key, entry in self.companies.items():
+            if not entry["urls"]:
+                continue
+            max_age = (ttl_days if entry["status"] in (200, 304) else retry_days) * 86400
+            if entry["fetched_at"] is None or now - entry["fetched_at"] >= max_age:
+                keys.append(key)
+        return keys
+
+
+def collect_from_csv(cache, site, csv_path):
+    """Add the company names (and CamHR profile URLs) of a scraped CSV; returns rows read"""
+    fields = get_site(site)["fields"]
+    name_column, url_column = fields.get("company"), fields.get("company_url")
+    if not name_column:
+        return 0
+    rows = 0
+    with open(csv_path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        for row in csv.DictReader(f):
+            cache.add(site, row.get(name_column), row.get(url_column) if url_column else None)
+            rows += 1
+    return rows
+
+
+def collect(cache, csv_paths=None):
+    """Collect from each site's registry CSV and crawl CSV (or the given {site: [paths]})"""
+    from discovery import CRAWL_CSVS
+
+    csv_paths = csv_paths or {site: [info["csv"], CRAWL_CSVS[site]] for site, info in SITES.items()}
+    for site, paths in csv_paths.items():
+        for path in paths:
+            if os.path.exists(path):
+                rows = collect_from_csv(cache, site, path)
+                print(f"📄 {path}: {rows} jobs")
+    linked = sum(1 for entry in cache.companies.values() if entry["urls"])
+    print(f"🏢 {len(cache.companies)} companies, {linked} with a profile page")
+
+
+def refresh(cache, session=None, config=CompanyConfig, ttl_days=None, max_fetches=None, save_path=None):
+    """
+    Fetch the profile pages that are missing or older than the TTL
+
+    Expired profiles are revalidated with ETag / Last-Modified, so an
+    unchanged page costs a 304. Returns counts of fetched, not_modified,
+    failed and skipped companies.
+    """
+    from fetching import create_session, fetch_page
+
+    session = session or create_session()
+    ttl_days = config.TTL_DAYS if ttl_days is None else ttl_days
+    due = cache.due(ttl_days, config.RETRY_DAYS)
+    max_fetches = max_fetches or config.MAX_FETCHES
+    batch = due[:max_fetches] if max_fetches else due
+    stats = {"fetched": 0, "not_modified": 0, "failed": 0, "skipped": len(due) - len(batch)}
+    print(f"🏢 {len(due)} company profile(s) to fetch ({len(cache.companies)} cached)")
+
+    for number, key in enumerate(batch, 1):
+        entry = cache.companies[key]
+        # Prefer the site whose page layout parse_company_page was written for
+        site = "camhr" if "camhr" in entry["urls"] else next(iter(entry["urls"]))
+        result = fetch_page(session, entry["urls"][site], entry["etag"], entry["last_modified"], config.TIMEOUT)
+        entry["fetched_at"] = time.time()
+        entry["status"] = result["status"]
+        if result["status"] == 200:
+            entry["profile"] = parse_company_page(result["html"], result["url"])
+            entry["etag"], entry["last_modified"] = result["etag"], result["last_modified"]
+            stats["fetched"] += 1
+        elif result["status"] == 304:
+            stats["not_modified"] += 1
+        else:
+            stats["failed"] += 1
+            print(f"⚠️ {entry['name']}: {result['status'] or result['error']}")
+        if save_path and number % 50 == 0:
+            cache.save(save_path)
+        time.sleep(config.DELAY)
+
+    print(f"✅ {stats['fetched']} fetched, {stats['not_modified']} unchanged, {stats['failed']} failed"
+          + (f", {stats['skipped']} left for the next run" if stats["skipped"] else ""))
+    return stats
+
+
+def enrich_rows(cache, site, rows):
+    """Yield rows with ENRICH_COLUMNS added from the cached profiles (normalized once per distinct name)"""
+    name_column = get_site(site)["fields"].get("company")
+    profiles = {}
+    for row in rows:
+        name = row.get(name_column) if name_column else None
+        if name not in profiles:
+            profiles[name] = cache.profile(name) or {}
+        profile = profiles[name]
+        row.update({column: profile.get(field, "") for field, column in ENRICH_COLUMNS.items()})
+        yield row
+
+
+def enrich_csv(cache, site, csv_path, output):
+    """Write a copy of a scraped CSV with the company profile columns appended; returns (rows, matched)"""
+    rows = matched = 0
+    with open(csv_path, "r", encoding="utf-8-sig", errors="replace", newline="") as f_in, \
+            open(output, "w", newline="", encoding="utf-8-sig") as f_out:
+        reader = csv.DictReader(f_in)
+        writer = csv.DictWriter(f_out, fieldnames=list(reader.fieldnames or []) + list(ENRICH_COLUMNS.values()))
+        writer.writeheader()
+        for row in enrich_rows(cache, site, reader):
+            writer.writerow(row)
+            rows += 1
+            matched += any(row[column] for column in ENRICH_COLUMNS.values())
+    print(f"✅ {matched} of {rows} jobs enriched with company profiles")
+    print(f"💾 Data saved to {output}")
+    return rows, matched
+
+
+def show(cache, multi_site=False, limit=50):
+    entries = sorted(cache.companies.values(), key=lambda entry: entry["name"].lower())
+    if multi_site:
+        entries = [entry for entry in entries if len(entry["aliases"]) > 1]
+    for entry in entries[:limit]:
+        profile = entry["profile"] or {}
+        fetched = datetime.fromtimestamp(entry["fetched_at"]).strftime("%Y-%m-%d") if entry["fetched_at"] else "-"
+        sites = ", ".join(f"{site}: {' / '.join(names)}" for site, names in entry["aliases"].items())
+        print(f"🏢 {entry['name']}  [{sites}]")
+        print(f"   {profile.get('industry', '-')} | {profile.get('size', '-')} | {profile.get('location', '-')}"
+              f" | fetched {fetched}")
+    print(f"\n{len(entries)} compan{'y' if len(entries) == 1 else 'ies'}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cache company profiles and join them onto scraped jobs")
+    parser.add_argument("--cache", default=CompanyConfig.CACHE_FILENAME)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    collect_parser = subparsers.add_parser("collect", help="read company names and profile URLs from CSVs")
+    collect_parser.add_argument("--csv", nargs="+", metavar="SITE=PATH", help="CSVs to read (default: all sites)")
+
+    refresh_parser = subparsers.add_parser("refresh", help="fetch missing or expired company profiles")
+    refresh_parser.add_argument("--ttl-days", type=float, default=CompanyConfig.TTL_DAYS)
+    refresh_parser.add_argument("--max-fetches", type=int)
+
+    enrich_parser = subparsers.add_parser("enrich", help="write a CSV with company profile columns added")
+    enrich_parser.add_argument("csv")
+    enrich_parser.add_argument("--site", choices=list(SITES), required=True)
+    enrich_parser.add_argument("--output", help="default: <csv>_enriched.csv")
+
+    show_parser = subparsers.add_parser("show", help="list cached companies")
+    show_parser.add_argument("--multi-site", action="store_true", help="only companies seen on several sites")
+    show_parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args(argv)
+
+    cache = CompanyCache.load(args.cache)
+    if args.command == "collect":
+        csv_paths = None
+        if args.csv:
+            csv_paths = {}
+            for site, path in (item.split("=", 1) for item in args.csv):
+                csv_paths.setdefault(site, []).append(path)
+        collect(cache, csv_paths)
+        cache.save(args.cache)
+    elif args.command == "refresh":
+        refresh(cache, ttl_days=args.ttl_days, max_fetches=args.max_fetches, save_path=args.cache)
+        cache.save(args.cache)
+    elif args.command == "enrich":
+        enrich_csv(cache, args.site, args.csv, args.output or os.path.splitext(args.csv)[0] + "_enriched.csv")
+    else:
+        show(cache, args.multi_site, args.limit)
+
+
+if __name__ == "__main__":
+    main()
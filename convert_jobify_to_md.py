@@ -1,7 +1,6 @@
 import pandas as pd
 import os
 import re
-from pathlib import Path
 
 def clean_text(text):
     if pd.isna(text):
@@ -77,9 +76,8 @@ def create_markdown_file(row, output_dir):
     
     return filename
 
-def main():
+def main(csv_path="Jobify.csv", output_dir="Jobify_markdowns"):
     # Create output directory if it doesn't exist
-    output_dir = "Jobify_markdowns"
     os.makedirs(output_dir, exist_ok=True)
     
     # Read the CSV file with different encodings
@@ -88,7 +86,7 @@ def main():
     
     for encoding in encodings:
         try:
-            df = pd.read_csv('Jobify.csv', encoding=encoding, on_bad_lines='skip')
+            df = pd.read_csv(csv_path, encoding=encoding, on_bad_lines='skip')
             if not df.empty:
                 print(f"Successfully read file with {encoding} encoding")
                 break
@@ -0,0 +1,483 @@
+"""
+Long-running crawl scheduler for all three sites
+
+Instead of hand-picked ID ranges, one process owns a priority queue of crawl
+work and spends a fixed request budget per host on whatever matters most:
+
+    probe      IDs just past each site's frontier (the highest live job ID),
+               every PROBE_SECONDS; a hit moves the frontier and probes the
+               next window straight away, so new postings land within minutes.
+               After a run of misses (deleted or unpublished IDs), each round
+               also probes further ahead at doubling distances, so a gap
+               wider than the window doesn't stall the frontier
+    recheck    open jobs closing within RECHECK_DAYS (sites without a closing
+               date: every NO_CLOSING_RECHECK_DAYS, until RefreshConfig.MAX_AGE_DAYS),
+               with conditional GETs via refresh_jobs.check_entry; changes go
+               to the change log. With --base-url, rechecks request the stored
+               job's ID on the given host rather than its stored URL
+    backfill   unscraped IDs below the frontier, walked downwards a batch at a
+               time, only when the host has spare budget
+
+Each host has a token bucket (RATE_PER_MINUTE, BURST). Backfill only runs
+while the bucket holds more than BACKFILL_RESERVE tokens, so it never delays
+a probe or a recheck. Total traffic is bounded by the bucket rate however
+much work is queued.
+
+Workinga pages are client-rendered, so with a workinga_api.py endpoint
+configured its probes and rechecks go through the JSON endpoint instead.
+A task whose parser or pipeline raises is counted as an error and skipped.
+
+New jobs go through the streaming pipeline (CSV, markdown, index and any
+optional sinks) and are seeded into the refresh state so they get rechecked
+later. The queue, frontiers and backfill cursors are saved to
+crawl_scheduler.json every SAVE_SECONDS and on exit, so a restart picks up
+where it stopped.
+
+Usage:
+    python crawl_scheduler.py run                                # all sites, until Ctrl+C
+    python crawl_scheduler.py run --sites camhr jobify --rate-per-minute 30 --store job_store
+    python crawl_scheduler.py run --duration 3600 --max-requests 2000
+    python crawl_scheduler.py status
+"""
+import argparse
+import heapq
+import json
+import os
+import signal
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from urllib.parse import urlparse
+
+from sites import SITES, get_parser, get_site, job_id_from_url, parse_date
+
+
+class SchedulerConfig:
+    STATE_FILENAME = "crawl_scheduler.json"
+    RATE_PER_MINUTE = 20           # requests per host
+    BURST = 5                      # bucket size per host
+    BACKFILL_RESERVE = 2           # tokens backfill leaves for probes and rechecks
+    PROBE_SECONDS = 120            # how often each site's frontier is probed
+    PROBE_WINDOW = 5               # IDs probed past the frontier per round
+    PROBE_GALLOP_STEPS = 8         # extra probes at window x 2, x 4, ... after each window of misses
+    RECHECK_SCAN_SECONDS = 900     # how often the refresh state is scanned for rechecks
+    RECHECK_DAYS = 3               # recheck open jobs closing within this many days
+    RECHECK_HOURS = 12             # ...at most this often
+    NO_CLOSING_RECHECK_DAYS = 7    # sites without a closing date
+    BACKFILL_BATCH = 20            # backfill IDs queued per site at a time
+    RETRY_SECONDS = 600            # backfill retry delay after a network error
+    MAX_ATTEMPTS = 3
+    SAVE_SECONDS = 30
+    STATUS_SECONDS = 60
+    TIMEOUT = 10
+
+
+PRIORITY = {"probe": 0, "recheck": 1, "backfill": 2}
+
+
+class TokenBucket:
+    """Requests allowed per host: refills at `rate` per second up to `capacity`"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def available(self, now, reserve=0):
+        self._refill(now)
+        return self.tokens >= 1 + reserve
+
+    def take(self, now):
+        self._refill(now)
+        self.tokens -= 1
+
+    def wait(self, now, reserve=0):
+        """Seconds until a request (keeping `reserve` tokens) is allowed"""
+        self._refill(now)
+        return max(0.0, (1 + reserve - self.tokens) / self.rate)
+
+
+def numeric_ids(ids):
+    return {int(job_id) for job_id in ids if str(job_id).isdigit()}
+
+
+class CrawlScheduler:
+    """Priority queue of crawl tasks per host, with token-bucket budgets and a persisted state"""
+
+    def __init__(self, sites=None, config=SchedulerConfig, state_path=SchedulerConfig.STATE_FILENAME,
+                 base_urls=None, pipeline=None, refresh_state_path=None, changes_path=None, session=None):
+        from fetching import create_session
+        from refresh_jobs import RefreshConfig, load_state, site_fetcher
+
+        self.sites = list(sites or SITES)
+        self.config = config
+        self.state_path = state_path
+        self.base_urls = {site: (base_urls or {}).get(site) or get_site(site)["base_url"] for site in self.sites}
+        self.rehosted = {site for site in self.sites if (base_urls or {}).get(site)}
+        self.hosts = {site: urlparse(url).netloc for site, url in self.base_urls.items()}
+        self.pipeline = pipeline
+        self.refresh_state_path = refresh_state_path or RefreshConfig.STATE_FILENAME
+        self.changes_path = changes_path or RefreshConfig.CHANGES_FILENAME
+        self.refresh_state = load_state(self.refresh_state_path)
+        self.session = session or create_session()
+        # (job URL -> URL to request, parser); None where rechecks are impossible (Workinga without its API)
+        self.fetchers = {site: site_fetcher(site) for site in self.sites}
+        self.parsers = {site: (self.fetchers[site] or (None, get_parser(site)))[1] for site in self.sites}
+        self.buckets = {host: TokenBucket(config.RATE_PER_MINUTE / 60, config.BURST)
+                        for host in set(self.hosts.values())}
+
+        self.delayed = []                          # (due, seq, task) not yet due
+        self.ready = {host: [] for host in self.buckets}   # host -> [(priority, due, seq, task)]
+        self.queued = set()                        # (kind, site, target) of every queued task
+        self.seq = 0
+        self.known = {}
+        self.site_state = {}
+        self.stats = Counter()
+        self.recheck_scanned = 0.0
+        self.stopping = False
+        self._load()
+
+    # --- persistence -----------------------------------------------------
+
+    def _load(self):
+        from discovery import known_job_ids
+
+        saved = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+        for site in self.sites:
+            self.known[site] = numeric_ids(known_job_ids(site))
+            state = saved.get("sites", {}).get(site) or {}
+            frontier = max(self.known[site], default=0)
+            self.site_state[site] = {
+                "frontier": max(state.get("frontier", 0), frontier),
+                "backfill_cursor": state.get("backfill_cursor", frontier),
+                "backfill_floor": state.get("backfill_floor", min(self.known[site], default=0)),
+                "probe_misses": state.get("probe_misses", 0),  # missing probes since the last hit
+                "probed_at": 0.0,  # probe straight after a restart
+            }
+        for task in saved.get("queue", []):
+            if task["site"] in self.site_state:
+                self.push(task)
+        print(f"📋 Scheduler state: {len(self.queued)} queued tasks, frontiers "
+              + ", ".join(f"{site} {state['frontier']}" for site, state in self.site_state.items()))
+
+    def save(self):
+        from refresh_jobs import save_state
+
+        queue = [entry[-1] for entry in self.delayed] + [entry[-1] for heap in self.ready.values() for entry in heap]
+        payload = {"saved_at": time.time(), "sites": self.site_state, "queue": queue}
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self.state_path)
+        save_state(self.refresh_state_path, self.refresh_state)
+        if self.pipeline:
+            for sink in self.pipeline.sinks:
+                sink.flush()
+
+    # --- queue -----------------------------------------------------------
+
+    def push(self, task):
+        """Queue a task dict (kind, site, target, due, attempts) unless an identical one is queued"""
+        key = (task["kind"], task["site"], task["target"])
+        if key in self.queued:
+            return False
+        task.setdefault("due", time.time())
+        task.setdefault("attempts", 0)
+        self.queued.add(key)
+        self.seq += 1
+        heapq.heappush(self.delayed, (task["due"], self.seq, task))
+        return True
+
+    def _promote(self, now):
+        while self.delayed and self.delayed[0][0] <= now:
+            due, seq, task = heapq.heappop(self.delayed)
+            heapq.heappush(self.ready[self.hosts[task["site"]]], (PRIORITY[task["kind"]], due, seq, task))
+
+    def _reserve(self, task):
+        return self.config.BACKFILL_RESERVE if task["kind"] == "backfill" else 0
+
+    def next_task(self):
+        """Pop the most urgent task whose host has budget; returns (task, seconds to wait if none)"""
+        now = time.monotonic()
+        self._promote(time.time())
+        best, wait = None, self.config.PROBE_SECONDS
+        for host, heap in self.ready.items():
+            if not heap:
+                continue
+            task = heap[0][-1]
+            bucket = self.buckets[host]
+            if bucket.available(now, self._reserve(task)):
+                if best is None or heap[0][:2] < self.ready[best][0][:2]:
+                    best = host
+            else:
+                wait = min(wait, bucket.wait(now, self._reserve(task)))
+        if self.delayed:
+            wait = min(wait, max(0.0, self.delayed[0][0] - time.time()))
+        if best is None:
+            return None, wait
+        task = heapq.heappop(self.ready[best])[-1]
+        self.queued.discard((task["kind"], task["site"], task["target"]))
+        self.buckets[best].take(now)
+        return task, 0.0
+
+    def pending(self):
+        counts = Counter(entry[-1]["kind"] for entry in self.delayed)
+        counts.update(entry[-1]["kind"] for heap in self.ready.values() for entry in heap)
+        return counts
+
+    # --- planning --------------------------------------------------------
+
+    def plan(self):
+        """Queue probe rounds, rechecks and backfill batches that are due"""
+        now = time.time()
+        for site, state in self.site_state.items():
+            if now - state["probed_at"] >= self.config.PROBE_SECONDS:
+                state["probed_at"] = now
+                self._queue_probes(site, now)
+        if now - self.recheck_scanned >= self.config.RECHECK_SCAN_SECONDS:
+            self.recheck_scanned = now
+            self._queue_rechecks(now)
+        pending = self.pending()
+        if pending["backfill"] < self.config.BACKFILL_BATCH:
+            for site in self.site_state:
+                self._queue_backfill(site, now)
+
+    def _queue_probes(self, site, now):
+        state = self.site_state[site]
+        frontier, window = state["frontier"], self.config.PROBE_WINDOW
+        targets = list(range(frontier + 1, frontier + 1 + window))
+        # Every window of misses in a row adds one probe further out: frontier + window x 2, x 4, ...
+        steps = min(state["probe_misses"] // window, self.config.PROBE_GALLOP_STEPS)
+        targets += [frontier + window * 2 ** step for step in range(1, steps + 1)]
+        for job_id in targets:
+            self.push({"kind": "probe", "site": site, "target": job_id, "due": now})
+
+    def _queue_rechecks(self, now):
+        from refresh_jobs import RefreshConfig, is_open
+
+        today = date.today()
+        recent = datetime.now() - timedelta(hours=self.config.RECHECK_HOURS)
+        stale = datetime.now() - timedelta(days=self.config.NO_CLOSING_RECHECK_DAYS)
+        queued = 0
+        for url, entry in self.refresh_state.items():
+            site = entry.get("site")
+            if site not in self.site_state or entry.get("removed") or self.fetchers[site] is None:
+                continue
+            checked = datetime.fromisoformat(entry["checked_at"]) if entry.get("checked_at") else None
+            closing_column = get_site(site)["closing_column"]
+            closing = parse_date(entry["record"].get(closing_column)) if closing_column else None
+            if closing is not None:
+                due = today <= closing <= today + timedelta(days=self.config.RECHECK_DAYS) \
+                    and (checked is None or checked < recent)
+            else:
+                # No closing date to go by (Jobify, or unparseable): recheck on a slow cycle, until it's too old
+                first_seen = entry.setdefault("first_seen", today.isoformat())
+                due = (checked is None or checked < stale) \
+                    and is_open(entry["record"], None, today, first_seen, RefreshConfig.MAX_AGE_DAYS)
+            if due:
+                queued += self.push({"kind": "recheck", "site": site, "target": url, "due": now})
+        if queued:
+            print(f"🔁 Queued {queued} rechecks")
+
+    def _queue_backfill(self, site, now):
+        state = self.site_state[site]
+        cursor, queued = state["backfill_cursor"], 0
+        while cursor > state["backfill_floor"] and queued < self.config.BACKFILL_BATCH:
+            cursor -= 1
+            if cursor not in self.known[site]:
+                queued += self.push({"kind": "backfill", "site": site, "target": cursor, "due": now})
+        state["backfill_cursor"] = cursor
+
+    # --- execution -------------------------------------------------------
+
+    def run_task(self, task):
+        self.stats[task["kind"]] += 1
+        try:
+            if task["kind"] == "recheck":
+                outcome = self._recheck(task)
+            else:
+                outcome = self._fetch_job(task)
+        except Exception as e:
+            # A page the parser chokes on, or a failing sink, must not stop the scheduler
+            print(f"❌ {task['kind']} {task['site']} {task['target']}: {type(e).__name__}: {e}")
+            outcome = "errors"
+        self.stats[f"{task['kind']}_{outcome}"] += 1
+        return outcome
+
+    def _recheck(self, task):
+        from refresh_jobs import RefreshConfig, check_entry, write_event
+
+        site, url = task["site"], task["target"]
+        entry = self.refresh_state.get(url)
+        if entry is None or self.fetchers[site] is None:
+            return "skipped"
+        fetch_url, parse = self.fetchers[site]
+        page_url = self.base_urls[site].format(job_id_from_url(url)) if site in self.rehosted else url
+        outcome, event = check_entry(site, url, entry, self.session, parse, RefreshConfig, fetch_url(page_url))
+        if event:
+            with open(self.changes_path, "a", encoding="utf-8") as f:
+                write_event(f, event)
+        return outcome
+
+    def _fetch_job(self, task):
+        from fetching import fetch_page
+        from refresh_jobs import seed_state
+
+        site, job_id = task["site"], task["target"]
+        url = self.base_urls[site].format(job_id)
+        fetch_url = self.fetchers[site][0](url) if self.fetchers[site] else url
+        result = fetch_page(self.session, fetch_url, timeout=self.config.TIMEOUT)
+        if result["status"] is None or result["status"] >= 500 or result["status"] == 429:
+            task["attempts"] += 1
+            if task["kind"] == "backfill" and task["attempts"] < self.config.MAX_ATTEMPTS:
+                task["due"] = time.time() + self.config.RETRY_SECONDS
+                self.push(task)
+            return "errors"   # probes are simply retried by the next round
+        row = self.parsers[site](result["html"], url) if result["status"] == 200 else None
+        state = self.site_state[site]
+        if row is None:
+            if task["kind"] == "probe" and job_id > state["frontier"]:
+                state["probe_misses"] += 1
+            return "missing"
+
+        self.known[site].add(job_id)
+        seed_state(self.refresh_state, site, {url: row})
+        if self.pipeline:
+            self.pipeline.process(site, row)
+        if task["kind"] == "probe" and job_id > state["frontier"]:
+            state["probe_misses"] = 0
+            # IDs skipped on the way may still be published; let backfill revisit them
+            for gap in range(state["frontier"] + 1, job_id):
+                if gap not in self.known[site]:
+                    self.push({"kind": "backfill", "site": site, "target": gap,
+                               "due": time.time() + self.config.RETRY_SECONDS})
+            state["frontier"] = job_id
+            self._queue_probes(site, time.time())
+            print(f"🆕 {site} {job_id}: {row.get('Job Title', '')}")
+        return "found"
+
+    def print_status(self, started):
+        elapsed = max(time.time() - started, 1e-9)
+        requests = sum(self.stats[kind] for kind in PRIORITY)
+        pending = self.pending()
+        print(f"⏱️ {requests} requests ({requests / elapsed * 60:.1f}/min) | "
+              + " | ".join(f"{kind} {self.stats[kind]} run, {pending[kind]} queued" for kind in PRIORITY)
+              + f" | {self.stats['probe_found'] + self.stats['backfill_found']} new jobs")
+
+    def run(self, duration=None, max_requests=None):
+        """Work the queue until stopped (Ctrl+C / SIGTERM), `duration` seconds or `max_requests`"""
+        started = saved = status = time.time()
+        requests = 0
+        previous = signal.signal(signal.SIGTERM, lambda *_: setattr(self, "stopping", True))
+        try:
+            while not self.stopping:
+                now = time.time()
+                if duration is not None and now - started >= duration:
+                    break
+                if max_requests is not None and requests >= max_requests:
+                    break
+                self.plan()
+                task, wait = self.next_task()
+                if task is None:
+                    time.sleep(min(wait, 1.0))
+                else:
+                    self.run_task(task)
+                    requests += 1
+                if now - saved >= self.config.SAVE_SECONDS:
+                    self.save()
+                    saved = now
+                if now - status >= self.config.STATUS_SECONDS:
+                    self.print_status(started)
+                    status = now
+        except KeyboardInterrupt:
+            pass
+        finally:
+            signal.signal(signal.SIGTERM, previous)
+            self.save()
+            self.print_status(started)
+        return dict(self.stats)
+
+
+def show_status(state_path):
+    if not os.path.exists(state_path):
+        print(f"📭 No scheduler state at {state_path}")
+        return
+    with open(state_path, "r", encoding="utf-8") as f:
+        saved = json.load(f)
+    print(f"💾 Saved {datetime.fromtimestamp(saved['saved_at']).isoformat(timespec='seconds')}")
+    for site, state in saved["sites"].items():
+        print(f"   {site:9} frontier {state['frontier']}, backfill at {state['backfill_cursor']} "
+              f"(floor {state['backfill_floor']})")
+    counts = Counter((task["site"], task["kind"]) for task in saved["queue"])
+    for (site, kind), count in sorted(counts.items()):
+        print(f"   {site:9} {kind:9} {count} queued")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Continuous priority crawl scheduler (probe > recheck > backfill)")
+    parser.add_argument("--state", default=SchedulerConfig.STATE_FILENAME)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="run the scheduler until stopped")
+    run_parser.add_argument("--sites", nargs="+", choices=list(SITES), default=list(SITES))
+    run_parser.add_argument("--base-url", nargs="+", metavar="SITE=TEMPLATE", default=[],
+                            help="job URL template per site, with {} for the ID")
+    run_parser.add_argument("--frontier", nargs="+", metavar="SITE=ID", default=[],
+                            help="start probing after this ID (for sites with nothing scraped yet)")
+    run_parser.add_argument("--rate-per-minute", type=float, default=SchedulerConfig.RATE_PER_MINUTE,
+                            help="request budget per host")
+    run_parser.add_argument("--probe-seconds", type=float, default=SchedulerConfig.PROBE_SECONDS)
+    run_parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    run_parser.add_argument("--max-requests", type=int)
+    run_parser.add_argument("--refresh-state", help="refresh_jobs state file (default: refresh_state.json)")
+    run_parser.add_argument("--changes", help="change log for rechecks (default: job_changes.jsonl)")
+    run_parser.add_argument("--index", default="job_index.json")
+    run_parser.add_argument("--markdown-dir", default="", help="also write markdown for new IT jobs here")
+    run_parser.add_argument("--store", help="also write new jobs to this partitioned store")
+    run_parser.add_argument("--alerts", help="also match new jobs against these saved searches")
+
+    subparsers.add_parser("status", help="show frontiers and the saved queue")
+    args = parser.parse_args(argv)
+
+    if args.command == "status":
+        show_status(args.state)
+        return
+
+    from pipeline import JobPipeline, build_sinks
+    from refresh_jobs import RefreshConfig, load_state, read_latest_rows, save_state, seed_state
+
+    # Jobs already in the CSVs are recheck candidates too
+    refresh_state_path = args.refresh_state or RefreshConfig.STATE_FILENAME
+    refresh_state = load_state(refresh_state_path)
+    for site in args.sites:
+        info = get_site(site)
+        if os.path.exists(info["csv"]):
+            seed_state(refresh_state, site, read_latest_rows(info["csv"], info["link_column"]))
+    save_state(refresh_state_path, refresh_state)
+
+    config = SchedulerConfig()
+    config.RATE_PER_MINUTE = args.rate_per_minute
+    config.PROBE_SECONDS = args.probe_seconds
+    pipeline = JobPipeline(build_sinks(markdown_dir=args.markdown_dir, index_path=args.index,
+                                       store_root=args.store, alerts_path=args.alerts))
+    scheduler = CrawlScheduler(args.sites, config, args.state, dict(item.split("=", 1) for item in args.base_url),
+                               pipeline, refresh_state_path, args.changes)
+    for site, job_id in (item.split("=", 1) for item in args.frontier):
+        scheduler.site_state[site]["frontier"] = max(scheduler.site_state[site]["frontier"], int(job_id))
+    print(f"🚀 Scheduling {', '.join(args.sites)} at {args.rate_per_minute:g} requests/min per host")
+    try:
+        scheduler.run(args.duration, args.max_requests)
+    finally:
+        pipeline.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Find live job IDs from listing pages and sitemaps
+
+The scrapers used to try every integer in a hand-picked ID window. Discovery
+reads each site's paginated job listing (newest first) or its sitemap,
+extracts job IDs with their posted dates, and drops IDs that are already in
+the scraped CSVs. Listing crawls stop at the first already-known ID, so a
+refresh costs roughly one listing page per page of new postings, plus one
+detail fetch per new job. A listing that is not strictly newest first (say,
+with pinned jobs on top) sets "newest_first": False and stops at the first
+page with nothing new instead.
+
+Usage:
+    python discovery.py camhr                       # new IDs, newest first
+    python discovery.py workinga --source sitemap --output workinga_ids.txt
+    python jobscrape.py crawl camhr --discover      # discover, then scrape only those
+"""
+import argparse
+import json
+import os
+import re
+from datetime import date, datetime, timedelta
+from urllib.parse import urljoin, urlparse
+
+from sites import SITES, get_site, job_id_from_url, parse_date
+
+# Listing and sitemap URLs per site; {} in the listing URL is the page number
+DISCOVERY_SOURCES = {
+    "camhr": {
+        "listing_url": os.environ.get("CAMHR_LISTING_URL", "https://www.camhr.com/a/job?page={}"),
+        "sitemap_url": os.environ.get("CAMHR_SITEMAP_URL", "https://www.camhr.com/sitemap.xml"),
+        "newest_first": True,  # everything after the first known ID is known too
+    },
+    "jobify": {
+        "listing_url": os.environ.get("JOBIFY_LISTING_URL", "https://jobify.works/jobs?page={}"),
+        "sitemap_url": os.environ.get("JOBIFY_SITEMAP_URL", "https://jobify.works/sitemap.xml"),
+        "newest_first": True,
+    },
+    "workinga": {
+        "listing_url": os.environ.get("WORKINGA_LISTING_URL", "https://workingna.com/jobs?page={}"),
+        "sitemap_url": os.environ.get("WORKINGA_SITEMAP_URL", "https://workingna.com/sitemap.xml"),
+        "newest_first": True,
+    },
+}
+
+# Where each crawler writes by default, in addition to the registry CSV
+CRAWL_CSVS = {"camhr": "New_Data_cam_4.csv", "jobify": "job4.csv", "workinga": "New_Data_workinga.csv"}
+
+MAX_PAGES = 50
+
+DATE_TEXT = re.compile(
+    r"\d{4}-\d{2}-\d{2}|\d{1,2}[-/ ][A-Za-z]{3,9}[-/ ,]+\d{4}|[A-Za-z]{3,9}[- ]\d{1,2},?[- ]\d{4}"
+    r"|\d{1,2}/\d{1,2}/\d{4}")
+RELATIVE_DATE = re.compile(r"(\d+|an?|one)\s+(minute|hour|day|week|month)s?\s+ago|\b(today|yesterday)\b",
+                           re.IGNORECASE)
+SITEMAP_ENTRY = re.compile(r"<(url|sitemap)>(.*?)</\1>", re.DOTALL)
+SITEMAP_LOC = re.compile(r"<loc>\s*(.*?)\s*</loc>", re.DOTALL)
+SITEMAP_LASTMOD = re.compile(r"<lastmod>\s*(.*?)\s*</lastmod>", re.DOTALL)
+
+
+def job_link_pattern(site, base_url=None):
+    """Regex matching the site's job detail URLs (absolute or relative), capturing the ID"""
+    path = urlparse(base_url).path if base_url else get_site(site)["job_path"]
+    prefix, _, suffix = path.partition("{}")
+    return re.compile(re.escape(prefix) + r"(\d+)" + re.escape(suffix) + r"/?(?:[?#]|$)")
+
+
+def parse_posted(text, today=None):
+    """Posted date from listing text: absolute dates or "3 days ago" / "yesterday"; None if absent"""
+    if not text:
+        return None
+    today = today or date.today()
+    match = RELATIVE_DATE.search(text)
+    if match:
+        if match.group(3):
+            return today if match.group(3).lower() == "today" else today - timedelta(days=1)
+        amount = 1 if match.group(1).lower() in ("a", "an", "one") else int(match.group(1))
+        days = {"minute": 0, "hour": 0, "day": 1, "week": 7, "month": 30}[match.group(2).lower()]
+        return today - timedelta(days=amount * days)
+    for candidate in DATE_TEXT.findall(text):
+        day = parse_date(candidate)
+        if day:
+            return day
+    return None
+
+
+def extract_listing(html, page_url, site, today=None):
+    """
+    Job IDs on one listing page, in page order, with the posted date from each job card
+
+    Returns:
+        list of {"job_id", "url", "posted"} dicts (posted is an ISO date or None)
+    """
+    from bs4 import BeautifulSoup
+
+    pattern = job_link_pattern(site)
+    soup = BeautifulSoup(html, "html.parser")
+    jobs, seen = [], set()
+    for link in soup.find_all("a", href=True):
+        url = urljoin(page_url, link["href"])
+        match = pattern.search(urlparse(url).path)
+        if not match or match.group(1) in seen:
+            continue
+        seen.add(match.group(1))
+        # The posted date sits somewhere in the job card around the link; stop widening
+        # the card once it would take in another job's link
+        posted, card = None, link
+        for _ in range(4):
+            card = card.parent
+            if card is None:
+                break
+            card_ids = {m.group(1) for a in card.find_all("a", href=True)
+                        for m in [pattern.search(urlparse(urljoin(page_url, a["href"])).path)] if m}
+            if len(card_ids) > 1:
+                break
+            posted = parse_posted(card.get_text(" "), today)
+            if posted:
+                break
+        jobs.append({"job_id": match.group(1), "url": get_site(site)["base_url"].format(match.group(1)),
+                     "posted": posted.isoformat() if posted else None})
+    return jobs
+
+
+def extract_sitemap(xml, site):
+    """Return (job entries, nested sitemap URLs) from a sitemap or sitemap index"""
+    pattern = job_link_pattern(site)
+    jobs, children = [], []
+    for kind, body in SITEMAP_ENTRY.findall(xml):
+        loc = SITEMAP_LOC.search(body)
+        if not loc:
+            continue
+        if kind == "sitemap":
+            children.append(loc.group(1))
+            continue
+        match = pattern.search(urlparse(loc.group(1)).path)
+        if match:
+            lastmod = SITEMAP_LASTMOD.search(body)
+            posted = parse_posted(lastmod.group(1)) if lastmod else None
+            jobs.append({"job_id": match.group(1), "url": get_site(site)["base_url"].format(match.group(1)),
+                         "posted": posted.isoformat() if posted else None})
+    return jobs, children
+
+
+def known_job_ids(site, csv_paths=None):
+    """IDs already scraped for a site, read from the link column of its CSVs"""
+    import csv
+
+    info = get_site(site)
+    csv_paths = csv_paths or [info["csv"], CRAWL_CSVS[site]]
+    known = set()
+    for path in csv_paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+            for row in csv.DictReader(f):
+                link = row.get(info["link_column"])
+                if link:
+                    known.add(job_id_from_url(link))
+    return known
+
+
+def discover_from_listing(site, known, session, listing_url=None, max_pages=MAX_PAGES, today=None,
+                          newest_first=None):
+    """
+    Page through the listing until it reaches a job we already have
+
+    On a newest-first listing the first known ID ends the crawl, since every
+    job after it is older. With newest_first False (default: the site's
+    DISCOVERY_SOURCES setting) the crawl only stops at a page with nothing new.
+    """
+    from fetching import fetch_page
+
+    listing_url = listing_url or DISCOVERY_SOURCES[site]["listing_url"]
+    if newest_first is None:
+        newest_first = DISCOVERY_SOURCES[site]["newest_first"]
+    found, previous_ids = [], None
+    for page_number in range(1, max_pages + 1):
+        result = fetch_page(session, listing_url.format(page_number))
+        if result["status"] != 200:
+            print(f"⏹️ Listing page {page_number}: status {result['status']}, stopping")
+            break
+        jobs = extract_listing(result["html"], result["url"], site, today)
+        page_ids = [job["job_id"] for job in jobs]
+        if not jobs or page_ids == previous_ids:
+            print(f"⏹️ Listing page {page_number}: no job links, end of listing")
+            break
+        new_jobs = []
+        for job in jobs:
+            if job["job_id"] not in known:
+                new_jobs.append(job)
+            elif newest_first:
+                break
+        found.extend(new_jobs)
+        known.update(page_ids)
+        print(f"📄 Listing page {page_number}: {len(jobs)} jobs, {len(new_jobs)} new")
+        if newest_first and len(new_jobs) < len(jobs):
+            print(f"⏹️ Listing page {page_number}: reached a known job, stopping")
+            break
+        if not new_jobs:
+            break
+        previous_ids = page_ids
+    return found
+
+
+def discover_from_sitemap(site, known, session, sitemap_url=None, since=None):
+    """Read the sitemap (and any nested sitemaps); sitemaps are unordered, so every entry is checked"""
+    from fetching import fetch_page
+
+    pending, found = [sitemap_url or DISCOVERY_SOURCES[site]["sitemap_url"]], []
+    while pending:
+        url = pending.pop(0)
+        result = fetch_page(session, url)
+        if result["status"] != 200:
+            print(f"⚠️ Sitemap {url}: status {result['status']}")
+            continue
+        jobs, children = extract_sitemap(result["html"], site)
+        pending.extend(children)
+        new_jobs = [job for job in jobs if job["job_id"] not in known
+                    and not (since and job["posted"] and job["posted"] < since.isoformat())]
+        known.update(job["job_id"] for job in new_jobs)
+        found.extend(new_jobs)
+        print(f"🗺️ Sitemap {url}: {len(jobs)} jobs, {len(new_jobs)} new")
+    found.sort(key=lambda job: (job["posted"] or "", int(job["job_id"])), reverse=True)
+    return found
+
+
+def discover(site, source="listing", known=None, session=None, max_pages=MAX_PAGES, since=None):
+    """
+    Find job IDs for a site that have not been scraped yet
+
+    Args:
+        site: registry site name
+        source: "listing" (paginated, newest first) or "sitemap"
+        known: set of IDs to treat as already scraped (default: read the site CSVs)
+        max_pages: listing page limit
+        since: sitemap only; skip entries last modified before this date
+
+    Returns:
+        list of {"job_id", "url", "posted"} dicts, newest first
+    """
+    from fetching import create_session
+
+    session = session or create_session()
+    known = set(known_job_ids(site) if known is None else known)
+    print(f"🔎 Discovering {site} jobs from the {source} ({len(known)} already known)")
+    if source == "sitemap":
+        found = discover_from_sitemap(site, known, session, since=since)
+    else:
+        found = discover_from_listing(site, known, session, max_pages=max_pages)
+    print(f"✅ {len(found)} new {site} job(s)")
+    return found
+
+
+def write_ids(jobs, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for job in jobs:
+            f.write(f"{job['job_id']}\t{job['posted'] or ''}\n")
+
+
+def read_ids(path):
+    """Job IDs from a file written by write_ids (or one ID per line)"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [int(line.split()[0]) for line in f if line.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Discover new job IDs from listing pages or sitemaps")
+    parser.add_argument("site", choices=list(SITES))
+    parser.add_argument("--source", choices=["listing", "sitemap"], default="listing")
+    parser.add_argument("--max-pages", type=int, default=MAX_PAGES)
+    parser.add_argument("--since", help="sitemap only: ignore entries older than YYYY-MM-DD")
+    parser.add_argument("--output", help="write 'ID<TAB>posted date' lines here")
+    parser.add_argument("--json", action="store_true", help="print the jobs as JSON")
+    args = parser.parse_args(argv)
+
+    since = datetime.strptime(args.since, "%Y-%m-%d").date() if args.since else None
+    jobs = discover(args.site, args.source, max_pages=args.max_pages, since=since)
+    if args.output:
+        write_ids(jobs, args.output)
+        print(f"💾 Saved {len(jobs)} IDs to {args.output}")
+    elif args.json:
+        print(json.dumps(jobs, indent=2))
+    else:
+        for job in jobs:
+            print(f"   {job['job_id']}  {job['posted'] or '-'}  {job['url']}")
+
+
+if __name__ == "__main__":
+    main()
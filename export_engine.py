@@ -0,0 +1,435 @@
+"""
+Bulk export of scraped job CSVs to several formats at once
+
+Reads the CSV a single time and streams it in chunks of CHUNK_ROWS rows to
+every requested format, each writing in its own process from its own bounded
+queue, so no process ever holds the whole file. Excel goes through
+xlsxwriter's constant_memory mode (openpyxl write-only as a fallback) and
+Parquet is written in row groups, so neither builds a full DataFrame or
+worksheet. Each format reports its wall time, CPU time and peak memory.
+
+With parallel=False (--sequential) each format is written in turn, each from
+its own streaming pass over the CSV. Peak RSS is per process, so those runs
+report no peak_rss_mb / rss_growth_mb.
+
+Formats:
+    csv      cleaned CSV, placeholders like "Not found" / "N/A" blanked
+    jsonl    one JSON object per job, missing values as null
+    parquet  string columns, nulls for missing values (needs pyarrow)
+    xlsx     job sheet plus a Summary sheet (needs xlsxwriter or openpyxl)
+    summary  text report of column completeness
+"""
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+from queue import Empty, Full
+
+from sites import is_missing
+
+DEFAULT_FORMATS = ["csv", "jsonl", "parquet", "xlsx"]
+
+OUTPUT_SUFFIXES = {
+    "csv": "_cleaned.csv",
+    "jsonl": ".jsonl",
+    "parquet": ".parquet",
+    "xlsx": ".xlsx",
+    "summary": "_summary.txt",
+}
+
+EXCEL_MAX_ROWS = 1048576
+PARQUET_BATCH_ROWS = 50000
+CHUNK_ROWS = 5000  # rows per chunk streamed to the format writers
+QUEUE_CHUNKS = 4  # chunks allowed to wait for each writer process
+REPORT_POLL_SECONDS = 1.0  # how often a parallel export checks whether its processes are still alive
+
+
+def read_header(csv_path):
+    with open(csv_path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def read_chunks(csv_path, clean=True, size=CHUNK_ROWS):
+    """Yield the rows of a scraped CSV (header skipped) in lists of `size`, placeholders as None when clean"""
+    with open(csv_path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        reader = csv.reader(f)
+        width = len(next(reader, []))
+        chunk = []
+        for row in reader:
+            if not any(row):
+                continue
+            row = (row + [""] * width)[:width]
+            chunk.append([None if is_missing(value) else value for value in row] if clean else row)
+            if len(chunk) == size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+class ColumnStats:
+    """Job count, distinct companies/locations and filled cells per column, gathered chunk by chunk"""
+
+    DISTINCT = (("Company Name", "Unique Companies"), ("Location", "Unique Locations"))
+
+    def __init__(self, header):
+        self.header = header
+        self.rows = 0
+        self.filled = [0] * len(header)
+        self.distinct = [(label, header.index(column), set()) for column, label in self.DISTINCT if column in header]
+
+    def add(self, chunk):
+        self.rows += len(chunk)
+        for row in chunk:
+            for position, value in enumerate(row):
+                if value:
+                    self.filled[position] += 1
+        for _, position, values in self.distinct:
+            values.update(row[position] for row in chunk if row[position])
+
+    def metrics(self):
+        return ([("Total Jobs", self.rows)] + [(label, len(values)) for label, _, values in self.distinct]
+                + [("Date Exported", datetime.now().strftime("%Y-%m-%d"))])
+
+
+def write_csv(header, chunks, path, **options):
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for chunk in chunks:
+            writer.writerows(["" if value is None else value for value in row] for row in chunk)
+
+
+def write_jsonl(header, chunks, path, **options):
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            for row in chunk:
+                f.write(json.dumps(dict(zip(header, row)), ensure_ascii=False))
+                f.write("\n")
+
+
+def write_parquet(header, chunks, path, **options):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(name, pa.string()) for name in header])
+
+    def write_batch(batch):
+        columns = [pa.array(column, pa.string()) for column in zip(*batch)]
+        writer.write_batch(pa.RecordBatch.from_arrays(columns, schema=schema))
+
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        batch = []
+        for chunk in chunks:
+            batch.extend(chunk)
+            if len(batch) >= PARQUET_BATCH_ROWS:
+                write_batch(batch)
+                batch = []
+        if batch:
+            write_batch(batch)
+
+
+def _sheet_rows(chunks, stats, per_sheet):
+    """Yield (sheet_number, row_number, row) with row numbers restarting at 1 on each new sheet"""
+    count = 0
+    for chunk in chunks:
+        stats.add(chunk)
+        for row in chunk:
+            yield count // per_sheet + 1, count % per_sheet + 1, ["" if value is None else value for value in row]
+            count += 1
+
+
+def write_excel(header, chunks, path, sheet_name="Jobs", **options):
+    """Write rows in constant memory; sheets roll over at Excel's row limit"""
+    try:
+        import xlsxwriter
+    except ImportError:
+        return _write_excel_openpyxl(header, chunks, path, sheet_name)
+
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "strings_to_urls": False})
+    bold = workbook.add_format({"bold": True})
+    stats = ColumnStats(header)
+    sheets = 0
+    for sheet_number, row_number, row in _sheet_rows(chunks, stats, EXCEL_MAX_ROWS - 1):
+        if sheet_number > sheets:
+            sheets = sheet_number
+            name = sheet_name if sheet_number == 1 else f"{sheet_name}_{sheet_number}"
+            worksheet = workbook.add_worksheet(name[:31])
+            worksheet.write_row(0, 0, header, bold)
+        worksheet.write_row(row_number, 0, row)
+    if not sheets:
+        workbook.add_worksheet(sheet_name[:31]).write_row(0, 0, header, bold)
+
+    summary = workbook.add_worksheet("Summary")
+    summary.write_row(0, 0, ["Metric", "Value"], bold)
+    for row_number, metric in enumerate(stats.metrics(), 1):
+        summary.write_row(row_number, 0, metric)
+    workbook.close()
+
+
+def _write_excel_openpyxl(header, chunks, path, sheet_name):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    stats = ColumnStats(header)
+    sheets = 0
+    for sheet_number, _, row in _sheet_rows(chunks, stats, EXCEL_MAX_ROWS - 1):
+        if sheet_number > sheets:
+            sheets = sheet_number
+            name = sheet_name if sheet_number == 1 else f"{sheet_name}_{sheet_number}"
+            worksheet = workbook.create_sheet(name[:31])
+            worksheet.append(header)
+        worksheet.append(row)
+    if not sheets:
+        workbook.create_sheet(sheet_name[:31]).append(header)
+    summary = workbook.create_sheet("Summary")
+    summary.append(["Metric", "Value"])
+    for metric in stats.metrics():
+        summary.append(list(metric))
+    workbook.save(path)
+
+
+def write_summary(header, chunks, path, source=None, **options):
+    stats = ColumnStats(header)
+    for chunk in chunks:
+        stats.add(chunk)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("Job Export Summary\n")
+        f.write("=" * 40 + "\n")
+        if source:
+            f.write(f"Source file: {source}\n")
+        for metric, value in stats.metrics():
+            f.write(f"{metric}: {value}\n")
+        f.write("\nColumn completeness:\n")
+        for column, filled in zip(header, stats.filled):
+            completeness = (filled / stats.rows * 100) if stats.rows else 0.0
+            f.write(f"  {column}: {completeness:.1f}% complete\n")
+
+
+def write_splits(header, chunks, base_path, column, top=5, source=None):
+    """
+    Write one cleaned CSV per most common value of `column`; returns the paths
+
+    The counts come from the stream; the rows are then written from a second
+    streaming pass over `source`, since the top values are only known at the end.
+    """
+    position = header.index(column)
+    counts = Counter()
+    for chunk in chunks:
+        counts.update(row[position] for row in chunk if row[position])
+
+    files, writers, paths = [], {}, []
+    try:
+        for value, _ in counts.most_common(top):
+            safe_value = value.replace(" ", "_").replace("/", "_")
+            path = f"{base_path}_{safe_value}.csv"
+            f = open(path, "w", encoding="utf-8-sig", newline="")
+            files.append(f)
+            writers[value] = csv.writer(f)
+            writers[value].writerow(header)
+            paths.append(path)
+        if writers:
+            for chunk in read_chunks(source):
+                for row in chunk:
+                    writer = writers.get(row[position])
+                    if writer:
+                        writer.writerow(["" if value is None else value for value in row])
+    finally:
+        for f in files:
+            f.close()
+    return paths
+
+
+WRITERS = {
+    "csv": write_csv,
+    "jsonl": write_jsonl,
+    "parquet": write_parquet,
+    "xlsx": write_excel,
+    "summary": write_summary,
+}
+
+
+def _current_rss_mb():
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        try:
+            with open("/proc/self/statm", "r") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+        except (OSError, ValueError):
+            return 0.0
+
+
+def _peak_rss_mb():
+    if sys.platform == "win32":
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _queued_chunks(chunks):
+    """Chunks from a writer's queue until the None end marker"""
+    while True:
+        chunk = chunks.get()
+        if chunk is None:
+            return
+        yield chunk
+
+
+def run_task(task, header, chunks, base_path, options, results=None):
+    """
+    Write one format (or the split files) from an iterable of row chunks and measure it
+
+    In a writer process `chunks` is its queue and the report goes on `results`;
+    peak memory is only reported there, since in-process runs share one peak.
+    """
+    if results is not None:
+        chunks = _queued_chunks(chunks)
+    start_rss = _current_rss_mb()
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    report = {"format": task, "rows": 0}
+
+    def counted(chunks):
+        for chunk in chunks:
+            report["rows"] += len(chunk)
+            yield chunk
+
+    try:
+        if task == "split":
+            report["paths"] = write_splits(header, counted(chunks), base_path, options["split_column"],
+                                           options.get("split_top", 5), options["source"])
+        else:
+            path = base_path + OUTPUT_SUFFIXES[task]
+            WRITERS[task](header, counted(chunks), path, **options)
+            report["path"] = path
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+    report["seconds"] = round(time.perf_counter() - wall_start, 3)
+    report["cpu_seconds"] = round(time.process_time() - cpu_start, 3)
+    if results is None:
+        report["peak_rss_mb"] = report["rss_growth_mb"] = None
+        return report
+    report["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+    report["rss_growth_mb"] = round(max(_peak_rss_mb() - start_rss, 0.0), 1)
+    results.put(report)
+    return report
+
+
+def feed_chunk(chunk, queues, processes):
+    """
+    Put a chunk (None: end of data) on every writer queue, waiting while a writer is behind
+
+    Writers that have exited (after an error, or killed) are dropped from
+    `queues`; collect_reports then reports or raises for them.
+    """
+    for task in list(queues):
+        while True:
+            try:
+                queues[task].put(chunk, timeout=REPORT_POLL_SECONDS)
+                break
+            except Full:
+                if processes[task].exitcode is not None:
+                    queues.pop(task).cancel_join_thread()  # nobody will read what is still buffered
+                    break
+
+
+def collect_reports(results, processes):
+    """
+    Wait for one report per export process ({task: process})
+
+    Raises RuntimeError if a process dies without reporting (killed, out of
+    memory) instead of waiting for its report forever.
+    """
+    reports = []
+    while len(reports) < len(processes):
+        try:
+            reports.append(results.get(timeout=REPORT_POLL_SECONDS))
+            continue
+        except Empty:
+            pass
+        reported = {report["format"] for report in reports}
+        for task, process in processes.items():
+            if task not in reported and process.exitcode not in (None, 0):
+                raise RuntimeError(f"Export process for {task} exited with code {process.exitcode}")
+        if all(process.exitcode is not None for process in processes.values()):
+            try:  # a report put just before exiting may still be in the pipe
+                reports.append(results.get(timeout=REPORT_POLL_SECONDS))
+            except Empty:
+                missing = sorted(set(processes) - reported)
+                raise RuntimeError(f"Export process(es) for {', '.join(missing)} exited without a report")
+    return reports
+
+
+def export_jobs(csv_path, formats=None, output_base=None, split_column=None, split_top=5,
+                parallel=True, sheet_name="Jobs"):
+    """
+    Export a scraped CSV to several formats from a single streaming read
+
+    Args:
+        csv_path: scraped CSV
+        formats: subset of WRITERS (default: csv, jsonl, parquet, xlsx)
+        output_base: path prefix for outputs (default: CSV path without .csv)
+        split_column: also write one CSV per top value of this column (e.g. "Industry")
+        split_top: how many split files to write
+        parallel: run formats in separate processes fed from one read; otherwise
+            one format after another, each reading the CSV (no memory figures)
+
+    Returns:
+        list of per-format reports (path, rows, seconds, cpu_seconds, peak_rss_mb, rss_growth_mb, error)
+    """
+    formats = formats or DEFAULT_FORMATS
+    unknown = set(formats) - set(WRITERS)
+    if unknown:
+        raise ValueError(f"Unknown export format(s): {', '.join(sorted(unknown))}")
+
+    header = read_header(csv_path)
+    base_path = output_base or os.path.splitext(csv_path)[0]
+    options = {"source": csv_path, "sheet_name": sheet_name, "split_column": split_column, "split_top": split_top}
+    tasks = list(formats) + (["split"] if split_column and split_column in header else [])
+
+    read_start = time.perf_counter()
+    if not parallel:
+        reports = [run_task(task, header, read_chunks(csv_path), base_path, options) for task in tasks]
+    else:
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        ctx = multiprocessing.get_context(method)
+        results = ctx.Queue()
+        queues = {task: ctx.Queue(maxsize=QUEUE_CHUNKS) for task in tasks}
+        processes = {task: ctx.Process(target=run_task, args=(task, header, queues[task], base_path, options, results))
+                     for task in tasks}
+        for process in processes.values():
+            process.start()
+        try:
+            feeding = dict(queues)
+            for chunk in read_chunks(csv_path):
+                feed_chunk(chunk, feeding, processes)
+            feed_chunk(None, feeding, processes)
+            reports = collect_reports(results, processes)
+        finally:
+            for task, process in processes.items():
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+                queues[task].cancel_join_thread()
+        reports.sort(key=lambda report: tasks.index(report["format"]))
+    rows = max((report["rows"] for report in reports), default=0)
+    print(f"📖 Streamed {rows} jobs from {csv_path} in {time.perf_counter() - read_start:.2f}s")
+
+    for report in reports:
+        if "error" in report:
+            print(f"❌ {report['format']}: {report['error']}")
+            continue
+        target = report.get("path") or f"{len(report['paths'])} files"
+        memory = ("peak n/a" if report["peak_rss_mb"] is None
+                  else f"peak {report['peak_rss_mb']:>7.1f} MB (+{report['rss_growth_mb']:.1f})")
+        print(f"✅ {report['format']:<8} {report['seconds']:>7.2f}s  cpu {report['cpu_seconds']:>6.2f}s  "
+              f"{memory}  -> {target}")
+    return reports
@@ -0,0 +1,58 @@
+"""
+Plain HTTP page fetching shared by the browser-free tools
+
+Wraps a requests.Session with conditional GET support (ETag / Last-Modified)
+and returns a small result dict instead of raising on network errors.
+"""
+import time
+
+import requests
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/json;q=0.9,*/*;q=0.8",
+}
+
+
+def create_session(pool_size=10):
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_page(session, url, etag=None, last_modified=None, timeout=10, raw=False):
+    """
+    Fetch a page, sending validators when we have them
+
+    With raw=True the body is returned as undecoded bytes (cheaper to hand to
+    another process; BeautifulSoup detects the encoding itself).
+
+    Returns:
+        dict: url, status (None on network error), html (only for 200),
+              etag, last_modified, elapsed seconds and error message
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    start = time.perf_counter()
+    try:
+        response = session.get(url, headers=headers, timeout=timeout)
+    except requests.RequestException as e:
+        return {"url": url, "status": None, "html": None, "etag": None, "last_modified": None,
+                "elapsed": time.perf_counter() - start, "error": str(e)}
+
+    return {
+        "url": url,
+        "status": response.status_code,
+        "html": (response.content if raw else response.text) if response.status_code == 200 else None,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "elapsed": time.perf_counter() - start,
+        "error": None,
+    }
@@ -0,0 +1,184 @@
+"""
+Keyword index over the scraped jobs of all sites
+
+Built once from the site CSVs and saved as a compact JSON file, so searches
+only load the index (no pandas, no CSV re-parsing). Documents keep just the
+fields needed to display and filter results; postings map each word to the
+ids of the documents containing it.
+"""
+import json
+import os
+import re
+import time
+
+from job_record import drop_journal, read_journal, read_records
+from sites import SITES
+
+INDEX_FILENAME = "job_index.json"
+
+# Canonical fields whose words are searchable
+INDEXED_FIELDS = ["title", "company", "location", "level", "term", "industry", "function",
+                  "requirements", "responsibilities", "skills"]
+
+# Canonical fields stored with each document for display and filtering
+STORED_FIELDS = ["site", "job_id", "title", "company", "location", "level", "industry",
+                 "salary", "closing_date", "url"]
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#]*")
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def read_site_csv(site, csv_path):
+    """Yield canonical records (JobRecords) from one scraped CSV"""
+    return read_records(site, csv_path)
+
+
+class JobIndex:
+    def __init__(self):
+        self.docs = []          # list of STORED_FIELDS value lists; None once superseded
+        self.postings = {}      # token -> list of doc ids, ascending
+        self.keys = {}          # "site/job_id" -> doc id of the latest version
+        self.built_at = None
+
+    def __len__(self):
+        return len(self.keys)
+
+    @staticmethod
+    def doc_key(record):
+        return f"{record['site']}/{record['job_id'] or record['url']}"
+
+    def add(self, record):
+        """Index a canonical record; a re-scraped job replaces its previous version"""
+        key = self.doc_key(record)
+        if key in self.keys:
+            self.docs[self.keys[key]] = None
+        doc_id = len(self.docs)
+        self.docs.append([record.get(field) for field in STORED_FIELDS])
+        self.keys[key] = doc_id
+
+        tokens = set()
+        for field in INDEXED_FIELDS:
+            tokens.update(tokenize(record.get(field)))
+        for token in tokens:
+            self.postings.setdefault(token, []).append(doc_id)
+        return doc_id
+
+    def remove(self, key):
+        """Drop a job by its doc_key; its postings go at the next compact(). Returns True if it was indexed"""
+        doc_id = self.keys.pop(key, None)
+        if doc_id is None:
+            return False
+        self.docs[doc_id] = None
+        return True
+
+    def get(self, doc_id):
+        doc = self.docs[doc_id]
+        return dict(zip(STORED_FIELDS, doc)) if doc is not None else None
+
+    def search(self, query="", location=None, site=None, limit=20):
+        """
+        Return jobs containing every word of `query`, best title matches first
+
+        Args:
+            query: free text; all words must appear in the indexed fields
+            location: case-insensitive substring of the job location
+            site: restrict to one site
+            limit: maximum number of results (None for all)
+        """
+        tokens = tokenize(query)
+        if tokens:
+            lists = sorted((self.postings.get(token, []) for token in set(tokens)), key=len)
+            candidates = set(lists[0])
+            for postings in lists[1:]:
+                candidates.intersection_update(postings)
+                if not candidates:
+                    break
+        else:
+            candidates = set(self.keys.values())
+
+        location = location.lower() if location else None
+        results = []
+        for doc_id in candidates:
+            job = self.get(doc_id)
+            if job is None:
+                continue
+            if site and job["site"] != site:
+                continue
+            if location and location not in (job["location"] or "").lower():
+                continue
+            title_tokens = set(tokenize(job["title"]))
+            results.append((sum(token in title_tokens for token in tokens), doc_id, job))
+
+        results.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [job for _, _, job in results[:limit]]
+
+    def compact(self):
+        """Drop superseded documents and renumber the rest (order is kept, so rankings don't change)"""
+        if len(self.keys) == len(self.docs):
+            return
+        new_ids = {}
+        docs = []
+        for doc_id, doc in enumerate(self.docs):
+            if doc is not None:
+                new_ids[doc_id] = len(docs)
+                docs.append(doc)
+        postings = {}
+        for token, doc_ids in self.postings.items():
+            kept = [new_ids[doc_id] for doc_id in doc_ids if doc_id in new_ids]
+            if kept:
+                postings[token] = kept
+        self.docs, self.postings = docs, postings
+        self.keys = {key: new_ids[doc_id] for key, doc_id in self.keys.items()}
+
+    def save(self, path=INDEX_FILENAME):
+        """Compact and save the whole index, replacing any journal"""
+        self.compact()
+        payload = {"built_at": self.built_at or time.time(), "fields": STORED_FIELDS,
+                   "docs": self.docs, "postings": self.postings}
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+        drop_journal(path)
+
+    @classmethod
+    def load(cls, path=INDEX_FILENAME):
+        with open(path, "r", encoding="utf-8") as f:
+            payload = json.load(f)
+        index = cls()
+        index.built_at = payload["built_at"]
+        index.docs = payload["docs"]
+        index.postings = payload["postings"]
+        site_pos, id_pos, url_pos = (STORED_FIELDS.index(name) for name in ("site", "job_id", "url"))
+        for doc_id, doc in enumerate(index.docs):
+            if doc is not None:
+                index.keys[f"{doc[site_pos]}/{doc[id_pos] or doc[url_pos]}"] = doc_id
+        for record, _ in read_journal(path):  # jobs the pipeline added since the last full save
+            index.add(record)
+        return index
+
+
+def build_index(csv_paths=None):
+    """
+    Build an index from scraped CSVs
+
+    Args:
+        csv_paths: {site: csv path}; defaults to each site's CSV from the registry,
+                   skipping files that do not exist
+    """
+    csv_paths = csv_paths or {site: info["csv"] for site, info in SITES.items()}
+    index = JobIndex()
+    for site, csv_path in csv_paths.items():
+        if not os.path.exists(csv_path):
+            print(f"⚠️ {csv_path} not found, skipping {site}")
+            continue
+        count = 0
+        for record in read_site_csv(site, csv_path):
+            index.add(record)
+            count += 1
+        print(f"📊 Indexed {count} {site} jobs from {csv_path}")
+    index.built_at = time.time()
+    return index
@@ -0,0 +1,201 @@
+"""
+Compact in-memory representation of a job
+
+JobRecord is a tuple with one slot per canonical field (sites.CANONICAL_FIELDS)
+instead of a dict keyed by long column names. Missing values are None rather
+than repeated "Not found" / "N/A" strings, and categorical fields (site,
+location, level, term, industry, function) are interned so 500k jobs in
+"Phnom Penh" share one string.
+
+Records still read like the dicts they replace: record["title"],
+record.get("location") and the site's own column names
+(record.get("Job Title")) all work, so code written against to_canonical()
+dicts or scraped CSV rows takes JobRecords unchanged.
+
+The scrapers' parse_job_page functions return JobRecords (JobRecord.build);
+only the CSV writers turn them into rows, with the site's placeholder for
+missing fields (to_row).
+
+Batches convert to and from Arrow column-wise, with categoricals as
+dictionary-encoded columns (needs pyarrow).
+
+A journal (<file>.journal, JSONL) holds the records added to a saved
+structure since its last full save; the structure's load() replays it.
+"""
+import csv
+import json
+import os
+import re
+import sys
+from collections import namedtuple
+from datetime import date
+
+from sites import CANONICAL_FIELDS, SITES, job_id_from_url, is_missing
+
+CATEGORICAL_FIELDS = ("site", "location", "level", "term", "industry", "function")
+
+_FIELD_INDEX = {name: position for position, name in enumerate(CANONICAL_FIELDS)}
+_CATEGORICAL_POSITIONS = frozenset(_FIELD_INDEX[name] for name in CATEGORICAL_FIELDS)
+
+# Per site: column name -> canonical field, and (position, column) pairs for from_row
+_COLUMN_FIELDS = {site: {column: field for field, column in info["fields"].items()} for site, info in SITES.items()}
+_ROW_PLAN = {site: [(_FIELD_INDEX[field], column) for field, column in info["fields"].items()]
+             for site, info in SITES.items()}
+_URL = _FIELD_INDEX["url"]
+_JOB_ID = _FIELD_INDEX["job_id"]
+_SPACES = re.compile(r"[ \t]+")
+_intern = sys.intern
+
+
+def _clean(position, value):
+    if value is None or is_missing(value):
+        return None
+    value = _SPACES.sub(" ", value).strip() if value.__class__ is str else str(value)
+    return _intern(value) if position in _CATEGORICAL_POSITIONS else value
+
+
+class JobRecord(namedtuple("JobRecordBase", CANONICAL_FIELDS)):
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if key.__class__ is str:
+            position = _FIELD_INDEX.get(key)
+            if position is None:
+                field = _COLUMN_FIELDS.get(self[0], {}).get(key)
+                if field is None:
+                    raise KeyError(key)
+                position = _FIELD_INDEX[field]
+            return tuple.__getitem__(self, position)
+        return tuple.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        """Value of a canonical field or site column name (None if missing); `default` for unknown keys"""
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        """Canonical-field dict, as returned by sites.to_canonical"""
+        return dict(zip(self._fields, self))
+
+    def to_row(self, missing=""):
+        """Row keyed by the site's CSV column names (in CSV order), with `missing` for empty fields"""
+        return {column: missing if self[field] is None else self[field]
+                for field, column in SITES[self[0]]["fields"].items()}
+
+    @classmethod
+    def from_row(cls, site, row):
+        """Build a record from a scraped CSV row (site column names), like sites.to_canonical"""
+        values = [None] * len(CANONICAL_FIELDS)
+        for position, column in _ROW_PLAN[site]:
+            values[position] = _clean(position, row.get(column))
+        return cls._finish(site, values)
+
+    @classmethod
+    def build(cls, site, **fields):
+        """Build a record from values a scraper extracted, by canonical field (blanks and placeholders become None)"""
+        values = [None] * len(CANONICAL_FIELDS)
+        for name, value in fields.items():
+            position = _FIELD_INDEX[name]
+            values[position] = _clean(position, value)
+        return cls._finish(site, values)
+
+    @classmethod
+    def _finish(cls, site, values):
+        values[0] = _intern(site)
+        if values[_URL]:
+            values[_JOB_ID] = job_id_from_url(values[_URL])
+        return cls._make(values)
+
+    @classmethod
+    def from_dict(cls, record):
+        """Build a record from a canonical dict (missing keys become None)"""
+        return cls._make(
+            _intern(value) if name in CATEGORICAL_FIELDS and isinstance(value, str) else value
+            for name, value in ((name, record.get(name)) for name in CANONICAL_FIELDS))
+
+
+def read_records(site, csv_path):
+    """Yield JobRecords from one scraped CSV, skipping rows without a title"""
+    title = _FIELD_INDEX["title"]
+    with open(csv_path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        for row in csv.DictReader(f):
+            record = JobRecord.from_row(site, row)
+            if record[title]:
+                yield record
+
+
+def journal_path(path):
+    return path + ".journal"
+
+
+def append_journal(path, records, ingested_on=None):
+    """Append records to the journal of the structure saved at `path`, with the day they arrived"""
+    day = (ingested_on or date.today()).isoformat()
+    with open(journal_path(path), "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps({"day": day, "record": record.to_dict()}, ensure_ascii=False) + "\n")
+
+
+def read_journal(path):
+    """Yield (JobRecord, day) pairs from the journal of the structure saved at `path` (none if there is none)"""
+    if not os.path.exists(journal_path(path)):
+        return
+    with open(journal_path(path), "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                item = json.loads(line)
+            except ValueError:  # torn last line after a crash
+                continue
+            yield JobRecord.from_dict(item["record"]), date.fromisoformat(item["day"])
+
+
+def drop_journal(path):
+    """Remove the journal once the structure at `path` has been saved in full"""
+    try:
+        os.remove(journal_path(path))
+    except FileNotFoundError:
+        pass
+
+
+def arrow_schema():
+    import pyarrow as pa
+
+    return pa.schema([(name, pa.dictionary(pa.int32(), pa.string()) if name in CATEGORICAL_FIELDS else pa.string())
+                      for name in CANONICAL_FIELDS])
+
+
+def to_arrow(records):
+    """Convert a list of JobRecords to a pyarrow RecordBatch (categoricals dictionary-encoded)"""
+    import pyarrow as pa
+
+    columns = list(zip(*records)) if records else [()] * len(CANONICAL_FIELDS)
+    arrays = []
+    for name, column in zip(CANONICAL_FIELDS, columns):
+        array = pa.array(column, pa.string())
+        arrays.append(array.dictionary_encode() if name in CATEGORICAL_FIELDS else array)
+    return pa.RecordBatch.from_arrays(arrays, schema=arrow_schema())
+
+
+def from_arrow(batch):
+    """
+    Convert a RecordBatch (or Table) back to JobRecords, re-interning dictionary values
+
+    Fields the batch has no column for (files written before the field was
+    added) come back as None.
+    """
+    columns = []
+    for name in CANONICAL_FIELDS:
+        if name not in batch.schema.names:
+            columns.append([None] * batch.num_rows)
+            continue
+        column = batch.column(name)
+        if hasattr(column, "combine_chunks"):
+            column = column.combine_chunks()
+        if hasattr(column, "dictionary"):
+            dictionary = [_intern(value) for value in column.dictionary.to_pylist()]
+            columns.append([None if i is None else dictionary[i] for i in column.indices.to_pylist()])
+        else:
+            columns.append(column.to_pylist())
+    return [JobRecord._make(values) for values in zip(*columns)]
@@ -0,0 +1,324 @@
+"""
+jobscrape - single command line entry point for the project
+
+    python jobscrape.py crawl camhr --start 10611925 --end 10613636
+    python jobscrape.py crawl workinga --output New_Data_workinga.csv
+    python jobscrape.py crawl workinga --api          # JSON data endpoint, no browser
+    python jobscrape.py crawl camhr --discover        # only new IDs from the listing pages
+    python jobscrape.py crawl camhr --pool            # plain HTTP, parsing in a process pool (workinga: --api)
+    python jobscrape.py crawl camhr --pool --profile-slow slow_pages   # also capture outlier pages
+    python jobscrape.py pipeline camhr --discover     # crawl -> CSV + markdown + index, streaming
+    python jobscrape.py discover jobify --source sitemap
+    python jobscrape.py convert camhr --csv CamHr.csv --output-dir CamHr_IT_Jobs
+    python jobscrape.py index
+    python jobscrape.py index --store job_store        # open jobs only, from the partitioned store
+    python jobscrape.py search python developer --location "Phnom Penh"
+    python jobscrape.py serve --port 8080             # HTTP query service over the index
+    python jobscrape.py analytics --update --site camhr
+    python jobscrape.py refresh camhr --csv CamHr.csv
+    python jobscrape.py schedule run                  # continuous probe / recheck / backfill daemon
+    python jobscrape.py alerts add --query python --min-salary 1000   # see saved_searches.py
+    python jobscrape.py store compact                 # see partitioned_store.py
+    python jobscrape.py companies refresh             # fetch each company profile once per TTL
+    python jobscrape.py skills match --skills "Python, SQL"
+    python jobscrape.py export CamHr.csv --formats csv jsonl xlsx --split-column Industry
+
+Heavy dependencies (Selenium, BeautifulSoup, pandas) are imported inside the
+subcommand that needs them, so short tasks like `search` start instantly.
+Configuration comes from flags, JOBSCRAPE_* environment variables or a JSON
+file (see settings.py).
+"""
+import argparse
+import sys
+
+from settings import apply_settings, load_settings, section_settings
+
+
+# Scraper module and config class per site
+CRAWLERS = {
+    "camhr": ("camhr", "CamHRConfig"),
+    "jobify": ("Jobify", "JobifyConfig"),
+    "workinga": ("Workinga", "ScraperConfig"),
+}
+
+
+def cmd_crawl(args, settings):
+    import importlib
+
+    job_ids = None
+    if args.discover:
+        from discovery import discover
+        job_ids = [int(job["job_id"]) for job in discover(args.site)]
+        if not job_ids:
+            print("✅ Nothing new to scrape")
+            return
+    elif args.ids_file:
+        from discovery import read_ids
+        job_ids = read_ids(args.ids_file)
+
+    values = section_settings(settings, args.site, start_id=args.start, end_id=args.end,
+                              output=args.output, base_url=args.base_url,
+                              chromedriver=args.chromedriver, wait_timeout=args.wait_timeout,
+                              job_ids=job_ids)
+    module_name, config_name = CRAWLERS[args.site]
+    module = importlib.import_module(module_name)
+    config = apply_settings(getattr(module, config_name), values)
+
+    if args.site == "workinga" and (args.api or args.pool):
+        # Workinga pages are client-rendered: over plain HTTP only the JSON endpoint has the jobs
+        import workinga_api
+        if not workinga_api.load_template(config)["url"]:
+            print("❌ Workinga pages are client-rendered, so crawling without a browser needs the job data URL; "
+                  "run `python workinga_api.py discover` or set WORKINGA_API_URL")
+            sys.exit(1)
+        if args.pool:
+            print("ℹ️ Workinga --pool fetches the JSON data endpoint (no page parsing needed)")
+        workinga_api.crawl(config)
+    elif args.pool:
+        from parse_pool import crawl_to_csv
+        if job_ids is None:
+            step = -1 if config.END_ID < config.START_ID else 1
+            job_ids = range(config.START_ID, config.END_ID + step, step)
+        output = getattr(config, "CSV_FILENAME", None) or config.OUTPUT_FILENAME
+        crawl_to_csv(args.site, job_ids, output, config.BASE_URL, parse_workers=args.parse_workers,
+                     profile_dir=args.profile_slow)
+    else:
+        module.main(config)
+
+
+def cmd_discover(args, settings):
+    import discovery
+
+    argv = [args.site, "--source", args.source]
+    if args.output:
+        argv += ["--output", args.output]
+    discovery.main(argv)
+
+
+def cmd_convert(args, settings):
+    if args.kind == "camhr":
+        import convert_camhr_to_md
+        convert_camhr_to_md.main(args.csv or "CamHr.csv", args.output_dir or "CamHr_IT_Jobs")
+    elif args.kind == "jobify":
+        import convert_jobify_to_md
+        convert_jobify_to_md.main(args.csv or "Jobify.csv", args.output_dir or "Jobify_markdowns")
+    else:
+        import generate_individual_job_markdowns
+        generate_individual_job_markdowns.main(args.csv or "job4.csv",
+                                               args.output_dir or "job_descriptions_individual")
+
+
+def _index_path(args, settings):
+    return args.index or section_settings(settings, "index").get("path") or "job_index.json"
+
+
+def cmd_index(args, settings):
+    if args.store:
+        from partitioned_store import PartitionedStore, build_index
+        index = build_index(PartitionedStore(args.store))
+    else:
+        from job_index import build_index
+        csv_paths = None
+        if args.csv:
+            csv_paths = dict(item.split("=", 1) for item in args.csv)
+        index = build_index(csv_paths)
+    path = _index_path(args, settings)
+    index.save(path)
+    print(f"💾 Saved index of {len(index)} jobs to {path}")
+
+
+def cmd_search(args, settings):
+    from job_index import JobIndex
+
+    index = JobIndex.load(_index_path(args, settings))
+    results = index.search(" ".join(args.query), location=args.location, site=args.site, limit=args.limit)
+    if args.json:
+        import json
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+    for job in results:
+        company = f" @ {job['company']}" if job["company"] else ""
+        print(f"[{job['site']}] {job['title']}{company} | {job['location'] or '-'} | {job['url']}")
+    print(f"🔍 {len(results)} result(s)")
+
+
+def cmd_analytics(args, settings):
+    from market_analytics import MarketCube, print_report, update_cube
+
+    cube = update_cube(args.cube) if args.update else MarketCube.load(args.cube)
+    filters = {"site": args.site, "industry": args.industry, "location": args.location,
+               "since_week": args.since_week}
+    if args.by:
+        for value, count in cube.top(args.by, args.limit, **filters):
+            print(f"   {value}: {count} jobs")
+    else:
+        print_report(cube, args.limit, **filters)
+
+
+def cmd_export(args, settings):
+    from export_engine import export_jobs
+
+    export_jobs(args.csv, formats=args.formats, output_base=args.output_base,
+                split_column=args.split_column, split_top=args.split_top, parallel=not args.sequential)
+
+
+def cmd_pipeline(args, settings):
+    import pipeline
+    pipeline.main(args.pipeline_args)
+
+
+def cmd_skills(args, settings):
+    import skills
+    skills.main(args.skills_args)
+
+
+def cmd_companies(args, settings):
+    import company_profiles
+    company_profiles.main(args.companies_args)
+
+
+def cmd_serve(args, settings):
+    import query_service
+    query_service.main(args.serve_args)
+
+
+def cmd_schedule(args, settings):
+    import crawl_scheduler
+    crawl_scheduler.main(args.schedule_args)
+
+
+def cmd_alerts(args, settings):
+    import saved_searches
+    saved_searches.main(args.alerts_args)
+
+
+def cmd_store(args, settings):
+    import partitioned_store
+    partitioned_store.main(args.store_args)
+
+
+def cmd_refresh(args, settings):
+    import refresh_jobs
+    refresh_jobs.main(args.refresh_args)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="jobscrape", description="Cambodian job portal scraping toolkit")
+    parser.add_argument("--config", help="JSON settings file (default: ./jobscrape.json if present)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    crawl = subparsers.add_parser("crawl", help="scrape a job site with a headless browser")
+    crawl.add_argument("site", choices=["camhr", "jobify", "workinga"])
+    crawl.add_argument("--start", type=int, help="first job ID")
+    crawl.add_argument("--end", type=int, help="last job ID (inclusive)")
+    crawl.add_argument("--output", help="CSV file to write")
+    crawl.add_argument("--base-url", help="job URL template with {} for the ID")
+    crawl.add_argument("--chromedriver", help="path to chromedriver (default: Selenium Manager)")
+    crawl.add_argument("--wait-timeout", type=int, help="seconds to wait for page elements")
+    crawl.add_argument("--api", action="store_true",
+                       help="workinga: fetch the JSON job data endpoint instead of rendering pages")
+    crawl.add_argument("--discover", action="store_true",
+                       help="scrape only new IDs found on the listing pages instead of the ID range")
+    crawl.add_argument("--ids-file", help="scrape the IDs listed in this file (see `discover --output`)")
+    crawl.add_argument("--pool", action="store_true",
+                       help="plain HTTP with fetch threads and a parser process pool (no browser)")
+    crawl.add_argument("--parse-workers", type=int, help="parser processes for --pool (default: CPU count)")
+    crawl.add_argument("--profile-slow", metavar="DIR",
+                       help="with --pool: save outlier pages, timings and profiles to DIR")
+    crawl.set_defaults(func=cmd_crawl)
+
+    discover = subparsers.add_parser("discover", help="list new job IDs from listing pages or sitemaps")
+    discover.add_argument("site", choices=["camhr", "jobify", "workinga"])
+    discover.add_argument("--source", choices=["listing", "sitemap"], default="listing")
+    discover.add_argument("--output", help="write the IDs to this file for `crawl --ids-file`")
+    discover.set_defaults(func=cmd_discover)
+
+    convert = subparsers.add_parser("convert", help="turn scraped CSVs into markdown for RAG")
+    convert.add_argument("kind", choices=["camhr", "jobify", "individual"])
+    convert.add_argument("--csv", help="input CSV")
+    convert.add_argument("--output-dir", help="directory for the markdown files")
+    convert.set_defaults(func=cmd_convert)
+
+    index = subparsers.add_parser("index", help="build the search index from scraped CSVs")
+    index.add_argument("--csv", nargs="+", metavar="SITE=PATH", help="CSV per site (default: registry paths)")
+    index.add_argument("--index", help="index file to write")
+    index.add_argument("--store", help="index the open jobs of this partitioned store instead of the CSVs")
+    index.set_defaults(func=cmd_index)
+
+    search = subparsers.add_parser("search", help="search the job index")
+    search.add_argument("query", nargs="*", help="words that must all appear")
+    search.add_argument("--location")
+    search.add_argument("--site", choices=["camhr", "jobify", "workinga"])
+    search.add_argument("--limit", type=int, default=20)
+    search.add_argument("--index", help="index file to read")
+    search.add_argument("--json", action="store_true", help="print results as JSON")
+    search.set_defaults(func=cmd_search)
+
+    analytics = subparsers.add_parser("analytics", help="market report from the pre-aggregated cube")
+    analytics.add_argument("--update", action="store_true", help="add new jobs from the site CSVs first")
+    analytics.add_argument("--cube", default="market_cube.json")
+    analytics.add_argument("--by", choices=["site", "industry", "location", "level", "week"])
+    analytics.add_argument("--site", choices=["camhr", "jobify", "workinga"])
+    analytics.add_argument("--industry")
+    analytics.add_argument("--location")
+    analytics.add_argument("--since-week", help="e.g. 2025-W20")
+    analytics.add_argument("--limit", type=int, default=10)
+    analytics.set_defaults(func=cmd_analytics)
+
+    export = subparsers.add_parser("export", help="export a scraped CSV to CSV/JSONL/Parquet/Excel in one pass")
+    export.add_argument("csv", help="scraped CSV to export")
+    export.add_argument("--formats", nargs="+", choices=["csv", "jsonl", "parquet", "xlsx", "summary"],
+                        help="formats to write (default: csv jsonl parquet xlsx)")
+    export.add_argument("--output-base", help="path prefix for the outputs (default: CSV name)")
+    export.add_argument("--split-column", help="also write one CSV per top value of this column")
+    export.add_argument("--split-top", type=int, default=5)
+    export.add_argument("--sequential", action="store_true", help="write formats one after another")
+    export.set_defaults(func=cmd_export)
+
+    pipeline = subparsers.add_parser("pipeline", help="stream crawled jobs into CSV, markdown and index "
+                                                       "(see pipeline.py)")
+    pipeline.add_argument("pipeline_args", nargs=argparse.REMAINDER)
+    pipeline.set_defaults(func=cmd_pipeline)
+
+    skills = subparsers.add_parser("skills", help="extract skills and match CVs against jobs (see skills.py)")
+    skills.add_argument("skills_args", nargs=argparse.REMAINDER)
+    skills.set_defaults(func=cmd_skills)
+
+    companies = subparsers.add_parser("companies", help="cache company profiles and join them onto jobs "
+                                                         "(see company_profiles.py)")
+    companies.add_argument("companies_args", nargs=argparse.REMAINDER)
+    companies.set_defaults(func=cmd_companies)
+
+    serve = subparsers.add_parser("serve", help="serve search/filter/stats over HTTP (see query_service.py)")
+    serve.add_argument("serve_args", nargs=argparse.REMAINDER)
+    serve.set_defaults(func=cmd_serve)
+
+    schedule = subparsers.add_parser("schedule", help="long-running priority crawl scheduler "
+                                                       "(see crawl_scheduler.py)")
+    schedule.add_argument("schedule_args", nargs=argparse.REMAINDER)
+    schedule.set_defaults(func=cmd_schedule)
+
+    alerts = subparsers.add_parser("alerts", help="saved-search alerts for new jobs (see saved_searches.py)")
+    alerts.add_argument("alerts_args", nargs=argparse.REMAINDER)
+    alerts.set_defaults(func=cmd_alerts)
+
+    store = subparsers.add_parser("store", help="partitioned job store: ingest, compact, expire "
+                                                 "(see partitioned_store.py)")
+    store.add_argument("store_args", nargs=argparse.REMAINDER)
+    store.set_defaults(func=cmd_store)
+
+    refresh = subparsers.add_parser("refresh", help="re-check open jobs and log changes (see refresh_jobs.py)")
+    refresh.add_argument("refresh_args", nargs=argparse.REMAINDER)
+    refresh.set_defaults(func=cmd_refresh)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    settings = load_settings(args.config)
+    args.func(args, settings)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
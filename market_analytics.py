@@ -0,0 +1,250 @@
+"""
+Pre-aggregated job market analytics
+
+Keeps job counts per site x industry x location x level x week, plus a salary
+histogram per cell, in a small JSON "cube". New jobs are added incrementally
+(jobs already counted are skipped by site/job ID), and reports read the cube
+instead of reloading and re-grouping the whole CSV history.
+
+Salary histograms use fixed log-spaced USD buckets, so histograms from any
+cells, files or machines merge by adding counts, and quantiles are read from
+the merged histogram. The keys of the counted jobs are kept next to the cube
+(market_cube_seen.txt), so the cube file itself stays small.
+
+A job is counted once, in the cell of the fields it had when first ingested.
+Re-scraping it with changed fields (salary, level, ...) does not move it, as
+cells don't record their jobs; delete the cube and its seen file to rebuild
+the counts from the current CSVs.
+"""
+import json
+import math
+import os
+import re
+from collections import Counter
+from datetime import date
+
+from job_record import drop_journal, read_journal
+from sites import parse_date
+
+CUBE_FILENAME = "market_cube.json"
+DIMENSIONS = ("site", "industry", "location", "level", "week")
+UNKNOWN = "Unknown"
+
+# Monthly USD salary bucket edges: 50 .. ~20000, each bucket 15% wider than the last
+SALARY_EDGES = [round(50 * 1.15 ** i, 2) for i in range(44)]
+
+KHR_PER_USD = 4100
+SALARY_NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?")
+
+
+def parse_salary(text):
+    """
+    Turn a scraped salary string into a monthly USD amount (range midpoint)
+
+    Returns None for "Negotiable", missing or implausible values.
+    """
+    if not text:
+        return None
+    text = str(text).lower()
+    numbers = [float(n.replace(",", "")) for n in SALARY_NUMBER.findall(text)]
+    if not numbers:
+        return None
+    amount = sum(numbers[:2]) / len(numbers[:2])
+    if "khr" in text or "riel" in text or "៛" in text:
+        amount /= KHR_PER_USD
+    return amount if 30 <= amount <= 50000 else None
+
+
+def salary_bucket(amount):
+    """Index into a histogram of len(SALARY_EDGES) + 1 buckets (0 = below the first edge)"""
+    if amount < SALARY_EDGES[0]:
+        return 0
+    return min(int(math.log(amount / SALARY_EDGES[0], 1.15)) + 1, len(SALARY_EDGES))
+
+
+def week_of(record, ingested_on=None):
+    """ISO week of the publish date, falling back to the day the job was ingested"""
+    day = parse_date(record.get("publish_date")) or ingested_on or date.today()
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def seen_path(path):
+    """Where the keys of the jobs a cube has counted are saved (market_cube.json -> market_cube_seen.txt)"""
+    return os.path.splitext(path)[0] + "_seen.txt"
+
+
+class MarketCube:
+    def __init__(self):
+        self.cells = {}     # "site|industry|location|level|week" -> {"count": n, "salary": {bucket: n}}
+        self.seen = set()   # "site/job_id" of every job already counted
+
+    def __len__(self):
+        return len(self.seen)
+
+    def ingest(self, record, ingested_on=None):
+        """Count one canonical record; returns False if this job was already counted"""
+        job_key = f"{record['site']}/{record.get('job_id') or record.get('url')}"
+        if job_key in self.seen:
+            return False
+        self.seen.add(job_key)
+
+        parts = [record.get(dim) or UNKNOWN for dim in DIMENSIONS[:-1]]
+        parts.append(week_of(record, ingested_on))
+        cell = self.cells.setdefault("|".join(p.replace("|", "/") for p in parts), {"count": 0, "salary": {}})
+        cell["count"] += 1
+
+        amount = parse_salary(record.get("salary"))
+        if amount is not None:
+            bucket = str(salary_bucket(amount))
+            cell["salary"][bucket] = cell["salary"].get(bucket, 0) + 1
+        return True
+
+    def ingest_many(self, records, ingested_on=None):
+        return sum(self.ingest(record, ingested_on) for record in records)
+
+    def merge(self, other):
+        """
+        Add another cube's counts and histograms into this one
+
+        Cells don't record which jobs they hold, so the cubes must count
+        disjoint jobs (say, different sites or ID ranges); overlapping cubes
+        raise ValueError instead of counting shared jobs twice.
+        """
+        shared = self.seen & other.seen
+        if shared:
+            raise ValueError(f"Cubes share {len(shared)} jobs (e.g. {min(shared)}); merge only disjoint cubes")
+        for key, cell in other.cells.items():
+            target = self.cells.setdefault(key, {"count": 0, "salary": {}})
+            target["count"] += cell["count"]
+            for bucket, count in cell["salary"].items():
+                target["salary"][bucket] = target["salary"].get(bucket, 0) + count
+        self.seen |= other.seen
+
+    def _cells(self, site=None, industry=None, location=None, level=None, since_week=None, until_week=None):
+        wanted = {"site": site, "industry": industry, "location": location, "level": level}
+        wanted = {dim: value.lower() for dim, value in wanted.items() if value}
+        for key, cell in self.cells.items():
+            parts = dict(zip(DIMENSIONS, key.split("|")))
+            if any(parts[dim].lower() != value for dim, value in wanted.items()):
+                continue
+            if (since_week and parts["week"] < since_week) or (until_week and parts["week"] > until_week):
+                continue
+            yield parts, cell
+
+    def counts_by(self, dimension, **filters):
+        """Counter of jobs per value of one dimension, e.g. counts_by("industry", site="camhr")"""
+        counts = Counter()
+        for parts, cell in self._cells(**filters):
+            counts[parts[dimension]] += cell["count"]
+        return counts
+
+    def top(self, dimension, n=10, include_unknown=False, **filters):
+        counts = self.counts_by(dimension, **filters)
+        if not include_unknown:
+            counts.pop(UNKNOWN, None)
+        return counts.most_common(n)
+
+    def total(self, **filters):
+        return sum(cell["count"] for _, cell in self._cells(**filters))
+
+    def salary_histogram(self, **filters):
+        histogram = [0] * (len(SALARY_EDGES) + 1)
+        for _, cell in self._cells(**filters):
+            for bucket, count in cell["salary"].items():
+                histogram[int(bucket)] += count
+        return histogram
+
+    def salary_quantiles(self, quantiles=(0.25, 0.5, 0.75), **filters):
+        """Approximate salary quantiles (USD/month), interpolated inside buckets"""
+        histogram = self.salary_histogram(**filters)
+        total = sum(histogram)
+        if not total:
+            return {q: None for q in quantiles}
+        result = {}
+        for q in quantiles:
+            target = q * total
+            running = 0
+            for bucket, count in enumerate(histogram):
+                if count and running + count >= target:
+                    if bucket == 0:
+                        value = SALARY_EDGES[0]
+                    elif bucket == len(SALARY_EDGES):
+                        value = SALARY_EDGES[-1]
+                    else:
+                        low, high = SALARY_EDGES[bucket - 1], SALARY_EDGES[bucket]
+                        value = low * (high / low) ** ((target - running) / count)
+                    result[q] = round(value, 2)
+                    break
+                running += count
+        return result
+
+    def save(self, path=CUBE_FILENAME):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"dimensions": DIMENSIONS, "salary_edges": SALARY_EDGES, "cells": self.cells},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        with open(seen_path(path) + ".tmp", "w", encoding="utf-8") as f:
+            f.writelines(f"{key}\n" for key in sorted(self.seen))
+        os.replace(seen_path(path) + ".tmp", seen_path(path))
+        os.replace(tmp_path, path)
+        drop_journal(path)
+
+    @classmethod
+    def load(cls, path=CUBE_FILENAME):
+        cube = cls()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            cube.cells = payload["cells"]
+            cube.seen = set(payload.get("seen", ()))  # cubes saved before the seen file
+        if os.path.exists(seen_path(path)):
+            with open(seen_path(path), "r", encoding="utf-8") as f:
+                cube.seen.update(line.rstrip("\n") for line in f)
+        for record, day in read_journal(path):  # jobs the pipeline added since the last full save
+            cube.ingest(record, day)
+        return cube
+
+
+def update_cube(path=CUBE_FILENAME, csv_paths=None):
+    """
+    Add jobs from scraped CSVs that the cube has not counted yet
+
+    Args:
+        path: cube file, created if missing
+        csv_paths: {site: csv path}; defaults to the registry CSVs that exist
+    """
+    from job_index import read_site_csv
+    from sites import SITES
+
+    cube = MarketCube.load(path)
+    csv_paths = csv_paths or {site: info["csv"] for site, info in SITES.items() if os.path.exists(info["csv"])}
+    added = 0
+    for site, csv_path in csv_paths.items():
+        added += cube.ingest_many(read_site_csv(site, csv_path))
+    cube.save(path)
+    print(f"📊 Market cube: {added} new jobs added, {len(cube)} total")
+    return cube
+
+
+def print_report(cube, top_n=10, **filters):
+    """Print the usual market overview from the cube (same sections as the notebooks)"""
+    print("📊 Job Market Overview")
+    print("=" * 50)
+    print(f"   Total job listings: {cube.total(**filters)}")
+    sections = [("🏭 Top Industries", "industry"), ("🌍 Top Job Locations", "location"),
+                ("📊 Job Level Distribution", "level"), ("🌐 Jobs per Site", "site")]
+    for heading, dimension in sections:
+        if filters.get(dimension):
+            continue
+        print(f"\n{heading}:")
+        for value, count in cube.top(dimension, top_n, **filters):
+            print(f"   {value}: {count} jobs")
+    weeks = sorted(cube.counts_by("week", **filters).items())[-8:]
+    if weeks:
+        print("\n📅 Postings per Week (latest 8):")
+        for week, count in weeks:
+            print(f"   {week}: {count} jobs")
+    quartiles = cube.salary_quantiles(**filters)
+    if quartiles[0.5] is not None:
+        print(f"\n💰 Salary (USD/month): Q1 ${quartiles[0.25]:,.0f} | median ${quartiles[0.5]:,.0f} | Q3 ${quartiles[0.75]:,.0f}")
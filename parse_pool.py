@@ -0,0 +1,212 @@
+"""
+Two-stage crawl: threaded fetching, process-pool parsing
+
+Fetching is I/O-bound and BeautifulSoup parsing is CPU-bound, so running
+them one after another in one thread leaves the network idle while a page is
+parsed, and adding fetch threads only makes them queue on the GIL. Here:
+
+    fetch threads --(raw bytes)--> bounded queue --> process pool --> records
+
+Fetch threads put undecoded page bytes on a bounded queue and block when it
+is full. A dispatcher hands pages to a pool of parser processes (each runs
+the site's parse_job_page) and keeps at most a few pages per process in
+flight, so memory stays flat however far the fetchers get ahead. Only the
+compact JobRecords come back to the main process.
+
+Usage:
+    python parse_pool.py camhr --start 10611925 --end 10613636 --output camhr_fast.csv
+    python jobscrape.py crawl camhr --pool --discover
+"""
+import argparse
+import csv
+import os
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from sites import SITES, get_parser, get_site, read_csv_header
+
+FETCH_WORKERS = 8
+QUEUE_SIZE = 64          # raw pages waiting for a parser
+IN_FLIGHT_PER_WORKER = 2  # pages submitted to each parser process at once
+
+_parsers = {}
+_profiler = None
+
+
+def _parse(site, parser, profile_dir, job_id, url, content):
+    """Runs in a pool process; returns (job_id, record or None, parse seconds)"""
+    global _profiler
+    if site not in _parsers:
+        _parsers[site] = get_parser(site)
+        if profile_dir:
+            from slow_page_profiler import SlowPageProfiler
+            _profiler = _profiler or SlowPageProfiler(profile_dir)
+            _parsers[site] = _profiler.wrap_parser(site, _parsers[site])
+    start = time.perf_counter()
+    record = _parsers[site](content, url, parser)
+    return job_id, record, time.perf_counter() - start
+
+
+def _fetch_worker(site, job_ids, lock, url_template, pages, session, stats, profiler):
+    from fetching import fetch_page
+
+    while True:
+        with lock:
+            job_id = next(job_ids, None)
+        if job_id is None:
+            return
+        url = url_template.format(job_id)
+        try:
+            if profiler:
+                result = profiler.fetch(site, session, url, raw=True)
+            else:
+                result = fetch_page(session, url, raw=True)
+        except Exception as e:
+            # One bad page must not take a fetch thread (and its share of the IDs) down with it
+            print(f"❌ Fetching {job_id} failed: {e}")
+            with lock:
+                stats["fetch_errors"] += 1
+            continue
+        with lock:
+            stats["fetch_seconds"] += result["elapsed"]
+            stats["missing"] += not result["html"]
+        if result["html"]:
+            pages.put((job_id, url, result["html"]))  # blocks while the parsers are behind
+
+
+def _close_when_done(fetchers, pages):
+    for thread in fetchers:
+        thread.join()
+    pages.put(None)
+
+
+def run_pipeline(site, job_ids, url_template=None, on_record=None, fetch_workers=FETCH_WORKERS,
+                 parse_workers=None, parser="html.parser", queue_size=QUEUE_SIZE, profile_dir=None):
+    """
+    Fetch and parse job pages with separate I/O and CPU stages
+
+    Args:
+        site: registry site name (picks the parser)
+        job_ids: IDs to fetch, in order
+        url_template: job URL with {} for the ID (default: the site's base URL)
+        on_record: called as on_record(job_id, record) for every parsed job
+        fetch_workers: concurrent fetch threads
+        parse_workers: parser processes (default: CPU count)
+        parser: BeautifulSoup parser name passed to parse_job_page
+        queue_size: raw pages allowed to wait between the stages
+        profile_dir: save slow fetches and extractions here (see slow_page_profiler.py);
+            each parser process keeps its own timing window
+
+    Returns:
+        dict of counts and timings (pages, jobs, missing, empty, errors, fetch/parse seconds, wall_seconds);
+        pages whose fetch or parse raised are counted in errors and skipped
+    """
+    from fetching import create_session
+
+    url_template = url_template or get_site(site)["base_url"]
+    parse_workers = parse_workers or os.cpu_count() or 1
+    max_in_flight = parse_workers * IN_FLIGHT_PER_WORKER
+    stats = {"pages": 0, "jobs": 0, "missing": 0, "empty": 0, "errors": 0, "fetch_errors": 0, "fetch_seconds": 0.0,
+             "parse_seconds": 0.0, "queue_high_water": 0}
+
+    pages = queue.Queue(maxsize=queue_size)
+    session = create_session(pool_size=fetch_workers)
+    ids, lock = iter(job_ids), threading.Lock()
+    profiler = None
+    if profile_dir:
+        from slow_page_profiler import SlowPageProfiler
+        profiler = SlowPageProfiler(profile_dir)
+    fetchers = [threading.Thread(target=_fetch_worker,
+                                 args=(site, ids, lock, url_template, pages, session, stats, profiler),
+                                 daemon=True) for _ in range(fetch_workers)]
+
+    def handle(done):
+        for future in done:
+            job_id = pending.pop(future)
+            try:
+                job_id, record, seconds = future.result()
+            except Exception as e:
+                print(f"❌ Parsing {job_id} failed: {e}")
+                stats["errors"] += 1
+                continue
+            stats["parse_seconds"] += seconds
+            if record:
+                stats["jobs"] += 1
+                if on_record:
+                    on_record(job_id, record)
+            else:
+                stats["empty"] += 1
+
+    wall_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=parse_workers) as pool:
+        for thread in fetchers:
+            thread.start()
+        threading.Thread(target=_close_when_done, args=(fetchers, pages), daemon=True).start()
+
+        pending = {}  # future -> job ID
+        while True:
+            item = pages.get()
+            if item is None:
+                break
+            stats["pages"] += 1
+            stats["queue_high_water"] = max(stats["queue_high_water"], pages.qsize() + 1)
+            pending[pool.submit(_parse, site, parser, profile_dir, *item)] = item[0]
+            if len(pending) >= max_in_flight:
+                handle(wait(pending, return_when=FIRST_COMPLETED)[0])
+        handle(wait(pending)[0])
+    session.close()
+
+    stats["pages"] += stats["missing"] + stats["fetch_errors"]
+    stats["errors"] += stats.pop("fetch_errors")
+    stats["wall_seconds"] = time.perf_counter() - wall_start
+    return stats
+
+
+def crawl_to_csv(site, job_ids, output, url_template=None, **options):
+    """Run the pipeline and append the records to `output` (header written for new files)"""
+    header = read_csv_header(output)
+    with open(output, "a", newline="", encoding="utf-8-sig") as f:
+        writer = None
+
+        def write(job_id, record):
+            nonlocal writer
+            row = record.to_row(SITES[site]["placeholder"])
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=header or list(row), extrasaction="ignore")
+                if not header:
+                    writer.writeheader()
+            writer.writerow(row)
+
+        stats = run_pipeline(site, job_ids, url_template, on_record=write, **options)
+
+    rate = stats["jobs"] / stats["wall_seconds"] if stats["wall_seconds"] else 0.0
+    print(f"✅ {stats['jobs']} jobs from {stats['pages']} pages in {stats['wall_seconds']:.1f}s ({rate:.1f} jobs/s)")
+    print(f"   ⏩ {stats['missing']} missing, {stats['empty']} empty, {stats['errors']} errors | fetch {stats['fetch_seconds']:.1f}s, "
+          f"parse {stats['parse_seconds']:.1f}s (summed over workers)")
+    print(f"💾 Data saved to {output}")
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Crawl job pages with threaded fetching and parallel parsing")
+    parser.add_argument("site", choices=list(SITES))
+    parser.add_argument("--start", type=int, required=True)
+    parser.add_argument("--end", type=int, required=True)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--base-url", help="job URL template with {} for the ID")
+    parser.add_argument("--fetch-workers", type=int, default=FETCH_WORKERS)
+    parser.add_argument("--parse-workers", type=int, help="default: CPU count")
+    parser.add_argument("--parser", default="html.parser", help="BeautifulSoup parser, e.g. lxml")
+    parser.add_argument("--profile-slow", metavar="DIR", help="save slow pages and their profiles to DIR")
+    args = parser.parse_args(argv)
+
+    step = 1 if args.end >= args.start else -1
+    crawl_to_csv(args.site, range(args.start, args.end + step, step), args.output, args.base_url,
+                 fetch_workers=args.fetch_workers, parse_workers=args.parse_workers, parser=args.parser,
+                 profile_dir=args.profile_slow)
+
+
+if __name__ == "__main__":
+    main()
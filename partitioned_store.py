@@ -0,0 +1,446 @@
+"""
+Time-partitioned job store with compaction and retention
+
+The site CSVs only grow: every re-scrape appends another copy of a job and
+closed postings stay in the corpus forever. This store keeps jobs as
+Parquet part files partitioned by site and publish week:
+
+    job_store/
+        manifest.json                    job key -> partition holding its latest version
+        hot/camhr/2026-W41/part-000012.parquet
+        hot/jobify/2026-W42/part-000013.parquet
+        cold/camhr/2025/part-000007.parquet
+
+    hot    open jobs: what the search index, markdown corpus and analytics read
+    cold   jobs past their closing date (or, for sites without one, not seen
+           for STALE_DAYS), kept for history; one partition per site and year
+
+Every ingest writes one small part file per touched partition. `compact`
+merges a partition's part files into one, keeping only the latest version of
+each job, and `expire` moves closed jobs from hot to cold (the expire command
+also drops them from the search index and deletes their markdown files).
+Rebuilding the index or exporting the corpus then reads only the hot
+partitions, so its cost follows the number of open postings instead of the
+whole history.
+
+Jobs without a publish date (Jobify, Workinga) stay in the week they were
+first seen. Parquet files need pyarrow.
+
+Usage:
+    python partitioned_store.py ingest --csv camhr=CamHr.csv jobify=Jobify.csv
+    python partitioned_store.py expire --grace-days 3 --index job_index.json --markdown-dir job_markdowns
+    python partitioned_store.py compact
+    python partitioned_store.py stats
+    python partitioned_store.py export camhr --output CamHr_open.csv
+    python partitioned_store.py index --output job_index.json
+    python pipeline.py camhr --discover --store job_store
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import shutil
+import time
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+from job_record import from_arrow, read_records, to_arrow
+from sites import SITES, parse_date
+
+
+class StoreConfig:
+    ROOT = "job_store"
+    MANIFEST = "manifest.json"
+    GRACE_DAYS = 0         # keep jobs hot this many days after their closing date
+    STALE_DAYS = 45        # jobs without a closing date go cold when not seen for this long
+    MIN_PART_FILES = 2     # compact partitions with at least this many part files
+
+
+TIERS = ("hot", "cold")
+PART_PATTERN = re.compile(r"^part-(\d+)\.parquet$")
+
+
+def week_label(day):
+    """ISO week partition name, e.g. 2026-W41"""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def job_key(record):
+    return f"{record['site']}/{record['job_id']}"
+
+
+class PartitionedStore:
+    """Parquet partitions on disk plus the manifest saying where each job's latest version lives"""
+
+    def __init__(self, root=StoreConfig.ROOT, grace_days=StoreConfig.GRACE_DAYS,
+                 stale_days=StoreConfig.STALE_DAYS):
+        self.root = root
+        self.grace_days = grace_days
+        self.stale_days = stale_days
+        self.manifest_path = os.path.join(root, StoreConfig.MANIFEST)
+        self.jobs = {}         # "site/job_id" -> "hot/camhr/2026-W41"
+        self.next_part = 0
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            self.jobs = manifest["jobs"]
+            self.next_part = manifest["next_part"]
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"saved_at": time.time(), "next_part": self.next_part, "jobs": self.jobs}, f,
+                      separators=(",", ":"))
+        os.replace(tmp_path, self.manifest_path)
+
+    # --- placement -------------------------------------------------------
+
+    def is_expired(self, record, last_seen, today):
+        """Closed jobs expire after their closing date; jobs without one when not seen for stale_days"""
+        closing = parse_date(record["closing_date"])
+        if closing is not None:
+            return closing + timedelta(days=self.grace_days) < today
+        return date.fromtimestamp(last_seen) + timedelta(days=self.stale_days) < today
+
+    def location_for(self, record, last_seen, today):
+        """Partition a job version belongs in: hot/<site>/<week> or cold/<site>/<year>"""
+        published = parse_date(record["publish_date"])
+        current = self.jobs.get(job_key(record))
+        if published is not None:
+            week = week_label(published)
+        elif current and current.startswith("hot/"):
+            week = current.rsplit("/", 1)[1]   # keep the week it was first seen
+        else:
+            week = week_label(date.fromtimestamp(last_seen))
+        if self.is_expired(record, last_seen, today):
+            return f"cold/{record['site']}/{week[:4]}"
+        return f"hot/{record['site']}/{week}"
+
+    # --- files -----------------------------------------------------------
+
+    def partitions(self, tier=None, site=None):
+        """Partition locations on disk, e.g. ["hot/camhr/2026-W41", ...]"""
+        locations = []
+        for tier_name in ([tier] if tier else TIERS):
+            for site_name in ([site] if site else SITES):
+                directory = os.path.join(self.root, tier_name, site_name)
+                if os.path.isdir(directory):
+                    locations.extend(f"{tier_name}/{site_name}/{name}" for name in sorted(os.listdir(directory))
+                                     if os.path.isdir(os.path.join(directory, name)))
+        return locations
+
+    def part_files(self, location):
+        """Part files of a partition, oldest first"""
+        directory = os.path.join(self.root, location)
+        if not os.path.isdir(directory):
+            return []
+        parts = [(int(match.group(1)), name) for name in os.listdir(directory)
+                 for match in [PART_PATTERN.match(name)] if match]
+        return [os.path.join(directory, name) for _, name in sorted(parts)]
+
+    def _write_part(self, location, records, seen):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        directory = os.path.join(self.root, location)
+        os.makedirs(directory, exist_ok=True)
+        table = pa.Table.from_batches([to_arrow(records)])
+        table = table.append_column("last_seen", pa.array(seen, pa.float64()))
+        path = os.path.join(directory, f"part-{self.next_part:06d}.parquet")
+        self.next_part += 1
+        pq.write_table(table, path + ".tmp")
+        os.replace(path + ".tmp", path)
+        return path
+
+    def read_partition(self, location):
+        """Latest live version of each job in a partition: {key: (JobRecord, last_seen)}"""
+        import pyarrow.parquet as pq
+
+        jobs = {}
+        for path in self.part_files(location):
+            table = pq.read_table(path)
+            for record, seen in zip(from_arrow(table), table.column("last_seen").to_pylist()):
+                key = job_key(record)
+                if self.jobs.get(key) == location:   # newer version moved elsewhere otherwise
+                    jobs[key] = (record, seen)
+        return jobs
+
+    def _rewrite(self, location, jobs, old_files):
+        """Replace a partition's part files with one file of `jobs` (manifest saved first)"""
+        if jobs:
+            records, seen = zip(*jobs.values())
+            self._write_part(location, list(records), list(seen))
+        self.save()
+        for path in old_files:
+            os.remove(path)
+        if not jobs:
+            shutil.rmtree(os.path.join(self.root, location), ignore_errors=True)
+
+    # --- operations ------------------------------------------------------
+
+    def add(self, records, last_seen=None):
+        """
+        Write a batch of scraped jobs (JobRecords) as one part file per touched partition
+
+        Args:
+            records: iterable of JobRecords; rows without a job ID are skipped
+            last_seen: scrape timestamp (default: now)
+
+        Returns:
+            {"hot": n, "cold": n, "skipped": n}
+        """
+        last_seen = last_seen or time.time()
+        today = date.fromtimestamp(last_seen)
+        groups = defaultdict(list)
+        counts = Counter()
+        for record in records:
+            if not record["job_id"]:
+                counts["skipped"] += 1
+                continue
+            location = self.location_for(record, last_seen, today)
+            groups[location].append(record)
+            self.jobs[job_key(record)] = location
+            counts[location.split("/", 1)[0]] += 1
+        for location, batch in groups.items():
+            self._write_part(location, batch, [last_seen] * len(batch))
+        if groups:
+            self.save()
+        return {"hot": counts["hot"], "cold": counts["cold"], "skipped": counts["skipped"]}
+
+    def records(self, tier="hot", site=None):
+        """Yield the latest version of every job in a tier (JobRecords)"""
+        for location in self.partitions(tier, site):
+            for record, _ in self.read_partition(location).values():
+                yield record
+
+    def expire(self, today=None):
+        """
+        Move hot jobs past their closing date (or stale) to cold storage
+
+        Only the store changes; see prune_expired for the search index and
+        markdown corpus built from the hot tier.
+
+        Returns:
+            list of the moved JobRecords
+        """
+        today = today or date.today()
+        moved = []
+        for location in self.partitions("hot"):
+            jobs = self.read_partition(location)
+            expired = defaultdict(dict)
+            for key, (record, seen) in jobs.items():
+                if self.is_expired(record, seen, today):
+                    week = location.rsplit("/", 1)[1]
+                    expired[f"cold/{record['site']}/{week[:4]}"][key] = (record, seen)
+            if not expired:
+                continue
+            for cold_location, cold_jobs in expired.items():
+                records, seen = zip(*cold_jobs.values())
+                self._write_part(cold_location, list(records), list(seen))
+                for key in cold_jobs:
+                    self.jobs[key] = cold_location
+                    del jobs[key]
+                moved.extend(records)
+            self._rewrite(location, jobs, self.part_files(location))
+        return moved
+
+    def compact(self, tier=None, min_files=StoreConfig.MIN_PART_FILES):
+        """
+        Merge each partition's part files into one, dropping superseded versions
+
+        Partitions with fewer than `min_files` files are rewritten only if they
+        hold superseded rows (jobs whose latest version lives elsewhere).
+
+        Returns:
+            {"partitions": n, "files_before": n, "files_after": n, "rows_dropped": n}
+        """
+        import pyarrow.parquet as pq
+
+        stats = Counter()
+        live = Counter(self.jobs.values())
+        for location in self.partitions(tier):
+            files = self.part_files(location)
+            rows = sum(pq.ParquetFile(path).metadata.num_rows for path in files)
+            if len(files) < min_files and rows == live[location]:
+                continue   # file footers alone show nothing to merge or drop
+            jobs = self.read_partition(location)
+            self._rewrite(location, jobs, files)
+            stats["partitions"] += 1
+            stats["files_before"] += len(files)
+            stats["files_after"] += 1 if jobs else 0
+            stats["rows_dropped"] += rows - len(jobs)
+        return {key: stats[key] for key in ("partitions", "files_before", "files_after", "rows_dropped")}
+
+    def stats(self):
+        """Live jobs, stored rows, files and bytes per tier and site"""
+        import pyarrow.parquet as pq
+
+        live = Counter(location.rsplit("/", 1)[0] for location in self.jobs.values())
+        summary = {}
+        for location in self.partitions():
+            tier_site = location.rsplit("/", 1)[0]
+            entry = summary.setdefault(tier_site, {"live_jobs": live[tier_site], "partitions": 0, "files": 0,
+                                                   "rows": 0, "bytes": 0})
+            entry["partitions"] += 1
+            for path in self.part_files(location):
+                entry["files"] += 1
+                entry["rows"] += pq.ParquetFile(path).metadata.num_rows
+                entry["bytes"] += os.path.getsize(path)
+        return summary
+
+
+def ingest_csv(store, site, csv_path, batch_size=50000):
+    """Add a scraped CSV to the store in batches; returns the add() counts summed"""
+    totals = Counter()
+    batch = []
+    for record in read_records(site, csv_path):
+        batch.append(record)
+        if len(batch) >= batch_size:
+            totals.update(store.add(batch))
+            batch = []
+    if batch:
+        totals.update(store.add(batch))
+    return dict(totals)
+
+
+def prune_expired(records, index_path=None, markdown_dir=None):
+    """
+    Remove expired jobs from a saved search index and a markdown corpus (either may be None)
+
+    Returns:
+        (jobs removed from the index, markdown files deleted)
+    """
+    import glob
+
+    unindexed = deleted = 0
+    if index_path and os.path.exists(index_path):
+        from job_index import JobIndex
+
+        index = JobIndex.load(index_path)
+        unindexed = sum(index.remove(JobIndex.doc_key(record)) for record in records)
+        if unindexed:
+            index.save(index_path)
+    if markdown_dir and os.path.isdir(markdown_dir):
+        # MarkdownSink names files <title>_<job_id>.md under <markdown_dir>/<site>/
+        for record in records:
+            pattern = os.path.join(glob.escape(os.path.join(markdown_dir, record["site"])),
+                                   f"*_{glob.escape(record['job_id'])}.md")
+            for path in glob.glob(pattern):
+                os.remove(path)
+                deleted += 1
+    return unindexed, deleted
+
+
+def export_csv(store, site, output_path, tier="hot"):
+    """
+    Write a tier's jobs for one site with the site's CSV columns (for the markdown converters)
+
+    The columns are those the site maps in sites.SITES (every column its
+    scraper writes), with the site's placeholder for missing fields.
+    """
+    columns = list(SITES[site]["fields"].values())
+    count = 0
+    with open(output_path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        for record in store.records(tier, site):
+            writer.writerow(record.to_row(SITES[site]["placeholder"]))
+            count += 1
+    return count
+
+
+def build_index(store, tier="hot"):
+    """Search index over one tier (open jobs by default)"""
+    from job_index import JobIndex
+
+    index = JobIndex()
+    for record in store.records(tier):
+        index.add(record)
+    index.built_at = time.time()
+    return index
+
+
+def print_stats(store):
+    summary = store.stats()
+    if not summary:
+        print(f"📭 {store.root} is empty")
+        return
+    print(f"{'partition':22} {'live':>8} {'rows':>8} {'parts':>6} {'files':>6} {'MB':>8}")
+    for tier_site, entry in sorted(summary.items()):
+        print(f"{tier_site:22} {entry['live_jobs']:8} {entry['rows']:8} {entry['partitions']:6} "
+              f"{entry['files']:6} {entry['bytes'] / 1e6:8.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Site/week partitioned job store with compaction and retention")
+    parser.add_argument("--root", default=StoreConfig.ROOT)
+    parser.add_argument("--grace-days", type=float, default=StoreConfig.GRACE_DAYS)
+    parser.add_argument("--stale-days", type=float, default=StoreConfig.STALE_DAYS)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subparsers.add_parser("ingest", help="add scraped CSVs to the store")
+    ingest_parser.add_argument("--csv", nargs="+", metavar="SITE=PATH", help="CSVs to add (default: all sites)")
+
+    expire_parser = subparsers.add_parser("expire", help="move closed jobs from hot to cold storage")
+    expire_parser.add_argument("--index", default="job_index.json", help="also drop them from this index ('' to skip)")
+    expire_parser.add_argument("--markdown-dir", default="job_markdowns",
+                               help="also delete their markdown files here ('' to skip)")
+
+    compact_parser = subparsers.add_parser("compact", help="merge part files, keeping the latest version of each job")
+    compact_parser.add_argument("--tier", choices=TIERS)
+    compact_parser.add_argument("--min-files", type=int, default=StoreConfig.MIN_PART_FILES)
+
+    subparsers.add_parser("stats", help="live jobs, rows and files per tier and site")
+
+    export_parser = subparsers.add_parser("export", help="write one site's jobs as a site CSV")
+    export_parser.add_argument("site", choices=list(SITES))
+    export_parser.add_argument("--output", help="default: <site>_<tier>.csv")
+    export_parser.add_argument("--tier", choices=TIERS, default="hot")
+
+    index_parser = subparsers.add_parser("index", help="build the search index from the hot tier")
+    index_parser.add_argument("--output", default="job_index.json")
+    args = parser.parse_args(argv)
+
+    store = PartitionedStore(args.root, args.grace_days, args.stale_days)
+    if args.command == "ingest":
+        csv_paths = dict(item.split("=", 1) for item in args.csv) if args.csv else \
+            {site: info["csv"] for site, info in SITES.items()}
+        for site, path in csv_paths.items():
+            if not os.path.exists(path):
+                print(f"⚠️ {path} not found, skipping {site}")
+                continue
+            counts = ingest_csv(store, site, path)
+            print(f"📥 {site}: {counts.get('hot', 0)} hot, {counts.get('cold', 0)} cold from {path}")
+    elif args.command == "expire":
+        start = time.perf_counter()
+        moved = store.expire()
+        print(f"🧊 Moved {len(moved)} closed jobs to cold storage in {time.perf_counter() - start:.1f}s")
+        unindexed, deleted = prune_expired(moved, args.index, args.markdown_dir)
+        if unindexed or deleted:
+            print(f"🗑️ Removed {unindexed} from {args.index} and {deleted} markdown files")
+    elif args.command == "compact":
+        start = time.perf_counter()
+        result = store.compact(args.tier, args.min_files)
+        print(f"🗜️ Compacted {result['partitions']} partitions: {result['files_before']} -> "
+              f"{result['files_after']} files, {result['rows_dropped']} superseded rows dropped "
+              f"in {time.perf_counter() - start:.1f}s")
+    elif args.command == "stats":
+        print_stats(store)
+    elif args.command == "export":
+        output = args.output or f"{args.site}_{args.tier}.csv"
+        count = export_csv(store, args.site, output, args.tier)
+        print(f"💾 Wrote {count} {args.tier} {args.site} jobs to {output}")
+    else:
+        index = build_index(store)
+        index.save(args.output)
+        print(f"💾 Saved index of {len(index)} open jobs to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,487 @@
+"""
+Streaming crawl-to-corpus pipeline
+
+Each scraped record goes through every stage as soon as it arrives, instead
+of scrape -> CSV -> rename -> re-read -> convert:
+
+    raw row -> normalize (canonical fields) -> IT classification
+            -> markdown rendering -> sinks
+
+Sinks receive every job and decide what to keep. Available sinks:
+    CsvSink       appends the raw row to the site CSV (CamHr.csv, Jobify.csv, ...)
+    MarkdownSink  writes one markdown file per (IT) job
+    IndexSink     adds the job to the search index and journals it every few seconds
+    CubeSink      counts the job in the market analytics cube
+    CompanySink   records company names and profile links for company_profiles.py
+    SkillSink     extracts skill IDs into the job x skill matrix (skills.py)
+    StoreSink     buffers jobs and writes them to the partitioned store (partitioned_store.py)
+    AlertSink     matches each job against the saved searches and writes alerts (saved_searches.py)
+
+The CSV is just one sink, so new postings are searchable a couple of
+seconds after they are scraped without any stage re-reading a file.
+
+Usage:
+    python pipeline.py camhr --discover
+    python pipeline.py camhr --start 10611925 --end 10613636 --all-markdown
+    python pipeline.py workinga --api --discover
+    python pipeline.py jobify --from-csv Jobify.csv          # backfill from an existing CSV
+"""
+import argparse
+import csv
+import os
+import re
+import sys
+import threading
+import time
+
+from job_record import JobRecord, append_journal, drop_journal, journal_path
+from sites import SITES, get_site, is_missing, read_csv_header
+
+MARKDOWN_DIR = "job_markdowns"
+FLUSH_SECONDS = 2.0
+JOURNAL_LIMIT = 5000         # journaled jobs before a sink re-saves its whole structure
+STORE_FLUSH_SECONDS = 30.0   # fewer, larger part files; compaction merges the rest
+
+IT_PATTERN = None
+IT_FIELDS = ("title", "function", "industry", "requirements", "responsibilities", "skills")
+
+
+def is_it_job(record):
+    """
+    IT classification of a canonical record
+
+    Uses the keyword list of convert_camhr_to_md, matched on whole words of the
+    title, function, industry and requirement fields (so "it" does not match
+    "with", and URLs do not count).
+    """
+    global IT_PATTERN
+    if IT_PATTERN is None:
+        from convert_camhr_to_md import IT_KEYWORDS
+        words = sorted(set(IT_KEYWORDS), key=len, reverse=True)
+        IT_PATTERN = re.compile(r"(?<![\w])(?:" + "|".join(re.escape(w) for w in words) + r")(?![\w])")
+    text = " ".join(record[field] for field in IT_FIELDS if record.get(field)).lower()
+    return bool(IT_PATTERN.search(text))
+
+
+def split_items(text):
+    """Requirement-style fields are bullet (•), pipe (|) or newline separated depending on the site"""
+    items = [item.strip(" -–\t") for item in re.split(r"•|\||\n", text or "")]
+    return [item for item in items if item]
+
+
+def render_markdown(record):
+    """Markdown document for a canonical record (same sections as convert_camhr_to_md)"""
+    lines = [f"# {record['title']}", ""]
+    sections = [("Company", "company"), ("Location", "location"), ("Salary", "salary"),
+                ("Job Level", "level"), ("Experience Required", "experience"), ("Job Type", "term"),
+                ("Industry", "industry"), ("Published Date", "publish_date"), ("Closing Date", "closing_date")]
+    for heading, field in sections:
+        value = record.get(field)
+        if value and not (field == "salary" and value.lower() == "negotiable"):
+            lines += [f"## {heading}", value, ""]
+    for heading, field in (("Job Requirements", "requirements"), ("Job Responsibilities", "responsibilities"),
+                           ("Required Skills", "skills")):
+        items = split_items(record.get(field))
+        if items:
+            lines += [f"## {heading}"] + [f"- {item}" for item in items] + [""]
+    if record.get("url"):
+        lines += ["## Apply Here", record["url"], ""]
+    return "\n".join(lines)
+
+
+class CsvSink:
+    """Append raw rows to each site's CSV (the registry path unless overridden)"""
+
+    def __init__(self, paths=None):
+        self.paths = paths or {}
+        self.files = {}
+
+    def write(self, job):
+        site = job["site"]
+        row = job["row"]
+        if isinstance(row, JobRecord):  # parsed by a scraper: placeholders only go into the file
+            row = row.to_row(SITES[site]["placeholder"])
+        if site not in self.files:
+            path = self.paths.get(site) or get_site(site)["csv"]
+            header = read_csv_header(path)
+            f = open(path, "a", newline="", encoding="utf-8-sig")
+            writer = csv.DictWriter(f, fieldnames=header or list(row), extrasaction="ignore")
+            if not header:
+                writer.writeheader()
+            self.files[site] = (f, writer)
+        self.files[site][1].writerow(row)
+
+    def flush(self):
+        for f, _ in self.files.values():
+            f.flush()
+
+    def close(self):
+        for f, _ in self.files.values():
+            f.close()
+        self.files = {}
+
+
+class MarkdownSink:
+    """One markdown file per job under <output_dir>/<site>/, named by title and job ID"""
+
+    def __init__(self, output_dir=MARKDOWN_DIR, it_only=True):
+        self.output_dir = output_dir
+        self.it_only = it_only
+        self.written = 0
+
+    def write(self, job):
+        if self.it_only and not job["is_it"]:
+            return
+        record = job["record"]
+        site_dir = os.path.join(self.output_dir, job["site"])
+        os.makedirs(site_dir, exist_ok=True)
+        safe_title = re.sub(r"[^\w\s-]", "", record["title"]).strip().replace(" ", "_")[:80] or "Untitled"
+        # The job ID keeps names unique, so a re-scraped job overwrites its own file
+        path = os.path.join(site_dir, f"{safe_title}_{record['job_id']}.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(job["markdown"])
+        self.written += 1
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _PeriodicSave:
+    """
+    Base for sinks that keep a structure in memory and persist it every few seconds
+
+    A flush appends only the jobs written since the last one to the
+    structure's journal, which its load() replays. The whole structure is
+    saved (dropping the journal) on the first flush, once JOURNAL_LIMIT jobs
+    are journaled, and on close.
+    """
+
+    def __init__(self, path, flush_seconds=FLUSH_SECONDS):
+        self.path = path
+        self.flush_seconds = flush_seconds
+        self.pending = []
+        self.journaled = 0
+        if os.path.exists(journal_path(path)):  # already replayed by the structure's load()
+            with open(journal_path(path), "rb") as f:
+                self.journaled = sum(1 for _ in f)
+        self.saved_at = time.monotonic()
+
+    def _written(self, record):
+        self.pending.append(record)
+        self.flush_due()
+
+    def flush_due(self):
+        if time.monotonic() - self.saved_at >= self.flush_seconds:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            if self.journaled + len(self.pending) >= JOURNAL_LIMIT or not os.path.exists(self.path):
+                self._save_all()
+            else:
+                append_journal(self.path, self.pending)
+                self.journaled += len(self.pending)
+            self.pending = []
+        self.saved_at = time.monotonic()
+
+    def _save_all(self):
+        self.save()
+        drop_journal(self.path)
+        self.journaled = 0
+
+    def close(self):
+        if self.pending or self.journaled:
+            self._save_all()
+            self.pending = []
+
+
+class IndexSink(_PeriodicSave):
+    """Add jobs to the keyword index (loaded from `path` if present) and save it periodically"""
+
+    def __init__(self, path="job_index.json", flush_seconds=FLUSH_SECONDS):
+        from job_index import JobIndex
+
+        super().__init__(path, flush_seconds)
+        self.index = JobIndex.load(path) if os.path.exists(path) else JobIndex()
+
+    def write(self, job):
+        self.index.add(job["record"])
+        self._written(job["record"])
+
+    def save(self):
+        self.index.built_at = time.time()
+        self.index.save(self.path)
+
+
+class CubeSink(_PeriodicSave):
+    """Count jobs in the market analytics cube and save it periodically"""
+
+    def __init__(self, path="market_cube.json", flush_seconds=FLUSH_SECONDS):
+        from market_analytics import MarketCube
+
+        super().__init__(path, flush_seconds)
+        self.cube = MarketCube.load(path)
+
+    def write(self, job):
+        if self.cube.ingest(job["record"]):
+            self._written(job["record"])
+
+    def save(self):
+        self.cube.save(self.path)
+
+
+class CompanySink(_PeriodicSave):
+    """Collect company names and profile URLs into the company cache (profiles are fetched separately)"""
+
+    def __init__(self, path="company_profiles.json", flush_seconds=FLUSH_SECONDS):
+        from company_profiles import CompanyCache
+
+        super().__init__(path, flush_seconds)
+        self.cache = CompanyCache.load(path)
+
+    def write(self, job):
+        record = job["record"]
+        if record.get("company"):
+            self.cache.add(job["site"], record["company"], record.get("company_url"))
+            self._written(record)
+
+    def save(self):
+        self.cache.save(self.path)
+
+
+class SkillSink(_PeriodicSave):
+    """Extract each job's skills into the skill matrix (loaded from `path` if present) and save it periodically"""
+
+    def __init__(self, path="skill_matrix.npz", flush_seconds=FLUSH_SECONDS):
+        from skills import SkillExtractor, SkillMatrix
+
+        super().__init__(path, flush_seconds)
+        self.extractor = SkillExtractor()
+        self.matrix = SkillMatrix.load(path) if os.path.exists(path) else SkillMatrix(self.extractor.names)
+
+    def write(self, job):
+        self.matrix.add(job["record"], self.extractor.extract_record(job["record"]))
+        self._written(job["record"])
+
+    def save(self):
+        self.matrix.built_at = time.time()
+        self.matrix.save(self.path)
+
+
+class StoreSink(_PeriodicSave):
+    """Buffer jobs and add them to the partitioned store as one part file per partition per flush"""
+
+    def __init__(self, root="job_store", flush_seconds=STORE_FLUSH_SECONDS):
+        from partitioned_store import PartitionedStore
+
+        super().__init__(root, flush_seconds)
+        self.store = PartitionedStore(root)
+
+    def write(self, job):
+        self._written(job["record"])
+
+    def flush(self):
+        # Part files are already incremental, so the buffer goes straight to the store
+        if self.pending:
+            self.store.add(self.pending)
+            self.pending = []
+        self.saved_at = time.monotonic()
+
+    def close(self):
+        self.flush()
+
+
+class AlertSink:
+    """Match each job against the saved searches; alerts go to the outbox as they happen"""
+
+    def __init__(self, searches_path="saved_searches.json", outbox_path="alerts_outbox.jsonl", webhook=None):
+        from saved_searches import AlertEngine
+
+        self.engine = AlertEngine(searches_path, outbox_path, webhook)
+
+    def write(self, job):
+        self.engine.process(job["record"])
+
+    def flush(self):
+        pass
+
+    def close(self):
+        stats = self.engine.stats
+        if stats["alerts"]:
+            print(f"🔔 {stats['alerts']} new alert(s) in {self.engine.outbox.path}")
+
+
+class JobPipeline:
+    """Push raw scraped rows through normalize -> classify -> render -> sinks"""
+
+    def __init__(self, sinks, render=True):
+        self.sinks = sinks
+        self.render = render
+        self.stats = {"received": 0, "jobs": 0, "it_jobs": 0, "skipped": 0}
+        self.timings = {"normalize": 0.0, "classify": 0.0, "render": 0.0, "sinks": 0.0}
+        self.lock = threading.Lock()   # sinks are written and flushed from different threads
+        self.stopped = threading.Event()
+        self.flusher = None
+
+    def start_flusher(self, interval=FLUSH_SECONDS):
+        """Flush due sinks from a background thread, so jobs are saved even while none arrive"""
+        def run():
+            while not self.stopped.wait(interval):
+                with self.lock:
+                    for sink in self.sinks:
+                        if hasattr(sink, "flush_due"):
+                            sink.flush_due()
+
+        self.flusher = threading.Thread(target=run, name="sink-flusher", daemon=True)
+        self.flusher.start()
+
+    def process(self, site, row):
+        """Handle one scraped job (a JobRecord, or a row keyed by site CSV columns); returns the job dict or None"""
+        self.stats["received"] += 1
+        t0 = time.perf_counter()
+        record = row if isinstance(row, JobRecord) else JobRecord.from_row(site, row)
+        t1 = time.perf_counter()
+        if not record["title"]:
+            self.stats["skipped"] += 1
+            return None
+        is_it = is_it_job(record)
+        t2 = time.perf_counter()
+        markdown = render_markdown(record) if self.render else None
+        t3 = time.perf_counter()
+
+        job = {"site": site, "row": row, "record": record, "is_it": is_it, "markdown": markdown}
+        with self.lock:
+            for sink in self.sinks:
+                sink.write(job)
+        t4 = time.perf_counter()
+
+        self.stats["jobs"] += 1
+        self.stats["it_jobs"] += is_it
+        for stage, seconds in zip(self.timings, (t1 - t0, t2 - t1, t3 - t2, t4 - t3)):
+            self.timings[stage] += seconds
+        return job
+
+    def close(self):
+        self.stopped.set()
+        if self.flusher:
+            self.flusher.join()
+        for sink in self.sinks:
+            sink.close()
+        print(f"✅ Pipeline: {self.stats['jobs']} jobs ({self.stats['it_jobs']} IT), "
+              f"{self.stats['skipped']} skipped")
+        print("   ⏱️ " + " | ".join(f"{stage} {seconds:.2f}s" for stage, seconds in self.timings.items()))
+
+
+def build_sinks(csv_paths=None, markdown_dir=MARKDOWN_DIR, it_only=True, index_path="job_index.json",
+                cube_path=None, write_csv=True, companies_path=None, skills_path=None, store_root=None,
+                alerts_path=None):
+    sinks = []
+    if write_csv:
+        sinks.append(CsvSink(csv_paths))
+    if markdown_dir:
+        sinks.append(MarkdownSink(markdown_dir, it_only))
+    if index_path:
+        sinks.append(IndexSink(index_path))
+    if cube_path:
+        sinks.append(CubeSink(cube_path))
+    if companies_path:
+        sinks.append(CompanySink(companies_path))
+    if skills_path:
+        sinks.append(SkillSink(skills_path))
+    if store_root:
+        sinks.append(StoreSink(store_root))
+    if alerts_path:
+        sinks.append(AlertSink(alerts_path))
+    return sinks
+
+
+def feed_csv(pipeline, site, csv_path):
+    """Backfill: stream an existing scraped CSV through the pipeline (read once)"""
+    with open(csv_path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        for row in csv.DictReader(f):
+            if not all(is_missing(value) for value in row.values()):
+                pipeline.process(site, row)
+
+
+def feed_pool(pipeline, site, job_ids, url_template=None, **options):
+    """Crawl with parse_pool (plain HTTP, parallel parsing) and stream each record in"""
+    from parse_pool import run_pipeline
+
+    return run_pipeline(site, job_ids, url_template, on_record=lambda job_id, record: pipeline.process(site, record),
+                        **options)
+
+
+def feed_workinga_api(pipeline, config):
+    """Crawl Workinga's JSON endpoint (see workinga_api.py) and stream each record in; False without a data URL"""
+    from workinga_api import fetch_jobs, load_template
+
+    template = load_template(config)
+    if not template["url"]:
+        print("❌ No Workinga job data URL; run `python workinga_api.py discover` first")
+        return False
+    for job_id, record, status in fetch_jobs(config, template):
+        if record is not None:
+            pipeline.process("workinga", record)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream scraped jobs into CSV, markdown, search index and cube")
+    parser.add_argument("site", choices=list(SITES))
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--discover", action="store_true", help="crawl only new IDs from the listing pages")
+    source.add_argument("--from-csv", help="backfill from an existing scraped CSV instead of crawling")
+    parser.add_argument("--start", type=int)
+    parser.add_argument("--end", type=int)
+    parser.add_argument("--base-url", help="job URL template with {} for the ID")
+    parser.add_argument("--api", action="store_true", help="workinga: use the JSON data endpoint (always on)")
+    parser.add_argument("--csv", help="site CSV to append to (default: registry path)")
+    parser.add_argument("--no-csv", action="store_true", help="do not write the site CSV")
+    parser.add_argument("--markdown-dir", default=MARKDOWN_DIR)
+    parser.add_argument("--all-markdown", action="store_true", help="write markdown for non-IT jobs too")
+    parser.add_argument("--index", default="job_index.json")
+    parser.add_argument("--cube", help="also update this market cube file")
+    parser.add_argument("--companies", help="also collect company names and links into this cache")
+    parser.add_argument("--skills", help="also add job skills to this skill matrix (.npz)")
+    parser.add_argument("--store", help="also write jobs to this partitioned store directory")
+    parser.add_argument("--alerts", help="also match jobs against these saved searches (alerts_outbox.jsonl)")
+    args = parser.parse_args(argv)
+
+    sinks = build_sinks({args.site: args.csv} if args.csv else None, args.markdown_dir, not args.all_markdown,
+                        args.index, args.cube, write_csv=not (args.no_csv or args.from_csv),
+                        companies_path=args.companies, skills_path=args.skills, store_root=args.store,
+                        alerts_path=args.alerts)
+    pipeline = JobPipeline(sinks)
+    pipeline.start_flusher()
+    try:
+        if args.from_csv:
+            feed_csv(pipeline, args.site, args.from_csv)
+            return
+        job_ids = None
+        if args.discover:
+            from discovery import discover
+            job_ids = [int(job["job_id"]) for job in discover(args.site)]
+        elif args.start and args.end:
+            step = 1 if args.end >= args.start else -1
+            job_ids = list(range(args.start, args.end + step, step))
+        if not job_ids:
+            print("⚠️ No job IDs to crawl (use --discover or --start/--end)")
+            return
+        if args.site == "workinga":
+            # Client-rendered pages: parse_pool would parse empty shells, so always use the JSON endpoint
+            from Workinga import ScraperConfig
+            config = ScraperConfig()
+            config.JOB_IDS = job_ids
+            if not feed_workinga_api(pipeline, config):
+                sys.exit(1)
+        else:
+            feed_pool(pipeline, args.site, job_ids, args.base_url)
+    finally:
+        pipeline.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Local read-only HTTP service over the job index
+
+The notebooks' search functions reload a CSV on every call. This service
+loads job_index.json once, keeps it in memory and answers concurrent
+requests from the chatbot frontend or analysts:
+
+    GET /search?q=python+developer&location=phnom+penh&site=camhr&page=1&per_page=20
+    GET /jobs?industry=bank&company=acleda&level=senior   filter only (q optional)
+    GET /jobs/<site>/<job_id>                            one job
+    GET /stats?site=camhr                                counts by site, location, industry, company, level
+    GET /health
+
+Responses are cached in an LRU keyed by the normalized request. When the
+index file or its journal changes on disk (jobscrape index, or the
+pipeline's IndexSink saving new jobs), it is reloaded in the background and the cache is
+dropped. Every response carries an ETag; a matching If-None-Match gets a
+304 with no body.
+
+Usage:
+    python query_service.py --index job_index.json --port 8080
+    python jobscrape.py serve --port 8080
+    python benchmarks/load_test.py --url http://127.0.0.1:8080
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from job_index import INDEX_FILENAME, JobIndex
+from job_record import journal_path
+
+CACHE_SIZE = 2048        # cached responses
+RELOAD_SECONDS = 2.0     # how often the index file is checked for changes
+PER_PAGE = 20
+MAX_PER_PAGE = 100
+STATS_TOP = 20
+
+# /jobs and /search substring filters on stored fields
+FILTER_FIELDS = ("location", "industry", "company", "level")
+
+
+class ResultCache:
+    """Thread-safe LRU of encoded responses: key -> (status, body, etag)"""
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class JobStore:
+    """The loaded index plus a watcher that reloads it when the file changes"""
+
+    def __init__(self, index_path=INDEX_FILENAME, cache_size=CACHE_SIZE):
+        self.index_path = index_path
+        self.cache = ResultCache(cache_size)
+        self.generation = 0
+        self.mtime = None
+        self.index = JobIndex()
+        self.loaded_at = None
+        self.reload()
+
+    def reload(self):
+        """Load the index if the file changed since the last load; returns True if it did"""
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        journal = journal_path(self.index_path)
+        if os.path.exists(journal):  # the pipeline's IndexSink appends new jobs here between full saves
+            mtime = (mtime, os.stat(journal).st_mtime_ns)
+        if mtime == self.mtime:
+            return False
+        start = time.perf_counter()
+        index = JobIndex.load(self.index_path)
+        # Swap in the new index before dropping the cache, so no stale answer is cached after it
+        self.index, self.mtime = index, mtime
+        self.generation += 1
+        self.cache.clear()
+        self.loaded_at = time.time()
+        print(f"📚 Loaded {len(index)} jobs from {self.index_path} in {time.perf_counter() - start:.2f}s "
+              f"(generation {self.generation})")
+        return True
+
+    def watch(self, interval=RELOAD_SECONDS):
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.reload()
+                except (OSError, ValueError) as e:  # file replaced mid-read; try again next round
+                    print(f"⚠️ Index reload failed: {e}")
+
+        threading.Thread(target=run, name="index-watcher", daemon=True).start()
+
+    def search(self, query="", site=None, filters=None, page=1, per_page=PER_PAGE):
+        filters = {field: value.lower() for field, value in (filters or {}).items() if value}
+        location = filters.pop("location", None)
+        jobs = self.index.search(query, location=location, site=site, limit=None)
+        if filters:
+            jobs = [job for job in jobs
+                    if all(value in (job[field] or "").lower() for field, value in filters.items())]
+        start = (page - 1) * per_page
+        return {"query": query, "site": site, "filters": dict(filters, location=location) if location else filters,
+                "total": len(jobs), "page": page, "per_page": per_page,
+                "pages": (len(jobs) + per_page - 1) // per_page, "results": jobs[start:start + per_page]}
+
+    def get_job(self, site, job_id):
+        doc_id = self.index.keys.get(f"{site}/{job_id}")
+        return self.index.get(doc_id) if doc_id is not None else None
+
+    def stats(self, site=None, top=STATS_TOP):
+        counters = {field: Counter() for field in ("site", "location", "industry", "company", "level")}
+        total = 0
+        for doc_id in self.index.keys.values():
+            job = self.index.get(doc_id)
+            if site and job["site"] != site:
+                continue
+            total += 1
+            for field, counter in counters.items():
+                counter[job[field] or "Unknown"] += 1
+        return {"total": total, "built_at": self.index.built_at, "loaded_at": self.loaded_at,
+                **{f"by_{field}": counter.most_common(top) for field, counter in counters.items()}}
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split("/") if part]
+        store = self.server.store
+
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok", "jobs": len(store.index), "generation": store.generation})
+            return
+        # Generation first: a reload makes every older key unreachable even before the clear
+        key = (store.generation, url.path, tuple(sorted(params.items())))
+        entry = store.cache.get(key)
+        if entry is None:
+            try:
+                status, payload = self.route(store, parts, params)
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+            body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            entry = (status, body, '"%s"' % hashlib.sha1(body).hexdigest()[:16])
+            store.cache.put(key, entry)
+            self.cache_status = "MISS"
+        else:
+            self.cache_status = "HIT"
+        status, body, etag = entry
+        if status == 200 and etag in self.headers.get("If-None-Match", ""):
+            self._send(304, b"", etag)
+        else:
+            self._send(status, body, etag)
+
+    def route(self, store, parts, params):
+        """Return (status, payload) for a request path"""
+        if parts in (["search"], ["jobs"]):
+            page = int(params.get("page", 1))
+            per_page = min(int(params.get("per_page", PER_PAGE)), MAX_PER_PAGE)
+            if page < 1 or per_page < 1:
+                raise ValueError("page and per_page must be positive")
+            filters = {field: params.get(field) for field in FILTER_FIELDS}
+            return 200, store.search(params.get("q", ""), params.get("site"), filters, page, per_page)
+        if len(parts) == 3 and parts[0] == "jobs":
+            job = store.get_job(parts[1], parts[2])
+            return (200, job) if job else (404, {"error": f"No job {parts[1]}/{parts[2]}"})
+        if parts == ["stats"]:
+            return 200, store.stats(params.get("site"), int(params.get("top", STATS_TOP)))
+        return 404, {"error": "Unknown endpoint", "endpoints": ["/search", "/jobs", "/jobs/<site>/<job_id>",
+                                                                 "/stats", "/health"]}
+
+    def _send_json(self, status, payload):
+        """Uncached response (health checks, bad requests)"""
+        self.cache_status = "BYPASS"
+        self._send(status, json.dumps(payload, ensure_ascii=False).encode("utf-8"))
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Cache", self.cache_status)
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")  # clients revalidate with If-None-Match
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class QueryServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, store, host="127.0.0.1", port=8080, verbose=False):
+        super().__init__((host, port), QueryHandler)
+        self.store = store
+        self.verbose = verbose
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the job index over HTTP (read-only)")
+    parser.add_argument("--index", default=INDEX_FILENAME)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cache-size", type=int, default=CACHE_SIZE)
+    parser.add_argument("--reload-seconds", type=float, default=RELOAD_SECONDS,
+                        help="check the index file for changes this often (0 to disable)")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.index):
+        print(f"❌ {args.index} not found; build it with `python jobscrape.py index`")
+        return
+    store = JobStore(args.index, args.cache_size)
+    if args.reload_seconds:
+        store.watch(args.reload_seconds)
+    server = QueryServer(store, args.host, args.port, args.verbose)
+    print(f"🚀 Serving {len(store.index)} jobs on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        cache = store.cache
+        print(f"\n🛑 Stopped; cache {cache.hits} hits / {cache.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
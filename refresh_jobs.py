@@ -0,0 +1,288 @@
+"""
+Refresh already-scraped jobs and log only what changed
+
+Keeps per-URL validators (ETag, Last-Modified) and the normalized extracted
+record in a JSON state file. Each refresh re-checks only jobs that
+are still open according to their Closing Date (jobs without one are dropped
+RefreshConfig.MAX_AGE_DAYS after we first saw them), sends conditional
+requests so unchanged pages cost a 304, and falls back to comparing records
+when the site ignores validators. Real changes are appended to a JSONL change
+log with the old and new value of every field that differs.
+
+Only fields the plain-HTTP parser can extract are compared: fields rendered
+by JavaScript (Jobify's Job Requirement) are skipped, a field that had a
+value and comes back empty is logged as removed (new value ""), and columns
+the baseline predates (say, a newly scraped column) are filled in silently. Workinga pages are
+client-rendered, so Workinga is re-checked through its JSON endpoint
+(workinga_api.py) and skipped when no endpoint is configured.
+
+Usage:
+    python refresh_jobs.py camhr --csv CamHr.csv
+    python refresh_jobs.py workinga --state refresh_state.json --changes job_changes.jsonl
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import time
+from datetime import date, datetime
+
+from fetching import create_session, fetch_page
+from job_record import JobRecord
+from sites import get_parser, get_site, is_missing, job_id_from_url, parse_date
+
+
+class RefreshConfig:
+    STATE_FILENAME = "refresh_state.json"
+    CHANGES_FILENAME = "job_changes.jsonl"
+    TIMEOUT = 10
+    DELAY = 0.2  # seconds between requests to the same site
+    MAX_AGE_DAYS = 60  # stop re-checking jobs without a closing date this long after first seeing them
+
+
+# Fields rendered by JavaScript, which a plain-HTTP re-check always sees as missing
+UNEXTRACTED_FIELDS = {"jobify": {"Job Requirement"}}
+
+
+def normalize_record(record):
+    """Collapse whitespace and map every missing-value placeholder to '' (CSV rows or JobRecords)"""
+    if isinstance(record, JobRecord):
+        record = record.to_row()
+    normalized = {}
+    for key, value in record.items():
+        if key is None:
+            continue
+        normalized[key] = "" if is_missing(value) else re.sub(r"\s+", " ", str(value)).strip()
+    return normalized
+
+
+def merge_records(old, new, skip=()):
+    """
+    Fold a freshly extracted record into the baseline
+
+    Fields in `skip` keep the baseline value; fields the baseline lacks are
+    added without counting as a change. A field that had a value and comes
+    back empty was removed from the page and counts as a change to "".
+
+    Returns:
+        (merged, changes): the updated record and {field: {"old": ..., "new": ...}}
+        for every field present in both that differs
+    """
+    merged = dict(old)
+    changes = {}
+    for field in sorted(new):
+        value = new[field]
+        if field in skip:
+            continue
+        if field not in old:
+            if value:
+                merged[field] = value
+            continue
+        if old[field] != value:
+            changes[field] = {"old": old[field], "new": value}
+            merged[field] = value
+    return merged, changes
+
+
+def is_open(record, closing_column, today=None, first_seen=None, max_age_days=RefreshConfig.MAX_AGE_DAYS):
+    """
+    Decide whether a job still needs re-checking
+
+    Jobs with a closing date are open until it passes. Jobs without one (no
+    closing-date column or an unparseable date) are kept for max_age_days
+    after first_seen, since we cannot prove they have closed.
+    """
+    today = today or date.today()
+    closing = parse_date(record.get(closing_column)) if closing_column else None
+    if closing is not None:
+        return closing >= today
+    if not first_seen:
+        return True
+    return (today - date.fromisoformat(first_seen[:10])).days <= max_age_days
+
+
+def load_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_state(path, state):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def read_latest_rows(csv_path, link_column):
+    """Read a scraped CSV keeping only the last row seen for each job URL"""
+    latest = {}
+    with open(csv_path, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            url = (row.get(link_column) or "").strip()
+            if url:
+                latest[url] = row
+    return latest
+
+
+def seed_state(state, site, rows):
+    """
+    Add CSV rows we have never refreshed as the baseline to compare against
+
+    Entries already in the state gain any columns their baseline predates
+    (e.g. camhr's Company URL) from the row, so they never show up as changes.
+    """
+    added = 0
+    for url, row in rows.items():
+        entry = state.get(url)
+        normalized = normalize_record(row)
+        if entry is not None:
+            missing = {key: value for key, value in normalized.items() if key not in entry["record"]}
+            entry["record"].update(missing)
+        else:
+            state[url] = {"site": site, "record": normalized,
+                          "etag": None, "last_modified": None, "checked_at": None,
+                          "first_seen": date.today().isoformat()}
+            added += 1
+    return added
+
+
+def site_fetcher(site):
+    """
+    How to re-check one site over plain HTTP
+
+    Returns:
+        (fetch_url, parse): fetch_url(job_url) is the URL to request and
+        parse(body, job_url) returns the record or None; None if the site
+        can't be re-checked (Workinga without an API endpoint)
+    """
+    if site == "workinga":
+        from workinga_api import load_template, parse_payload
+
+        template = load_template()
+        if not template["url"]:
+            return None
+        return (lambda url: template["url"].format(job_id_from_url(url)),
+                lambda text, url: parse_payload(text, url, template["fields"]))
+    return (lambda url: url), get_parser(site)
+
+
+def check_entry(site, url, entry, session, parse_job_page, config=RefreshConfig, fetch_url=None):
+    """
+    Re-fetch one job with its validators and update its state entry in place
+
+    Args:
+        fetch_url: URL actually requested (an API endpoint), default the job URL
+
+    Returns:
+        (outcome, event): outcome is one of not_modified, unchanged, changed,
+        removed, unparsed or errors; event is the change-log dict or None
+    """
+    result = fetch_page(session, fetch_url or url, entry.get("etag"), entry.get("last_modified"), config.TIMEOUT)
+    now = datetime.now().isoformat(timespec="seconds")
+    outcome, event = "errors", None
+
+    if result["status"] == 304:
+        outcome = "not_modified"
+    elif result["status"] in (404, 410):
+        outcome = "removed"
+        entry["removed"] = True
+        event = {"detected_at": now, "site": site, "url": url, "change": "removed", "fields": {}}
+    elif result["status"] == 200:
+        extracted = parse_job_page(result["html"], url)
+        if extracted is None:
+            # Client-rendered or placeholder page: keep the old record untouched
+            outcome = "unparsed"
+        else:
+            merged, fields = merge_records(entry["record"], normalize_record(extracted),
+                                           UNEXTRACTED_FIELDS.get(site, ()))
+            outcome = "changed" if fields else "unchanged"
+            if fields:
+                event = {"detected_at": now, "site": site, "url": url, "change": "updated", "fields": fields}
+            entry["record"] = merged
+        entry["etag"] = result["etag"]
+        entry["last_modified"] = result["last_modified"]
+    else:
+        print(f"❌ {url}: {result['error'] or 'HTTP ' + str(result['status'])}")
+
+    entry["checked_at"] = now
+    return outcome, event
+
+
+def write_event(changes_file, event):
+    changes_file.write(json.dumps(event, ensure_ascii=False) + "\n")
+    print(f"🔄 {event['change'].title()}: {event['url']} ({', '.join(event['fields']) or 'page gone'})")
+
+
+def refresh_site(site, state, changes_path, session=None, config=RefreshConfig, today=None):
+    """
+    Re-check the open jobs of one site and append real changes to the change log
+
+    Returns:
+        dict: counters for checked, not_modified, unchanged, changed, removed,
+              unparsed, closed_skipped and errors
+    """
+    site_info = get_site(site)
+    stats = dict.fromkeys(["checked", "not_modified", "unchanged", "changed", "removed",
+                           "unparsed", "closed_skipped", "errors"], 0)
+    fetcher = site_fetcher(site)
+    if fetcher is None:
+        print(f"⚠️ {site} pages are client-rendered and no API endpoint is configured "
+              f"(see workinga_api.py); skipping refresh")
+        return stats
+    fetch_url, parse_job_page = fetcher
+    session = session or create_session()
+    today = today or date.today()
+
+    with open(changes_path, "a", encoding="utf-8") as changes_file:
+        for url, entry in state.items():
+            if entry.get("site") != site or entry.get("removed"):
+                continue
+            entry.setdefault("first_seen", today.isoformat())
+            if not is_open(entry["record"], site_info["closing_column"], today, entry["first_seen"],
+                           config.MAX_AGE_DAYS):
+                stats["closed_skipped"] += 1
+                continue
+
+            outcome, event = check_entry(site, url, entry, session, parse_job_page, config, fetch_url(url))
+            stats["checked"] += 1
+            stats[outcome] += 1
+            if event:
+                write_event(changes_file, event)
+
+            time.sleep(config.DELAY)
+
+    return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-check open jobs and log changed fields")
+    parser.add_argument("site", choices=["camhr", "jobify", "workinga"])
+    parser.add_argument("--csv", help="Scraped CSV used to seed jobs not yet in the state file")
+    parser.add_argument("--state", default=RefreshConfig.STATE_FILENAME)
+    parser.add_argument("--changes", default=RefreshConfig.CHANGES_FILENAME)
+    args = parser.parse_args(argv)
+
+    state = load_state(args.state)
+    site_info = get_site(args.site)
+    csv_path = args.csv or site_info["csv"]
+    if os.path.exists(csv_path):
+        added = seed_state(state, args.site, read_latest_rows(csv_path, site_info["link_column"]))
+        print(f"📁 Seeded {added} new jobs from {csv_path}")
+
+    start = time.time()
+    try:
+        stats = refresh_site(args.site, state, args.changes)
+    finally:
+        save_state(args.state, state)
+
+    print(f"\n✅ Refresh of {args.site} done in {time.time() - start:.1f}s")
+    for name, count in stats.items():
+        print(f"   {name}: {count}")
+    print(f"💾 Changes appended to {args.changes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+"""
+Saved-search alerts, matched against each new job as it is scraped
+
+Re-running every saved search over the whole dataset after each crawl costs
+searches x jobs. This works the other way round (a percolator): the saved
+searches are indexed, and each new job is matched only against the searches
+that could possibly match it.
+
+A saved search is a dict:
+
+    {"id": "s1", "user": "dara", "query": "python developer", "site": "camhr",
+     "location": "phnom penh", "industry": "", "level": "", "company": "",
+     "min_salary": 1000, "max_salary": null}
+
+Every word of `query` must appear in the job's indexed fields (the same
+words as job_index.py), every word of a facet (location, industry, level,
+company) must appear in that field, and the salary (USD/month, parsed as in
+market_analytics.py) must fall inside the bounds. Jobs without a parseable
+salary don't match salary-bounded searches.
+
+Each search is filed under one key it requires: the rarest of its query and
+facet words ("python", "location:battambang"; document frequencies come
+from the job index when available), else its site. Searches with no words
+at all match every job and are checked for every job. A job collects the
+searches filed under its own words, and only those are checked in full. The
+cost per job follows the job's word count and the few candidates it pulls
+in, not the number of saved searches.
+
+Matches are appended to an outbox (JSONL, one alert per search and job,
+never repeated) and optionally POSTed to a webhook.
+
+Usage:
+    python saved_searches.py add --user dara --query python --location "phnom penh" --min-salary 1000
+    python saved_searches.py list
+    python saved_searches.py run --csv camhr=New_Data_cam_4.csv      # alert on a freshly scraped CSV
+    python pipeline.py camhr --discover --alerts saved_searches.json  # alert while crawling
+"""
+import argparse
+import json
+import os
+from datetime import datetime
+
+from job_index import INDEX_FILENAME, INDEXED_FIELDS, tokenize
+from market_analytics import parse_salary
+from sites import SITES
+
+
+class AlertConfig:
+    SEARCHES_FILENAME = "saved_searches.json"
+    OUTBOX_FILENAME = "alerts_outbox.jsonl"
+    WEBHOOK_TIMEOUT = 5
+
+
+# Fields a saved search can require words from (besides the free-text query)
+FACETS = ("location", "industry", "level", "company")
+
+
+def load_searches(path=AlertConfig.SEARCHES_FILENAME):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["searches"]
+
+
+def save_searches(searches, path=AlertConfig.SEARCHES_FILENAME):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"searches": searches}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def compile_search(search):
+    """Word sets and bounds used for matching a saved search"""
+    return {
+        "id": search["id"],
+        "terms": frozenset(tokenize(search.get("query"))),
+        "facets": {field: frozenset(tokenize(search.get(field))) for field in FACETS if tokenize(search.get(field))},
+        "site": search.get("site") or None,
+        "min_salary": search.get("min_salary"),
+        "max_salary": search.get("max_salary"),
+    }
+
+
+class Percolator:
+    """Saved searches indexed by one required key each; matches jobs against candidate searches only"""
+
+    def __init__(self, searches=(), doc_freq=None):
+        """
+        Args:
+            searches: saved search dicts
+            doc_freq: word -> number of jobs containing it, used to file each
+                      search under its rarest word (default: longest word)
+        """
+        self.doc_freq = doc_freq or {}
+        self.searches = {}      # id -> compiled search
+        self.anchors = {}       # key -> set of search ids
+        self.match_all = set()  # searches with nothing to file them under
+        for search in searches:
+            self.add(search)
+
+    def __len__(self):
+        return len(self.searches)
+
+    def _anchor(self, compiled):
+        """The rarest required word: a query word or a facet word ("location:penh"), else the site"""
+        keys = [(word, word) for word in compiled["terms"]]
+        keys += [(f"{field}:{word}", word) for field, words in compiled["facets"].items() for word in words]
+        if keys:
+            return min(keys, key=lambda item: (self.doc_freq.get(item[1], 0), -len(item[1]), item[0]))[0]
+        if compiled["site"]:
+            return f"site:{compiled['site']}"
+        return None
+
+    def add(self, search):
+        self.remove(search["id"])
+        compiled = compile_search(search)
+        compiled["anchor"] = self._anchor(compiled)
+        self.searches[compiled["id"]] = compiled
+        if compiled["anchor"] is None:
+            self.match_all.add(compiled["id"])
+        else:
+            self.anchors.setdefault(compiled["anchor"], set()).add(compiled["id"])
+
+    def remove(self, search_id):
+        compiled = self.searches.pop(search_id, None)
+        if compiled is None:
+            return
+        if compiled["anchor"] is None:
+            self.match_all.discard(search_id)
+        else:
+            self.anchors[compiled["anchor"]].discard(search_id)
+
+    def candidates(self, words, facet_words, site):
+        """Ids of searches filed under any key the job has"""
+        candidates = set(self.match_all)
+        anchors = self.anchors
+        for word in words:
+            if word in anchors:
+                candidates.update(anchors[word])
+        for field, field_words in facet_words.items():
+            for word in field_words:
+                key = f"{field}:{word}"
+                if key in anchors:
+                    candidates.update(anchors[key])
+        candidates.update(anchors.get(f"site:{site}", ()))
+        return candidates
+
+    def match(self, record):
+        """Ids of the saved searches a job (JobRecord or canonical dict) matches"""
+        words = set()
+        for field in INDEXED_FIELDS:
+            words.update(tokenize(record.get(field)))
+        facet_words = {field: frozenset(tokenize(record.get(field))) for field in FACETS}
+        site = record.get("site")
+        salary = None
+        matched = []
+        for search_id in self.candidates(words, facet_words, site):
+            search = self.searches[search_id]
+            if search["site"] and search["site"] != site:
+                continue
+            if not search["terms"] <= words:
+                continue
+            if any(not required <= facet_words[field] for field, required in search["facets"].items()):
+                continue
+            if search["min_salary"] is not None or search["max_salary"] is not None:
+                if salary is None:
+                    salary = parse_salary(record.get("salary")) or -1.0
+                if salary < 0 or salary < (search["min_salary"] or 0) \
+                        or (search["max_salary"] is not None and salary > search["max_salary"]):
+                    continue
+            matched.append(search_id)
+        return matched
+
+
+def doc_freq_from_index(path=INDEX_FILENAME):
+    """Word -> job count from a saved job index, or {} if there is none"""
+    if not os.path.exists(path):
+        return {}
+    from job_index import JobIndex
+
+    return {word: len(postings) for word, postings in JobIndex.load(path).postings.items()}
+
+
+class AlertOutbox:
+    """Append-only JSONL of alerts (one per search and job), optionally POSTed to a webhook"""
+
+    def __init__(self, path=AlertConfig.OUTBOX_FILENAME, webhook=None):
+        self.path = path
+        self.webhook = webhook
+        self.sent = set()
+        self.session = None
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    alert = json.loads(line)
+                    self.sent.add((alert["search_id"], alert["site"], alert["job_id"]))
+
+    def send(self, search, record):
+        """Record an alert unless this search already alerted on this job; returns True if new"""
+        key = (search["id"], record.get("site"), record.get("job_id"))
+        if key in self.sent:
+            return False
+        self.sent.add(key)
+        alert = {"search_id": search["id"], "user": search.get("user"), "site": record.get("site"),
+                 "job_id": record.get("job_id"), "title": record.get("title"), "company": record.get("company"),
+                 "location": record.get("location"), "salary": record.get("salary"), "url": record.get("url"),
+                 "matched_at": datetime.now().isoformat(timespec="seconds")}
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(alert, ensure_ascii=False) + "\n")
+        if self.webhook:
+            self._post(alert)
+        return True
+
+    def _post(self, alert):
+        import requests
+
+        if self.session is None:
+            self.session = requests.Session()
+        try:
+            self.session.post(self.webhook, json=alert, timeout=AlertConfig.WEBHOOK_TIMEOUT).raise_for_status()
+        except requests.RequestException as e:
+            # The outbox line is already written; a webhook outage loses nothing
+            print(f"⚠️ Webhook failed for {alert['search_id']} / {alert['site']} {alert['job_id']}: {e}")
+
+
+class AlertEngine:
+    """Percolator over the saved searches file plus the outbox"""
+
+    def __init__(self, searches_path=AlertConfig.SEARCHES_FILENAME, outbox_path=AlertConfig.OUTBOX_FILENAME,
+                 webhook=None, index_path=INDEX_FILENAME):
+        self.searches = {search["id"]: search for search in load_searches(searches_path)}
+        self.percolator = Percolator(self.searches.values(), doc_freq_from_index(index_path))
+        self.outbox = AlertOutbox(outbox_path, webhook)
+        self.stats = {"jobs": 0, "matches": 0, "alerts": 0}
+
+    def process(self, record):
+        """Match one new job and send alerts; returns the number of new alerts"""
+        self.stats["jobs"] += 1
+        sent = 0
+        for search_id in self.percolator.match(record):
+            self.stats["matches"] += 1
+            if self.outbox.send(self.searches[search_id], record):
+                sent += 1
+        self.stats["alerts"] += sent
+        return sent
+
+
+def next_search_id(searches):
+    numbers = [int(search["id"][1:]) for search in searches if search["id"][1:].isdigit()]
+    return f"s{max(numbers, default=0) + 1}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Saved-search alerts matched against newly scraped jobs")
+    parser.add_argument("--searches", default=AlertConfig.SEARCHES_FILENAME)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = subparsers.add_parser("add", help="save a search")
+    add_parser.add_argument("--id", help="default: next s<n>")
+    add_parser.add_argument("--user")
+    add_parser.add_argument("--query", help="words that must all appear in the job")
+    add_parser.add_argument("--site", choices=list(SITES))
+    for field in FACETS:
+        add_parser.add_argument(f"--{field}", help=f"words that must all appear in the job {field}")
+    add_parser.add_argument("--min-salary", type=float, help="USD per month")
+    add_parser.add_argument("--max-salary", type=float, help="USD per month")
+
+    subparsers.add_parser("list", help="show saved searches")
+
+    remove_parser = subparsers.add_parser("remove", help="delete saved searches")
+    remove_parser.add_argument("ids", nargs="+")
+
+    run_parser = subparsers.add_parser("run", help="match jobs from scraped CSVs and send alerts")
+    run_parser.add_argument("--csv", nargs="+", metavar="SITE=PATH", required=True)
+    run_parser.add_argument("--outbox", default=AlertConfig.OUTBOX_FILENAME)
+    run_parser.add_argument("--webhook", help="also POST each alert as JSON to this URL")
+    run_parser.add_argument("--index", default=INDEX_FILENAME, help="job index for word frequencies")
+    args = parser.parse_args(argv)
+
+    searches = load_searches(args.searches)
+    if args.command == "add":
+        search = {"id": args.id or next_search_id(searches), "user": args.user, "query": args.query or "",
+                  "site": args.site, **{field: getattr(args, field) or "" for field in FACETS},
+                  "min_salary": args.min_salary, "max_salary": args.max_salary}
+        searches = [existing for existing in searches if existing["id"] != search["id"]] + [search]
+        save_searches(searches, args.searches)
+        print(f"💾 Saved search {search['id']} ({len(searches)} in {args.searches})")
+    elif args.command == "list":
+        for search in searches:
+            conditions = [f"{field}={search[field]!r}" for field in ("query", "site", *FACETS) if search.get(field)]
+            conditions += [f"{bound}={search[bound]:g}" for bound in ("min_salary", "max_salary")
+                           if search.get(bound) is not None]
+            print(f"{search['id']:6} {search.get('user') or '-':12} {' '.join(conditions) or '(all jobs)'}")
+        print(f"🔔 {len(searches)} saved search(es)")
+    elif args.command == "remove":
+        remaining = [search for search in searches if search["id"] not in args.ids]
+        save_searches(remaining, args.searches)
+        print(f"🗑️ Removed {len(searches) - len(remaining)} search(es)")
+    else:
+        from job_record import read_records
+
+        engine = AlertEngine(args.searches, args.outbox, args.webhook, args.index)
+        for site, path in (item.split("=", 1) for item in args.csv):
+            for record in read_records(site, path):
+                engine.process(record)
+        stats = engine.stats
+        print(f"🔔 {stats['jobs']} jobs against {len(engine.percolator)} searches: {stats['matches']} matches, "
+              f"{stats['alerts']} new alerts in {args.outbox}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Configuration loading for the jobscrape command line
+
+Settings come from three layers, later ones winning:
+    1. a JSON file (--config, $JOBSCRAPE_CONFIG or ./jobscrape.json)
+    2. environment variables JOBSCRAPE_<KEY> or JOBSCRAPE_<SECTION>_<KEY>
+    3. command-line flags
+
+Example jobscrape.json:
+    {
+        "chromedriver": "C:/tools/chromedriver.exe",
+        "camhr": {"start_id": 10611925, "end_id": 10613636, "output": "New_Data_cam_4.csv"},
+        "workinga": {"delay": 0.2}
+    }
+
+Values are applied onto the scrapers' config classes (CamHRConfig,
+JobifyConfig, ScraperConfig) by attribute name, so "wait_timeout" sets
+WAIT_TIMEOUT and keeps that attribute's type.
+"""
+import json
+import os
+
+DEFAULT_CONFIG_FILE = "jobscrape.json"
+ENV_PREFIX = "JOBSCRAPE_"
+SECTIONS = ("camhr", "jobify", "workinga", "index", "refresh")
+
+# Setting names that map to differently named config attributes
+ATTRIBUTE_ALIASES = {
+    "output": ("CSV_FILENAME", "OUTPUT_FILENAME"),
+    "chromedriver": ("CHROME_DRIVER_PATH",),
+}
+
+
+def load_settings(config_path=None):
+    """Merge the config file and JOBSCRAPE_* environment variables into one dict"""
+    settings = {}
+    config_path = config_path or os.environ.get(ENV_PREFIX + "CONFIG")
+    if config_path or os.path.exists(DEFAULT_CONFIG_FILE):
+        with open(config_path or DEFAULT_CONFIG_FILE, "r", encoding="utf-8") as f:
+            settings = json.load(f)
+
+    for name, value in os.environ.items():
+        if not name.startswith(ENV_PREFIX) or name == ENV_PREFIX + "CONFIG":
+            continue
+        key = name[len(ENV_PREFIX):].lower()
+        section = next((s for s in SECTIONS if key.startswith(s + "_")), None)
+        if section:
+            settings.setdefault(section, {})[key[len(section) + 1:]] = value
+        else:
+            settings[key] = value
+    return settings
+
+
+def section_settings(settings, section, **flags):
+    """Settings for one section: globals, then the section, then non-None flags"""
+    merged = {key: value for key, value in settings.items() if not isinstance(value, dict)}
+    merged.update(settings.get(section, {}))
+    merged.update({key: value for key, value in flags.items() if value is not None})
+    return merged
+
+
+def _coerce(value, current):
+    """Convert a string (env var or flag) to the type of the attribute's default"""
+    if current is None or not isinstance(value, str):
+        return value
+    if isinstance(current, bool):
+        return value.lower() in ("1", "true", "yes", "on")
+    if isinstance(current, (list, tuple)):
+        # "camhr, jobify" -> ["camhr", "jobify"], items typed like the default's (JOB_IDS are ints)
+        items = [item.strip() for item in value.split(",") if item.strip()]
+        if current:
+            items = [_coerce(item, current[0]) for item in items]
+        return type(current)(items)
+    return type(current)(value)
+
+
+def apply_settings(config, values):
+    """Return an instance of `config` with matching attributes overridden"""
+    instance = config() if isinstance(config, type) else config
+    for key, value in values.items():
+        for attribute in ATTRIBUTE_ALIASES.get(key, (key.upper(),)):
+            if hasattr(instance, attribute):
+                setattr(instance, attribute, _coerce(value, getattr(instance, attribute)))
+    return instance
@@ -0,0 +1,138 @@
+"""
+Registry of the job sites handled by this project
+
+Maps each site name to the scraper module holding its page parser, its job
+URL template (<SITE>_BASE_URL overrides it, e.g. to point every tool at the
+replay server), the CSV columns that identify a job (link) and tell whether
+it is still open (closing date), and how every CSV column maps onto the
+canonical fields. Shared by the refresh, pipeline and tooling scripts and
+by the scrapers' own configs.
+"""
+import importlib
+import os
+import re
+from datetime import datetime
+
+SITES = {
+    "camhr": {
+        "module": "camhr",
+        "base_url": os.environ.get("CAMHR_BASE_URL", "https://www.camhr.com/a/job/{}"),
+        "job_path": "/a/job/{}",  # job page path on the site itself, wherever base_url points
+        "csv": "CamHr.csv",
+        "link_column": "Link URL",
+        "closing_column": "Closing Date",
+        "placeholder": "Not found",  # written to the CSV for missing fields
+        # in the scraper's CSV column order
+        "fields": {
+            "title": "Job Title", "company": "Company Name", "level": "Level", "experience": "Year of Exp.",
+            "openings": "Hiring", "salary": "Salary", "gender": "Sex", "age": "Age", "term": "Term",
+            "function": "Function", "industry": "Industry", "qualification": "Qualification",
+            "language": "Language", "location": "Location", "requirements": "Job Requirements",
+            "publish_date": "Publish Date", "closing_date": "Closing Date", "url": "Link URL",
+            "company_url": "Company URL",
+        },
+    },
+    "jobify": {
+        "module": "Jobify",
+        "base_url": os.environ.get("JOBIFY_BASE_URL", "https://jobify.works/jobs/{}"),
+        "job_path": "/jobs/{}",
+        "csv": "Jobify.csv",
+        "link_column": "Job Link",
+        "closing_column": None,  # Jobify pages do not show a closing date
+        "placeholder": "N/A",
+        "fields": {
+            "title": "Job Title", "url": "Job Link", "salary": "Salary", "term": "Job Type", "level": "Job Level",
+            "gender": "Gender", "age": "Age", "experience": "Years of Experience", "language": "Language",
+            "function": "Category", "industry": "Industry", "location": "Location",
+            "qualification": "Qualification", "openings": "Available Position", "skills": "Required Skills",
+            "requirements": "Job Requirement",
+        },
+    },
+    "workinga": {
+        "module": "Workinga",
+        "base_url": os.environ.get("WORKINGA_BASE_URL", "https://workingna.com/job/{}"),
+        "job_path": "/job/{}",
+        "csv": "Workinga.csv",
+        "link_column": "Link",
+        "closing_column": "Closing Date",
+        "placeholder": "Not specified",
+        "fields": {
+            "title": "Job Title", "company": "Company Name", "salary": "Salary", "openings": "Available",
+            "office": "Office", "location": "Location", "term": "Employment Type", "closing_date": "Closing Date",
+            "responsibilities": "Job Responsibilities", "requirements": "Job Requirements", "url": "Link",
+        },
+    },
+}
+
+# Site-independent field names used by the index, pipeline and analytics
+CANONICAL_FIELDS = [
+    "site", "job_id", "title", "company", "location", "level", "term", "industry", "function",
+    "salary", "experience", "publish_date", "closing_date", "requirements", "responsibilities",
+    "skills", "url", "company_url", "openings", "gender", "age", "qualification", "language", "office",
+]
+
+# Date layouts seen in Publish/Closing Date columns across the three sites
+DATE_FORMATS = [
+    "%b-%d-%Y", "%d-%b-%Y", "%Y-%m-%d", "%d/%m/%Y", "%m/%d/%Y", "%d-%m-%Y",
+    "%b %d, %Y", "%B %d, %Y", "%d %b %Y", "%d %B %Y", "%b %d %Y", "%B %d %Y",
+]
+
+# Placeholder strings the scrapers write for missing fields
+MISSING_VALUES = {"", "not found", "n/a", "na", "not specified", "nan", "none", "null"}
+
+
+def get_site(name):
+    try:
+        return SITES[name]
+    except KeyError:
+        raise ValueError(f"Unknown site '{name}'. Choose from: {', '.join(SITES)}")
+
+
+def get_parser(name):
+    """Return the site's parse_job_page(html, url, parser) function"""
+    return importlib.import_module(get_site(name)["module"]).parse_job_page
+
+
+def is_missing(value):
+    return value is None or str(value).strip().lower() in MISSING_VALUES
+
+
+def read_csv_header(path):
+    """Column names of an existing CSV, or None if the file is missing or empty"""
+    import csv
+
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8-sig", errors="replace", newline="") as f:
+        return next(csv.reader(f), None)
+
+
+def job_id_from_url(url):
+    return str(url).rstrip("/").split("/")[-1]
+
+
+def to_canonical(site, row):
+    """Map a scraped CSV row onto CANONICAL_FIELDS, with None for anything missing"""
+    fields = get_site(site)["fields"]
+    record = dict.fromkeys(CANONICAL_FIELDS)
+    for name, column in fields.items():
+        value = row.get(column)
+        if not is_missing(value):
+            record[name] = re.sub(r"[ \t]+", " ", str(value)).strip()
+    record["site"] = site
+    if record["url"]:
+        record["job_id"] = job_id_from_url(record["url"])
+    return record
+
+
+def parse_date(text):
+    """Parse a scraped date string into a date, or None if it is missing/unknown"""
+    if is_missing(text):
+        return None
+    text = re.sub(r"\s+", " ", str(text).strip().rstrip("."))
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
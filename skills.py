@@ -0,0 +1,464 @@
+"""
+Skill extraction and a sparse job x skill matrix for candidate matching
+
+Jobify lists skills in its Required Skills column; the other sites only
+mention them in requirement and responsibility text. A dictionary of skills
+and their aliases is compiled into a word trie, and each posting's text is
+scanned once (longest match at each word) to get its skill IDs.
+
+The postings then become rows of a CSR matrix (jobs x skills, IDF-weighted,
+rows normalized). Scoring a CV is one sparse matrix-vector product giving the
+cosine similarity of every job's skills to the CV's, so rare skills count for
+more than "English" or "Communication". The same matrix gives top skills
+(column counts) and co-occurrence (one column product).
+
+Usage:
+    python skills.py build                                 # site CSVs -> skill_matrix.npz
+    python skills.py match --skills "Python, SQL, AWS, English"
+    python skills.py match --cv my_cv.txt --top 20
+    python skills.py top --site camhr
+    python skills.py cooccur Python
+    python -m doctest skills.py                            # alias matching checks
+"""
+import argparse
+import json
+import os
+import re
+import time
+
+from job_record import drop_journal, read_journal
+from sites import SITES
+
+MATRIX_FILENAME = "skill_matrix.npz"
+
+# Skill name -> aliases as written in postings (matched on whole words, case-insensitive). Only the
+# aliases are matched in free text, so ambiguous names ("Go", "Swift", "Cloud", "Driving") are left out;
+# names are still matched exactly as items of a skill list (Jobify's Required Skills, match --skills)
+SKILLS = {
+    # Programming and frameworks
+    "Python": ["python", "python3", "django", "flask", "fastapi"],
+    "Java": ["java", "spring boot", "spring framework"],
+    "JavaScript": ["javascript", "js", "ecmascript"],
+    "TypeScript": ["typescript"],
+    "PHP": ["php", "laravel", "codeigniter"],
+    "C#": ["c#", ".net", "asp.net", "dotnet"],
+    "C++": ["c++", "cpp"],
+    "Go": ["golang"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swiftui", "swift programming"],  # plain "SWIFT" is usually the bank transfer network
+    "Dart": ["dart"],
+    "Flutter": ["flutter"],
+    "React": ["react", "reactjs", "react.js", "react native"],
+    "Angular": ["angular", "angularjs"],
+    "Vue": ["vue", "vuejs", "vue.js", "nuxt"],
+    "Node.js": ["node.js", "nodejs", "express.js", "expressjs"],
+    "HTML/CSS": ["html", "html5", "css", "css3", "bootstrap", "tailwind"],
+    "Android": ["android"],
+    "iOS": ["ios"],
+    "REST APIs": ["rest api", "rest apis", "restful", "restful api", "api development"],
+    "Git": ["git", "github", "gitlab", "version control"],
+    # Data
+    "SQL": ["sql", "t-sql", "pl/sql", "mysql", "postgresql", "postgres", "sql server", "oracle database"],
+    "NoSQL": ["nosql", "mongodb", "redis", "cassandra"],
+    "Data Analysis": ["data analysis", "data analytics", "data analyst"],
+    "Machine Learning": ["machine learning", "deep learning", "ml", "tensorflow", "pytorch", "scikit-learn"],
+    "Power BI": ["power bi", "powerbi"],
+    "Tableau": ["tableau"],
+    "Statistics": ["statistics", "statistical analysis", "spss", "stata"],
+    # Infrastructure
+    "Linux": ["linux", "ubuntu", "centos", "red hat", "unix"],
+    "Windows Server": ["windows server", "active directory"],
+    "Networking": ["networking", "network administration", "tcp/ip", "lan", "wan", "routing", "switching",
+                   "ccna", "ccnp", "cisco", "mikrotik"],
+    "Cloud": ["cloud computing", "cloud services"],
+    "AWS": ["aws", "amazon web services", "ec2"],
+    "Azure": ["azure", "microsoft azure"],
+    "GCP": ["gcp", "google cloud"],
+    "Docker": ["docker"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "DevOps": ["devops", "ci/cd", "jenkins", "ansible", "terraform"],
+    "Cybersecurity": ["cybersecurity", "cyber security", "information security", "network security", "firewall",
+                      "penetration testing"],
+    "IT Support": ["it support", "helpdesk", "help desk", "technical support", "desktop support", "troubleshooting"],
+    "Testing/QA": ["software testing", "quality assurance", "qa", "unit testing", "test automation", "selenium"],
+    # Office and business
+    "Microsoft Office": ["microsoft office", "ms office", "office 365", "microsoft 365", "ms word", "microsoft word",
+                         "powerpoint"],
+    "Excel": ["excel", "ms excel", "microsoft excel", "spreadsheets"],
+    "Accounting": ["accounting", "bookkeeping", "general ledger", "accounts payable", "accounts receivable"],
+    "Financial Analysis": ["financial analysis", "financial reporting", "budgeting", "forecasting"],
+    "QuickBooks": ["quickbooks"],
+    "Auditing": ["audit", "auditing", "internal audit"],
+    "Taxation": ["tax", "taxation"],
+    "Sales": ["selling", "business development", "sales experience", "sales skills", "sales target",
+              "sales targets", "b2b sales", "direct sales", "sales management"],
+    "Marketing": ["marketing", "digital marketing", "social media marketing", "seo", "content marketing"],
+    "Customer Service": ["customer service", "customer care", "customer support", "client service"],
+    "Project Management": ["project management", "pmp", "agile", "scrum", "kanban"],
+    "Human Resources": ["human resources", "recruitment", "payroll", "talent acquisition"],
+    "Procurement": ["procurement", "purchasing", "supply chain", "logistics", "inventory management"],
+    "Graphic Design": ["graphic design", "photoshop", "illustrator", "adobe creative suite", "canva", "figma"],
+    "UI/UX": ["ui/ux", "ux", "ui design", "user experience", "user interface design"],
+    # Languages
+    "English": ["english"],
+    "Khmer": ["khmer"],
+    "Chinese": ["chinese", "mandarin"],
+    "Korean": ["korean"],
+    "Japanese": ["japanese"],
+    "Thai": ["thai"],
+    "Vietnamese": ["vietnamese"],
+    "French": ["french"],
+    # Soft skills
+    "Communication": ["communication", "communication skills", "interpersonal skills", "interpersonal"],
+    "Leadership": ["leadership", "team leadership", "people management"],
+    "Teamwork": ["teamwork", "team player", "team work"],
+    "Problem Solving": ["problem solving", "problem-solving", "analytical skills", "critical thinking"],
+    "Time Management": ["time management", "multitasking", "multi-tasking", "work under pressure"],
+    "Negotiation": ["negotiation", "negotiating"],
+    "Driving": ["driving license", "driving licence", "driver license", "driver's license"],
+}
+
+# Canonical fields scanned for skills (Jobify's skills column first)
+SKILL_FIELDS = ("skills", "title", "requirements", "responsibilities")
+
+TOKEN_PATTERN = re.compile(r"\.?[a-z0-9][a-z0-9+#.']*")
+
+
+def tokenize(text):
+    """Lowercase words keeping c++, c#, .net and node.js; "/" and "-" split words ("English/Khmer", "ci/cd")"""
+    return [token.rstrip(".'") for token in TOKEN_PATTERN.findall(text.lower())] if text else []
+
+
+class SkillExtractor:
+    """
+    Skill dictionary compiled into a word trie
+
+    >>> extractor = SkillExtractor()
+    >>> cv_skills("Go the extra mile. SWIFT transfers. Driving sales growth in the cloud.", extractor)
+    []
+    >>> cv_skills("Golang and SwiftUI, cloud computing, sales targets, driving license", extractor)
+    ['Go', 'Swift', 'Cloud', 'Sales', 'Driving']
+    >>> [extractor.names[i] for i in extractor.extract_list("Go, Sales, team player")]
+    ['Go', 'Sales', 'Teamwork']
+    """
+
+    def __init__(self, skills=None):
+        skills = SKILLS if skills is None else skills
+        self.names = list(skills)
+        self.name_ids = {name.lower(): skill_id for skill_id, name in enumerate(self.names)}
+        self.trie = {}
+        for skill_id, aliases in enumerate(skills.values()):
+            for alias in aliases:
+                self._insert(alias, skill_id)
+
+    def _insert(self, alias, skill_id):
+        tokens = tokenize(alias)
+        if not tokens:
+            return
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[None] = skill_id  # None marks the end of an alias
+
+    def extract(self, text):
+        """Sorted skill IDs mentioned in text (longest alias wins at each word)"""
+        return sorted(self.scan(tokenize(text)))
+
+    def extract_list(self, text):
+        """Sorted skill IDs of a comma separated skill list: items naming a skill exactly, plus aliases in the rest"""
+        return sorted(self.scan_list(text))
+
+    def scan_list(self, text):
+        found, tokens = set(), []
+        for item in re.split(r"[,;\n]", text or ""):
+            skill_id = self.name_ids.get(item.strip().lower())
+            if skill_id is not None:
+                found.add(skill_id)
+            else:
+                tokens.extend(tokenize(item))
+                tokens.append("|")
+        return found | self.scan(tokens)
+
+    def scan(self, tokens):
+        found = set()
+        trie = self.trie
+        position, count = 0, len(tokens)
+        while position < count:
+            node, end, match = trie, position, None
+            while end < count and tokens[end] in node:
+                node = node[tokens[end]]
+                end += 1
+                if None in node:
+                    match = (node[None], end)
+            if match:
+                found.add(match[0])
+                position = match[1]
+            else:
+                position += 1
+        return found
+
+    def extract_record(self, record):
+        """Skill IDs of a canonical record (dict or JobRecord)"""
+        found = self.scan_list(record.get("skills"))  # Jobify's Required Skills is a list of names
+        tokens = []
+        for field in SKILL_FIELDS[1:]:
+            text = record.get(field)
+            if text:
+                tokens.extend(tokenize(text))
+                tokens.append("|")  # no alias spans two fields
+        return sorted(found | self.scan(tokens))
+
+
+class SkillMatrix:
+    """
+    Job x skill matrix
+
+    Rows are added per job (a re-scraped job replaces its row); the CSR
+    matrix is built on first use after a change.
+    """
+
+    def __init__(self, skill_names=None):
+        self.skill_names = list(skill_names or SKILLS)
+        self.skill_ids = {name.lower(): skill_id for skill_id, name in enumerate(self.skill_names)}
+        self.rows = {}     # "site/job_id" -> (job info dict, skill ID tuple)
+        self._csr = None
+        self._row_keys = None
+        self._row_sites = None
+        self._idf = None
+        self.built_at = None
+
+    def __len__(self):
+        return len(self.rows)
+
+    def add(self, record, skill_ids):
+        key = f"{record['site']}/{record.get('job_id') or record.get('url')}"
+        info = {field: record.get(field) for field in ("site", "job_id", "title", "company", "location", "url")}
+        self.rows[key] = (info, tuple(skill_ids))
+        self._csr = None
+
+    @property
+    def csr(self):
+        """scipy.sparse.csr_matrix (jobs x skills) of IDF weights, each row scaled to unit length"""
+        if self._csr is None:
+            import numpy as np
+            from scipy.sparse import csr_matrix
+
+            self._row_keys = list(self.rows)
+            self._row_sites = np.array([info["site"] for info, _ in self.rows.values()])
+            indptr = np.zeros(len(self._row_keys) + 1, dtype=np.int64)
+            indptr[1:] = np.cumsum([len(skill_ids) for _, skill_ids in self.rows.values()])
+            indices = np.fromiter((skill_id for _, skill_ids in self.rows.values() for skill_id in skill_ids),
+                                  dtype=np.int32, count=int(indptr[-1]))
+            counts = np.bincount(indices, minlength=len(self.skill_names))
+            # Rare skills say more about a job than "English" or "Communication"
+            self._idf = np.log((1 + len(self._row_keys)) / (1 + counts)).astype(np.float32) + 1
+            matrix = csr_matrix((self._idf[indices], indices, indptr),
+                                shape=(len(self._row_keys), len(self.skill_names)))
+            norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            matrix.data /= np.repeat(norms, np.diff(indptr)).astype(np.float32)
+            self._csr = matrix
+        return self._csr
+
+    def skill_vector(self, skills):
+        """0/1 vector over the skill dictionary for a list of skill names; unknown names are ignored"""
+        import numpy as np
+
+        vector = np.zeros(len(self.skill_names), dtype=np.float32)
+        for name in skills:
+            skill_id = self.skill_ids.get(name.strip().lower())
+            if skill_id is not None:
+                vector[skill_id] = 1
+        return vector
+
+    def match(self, skills, top=20, min_score=0.0, site=None):
+        """
+        Score every job against a CV's skills with one sparse product
+
+        Args:
+            skills: skill names from the dictionary (see cv_skills for free text)
+            top: number of results
+            min_score: drop jobs with a lower cosine similarity
+            site: only rank jobs of this site
+
+        Returns:
+            list of job info dicts with "score" (cosine similarity, 0..1), "coverage" (share of the
+            job's skill weight the CV has), "matched" and "missing" skill names, best first
+        """
+        import numpy as np
+
+        matrix = self.csr
+        cv = self.skill_vector(skills) * self._idf
+        cv_norm = np.linalg.norm(cv)
+        if not cv_norm:
+            return []
+        scores = matrix @ (cv / cv_norm)
+        if site:
+            scores[self._row_sites != site] = 0
+        candidates = np.flatnonzero(scores > max(min_score, 0))
+        if len(candidates) > top:
+            candidates = candidates[np.argpartition(-scores[candidates], top - 1)[:top]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        wanted = {self.skill_ids[name.strip().lower()] for name in skills if name.strip().lower() in self.skill_ids}
+        results = []
+        for row in candidates:
+            info, skill_ids = self.rows[self._row_keys[row]]
+            coverage = sum(self._idf[i] for i in skill_ids if i in wanted) / sum(self._idf[i] for i in skill_ids)
+            results.append(dict(info, score=round(float(scores[row]), 3), coverage=round(float(coverage), 3),
+                                matched=[self.skill_names[i] for i in skill_ids if i in wanted],
+                                missing=[self.skill_names[i] for i in skill_ids if i not in wanted]))
+        return results
+
+    def top_skills(self, limit=20, site=None):
+        """[(skill, number of jobs)] most in demand, optionally for one site"""
+        import numpy as np
+
+        matrix = self.csr
+        if site:
+            matrix = matrix[self._row_sites == site]
+        counts = np.diff(matrix.tocsc().indptr)
+        order = np.argsort(-counts, kind="stable")[:limit]
+        return [(self.skill_names[i], int(counts[i])) for i in order if counts[i]]
+
+    def job_count(self, skill):
+        """Number of jobs requesting a skill"""
+        skill_id = self.skill_ids.get(skill.strip().lower())
+        return 0 if skill_id is None else int(self.csr[:, skill_id].nnz)
+
+    def cooccurrence(self, skill, limit=10):
+        """[(skill, jobs mentioning both)] for the skills that appear most often alongside `skill`"""
+        import numpy as np
+
+        skill_id = self.skill_ids.get(skill.strip().lower())
+        if skill_id is None:
+            raise ValueError(f"Unknown skill '{skill}'")
+        binary = self.csr.astype(bool).astype(np.int32)
+        counts = (binary.T @ binary[:, skill_id]).toarray().ravel()
+        counts[skill_id] = 0
+        order = np.argsort(-counts, kind="stable")[:limit]
+        return [(self.skill_names[i], int(counts[i])) for i in order if counts[i]]
+
+    def save(self, path=MATRIX_FILENAME):
+        import numpy as np
+
+        matrix = self.csr
+        jobs = [self.rows[key][0] for key in self._row_keys]
+        meta = {"skills": self.skill_names, "keys": self._row_keys, "jobs": jobs, "built_at": self.built_at}
+        tmp_path = path + ".tmp.npz"
+        np.savez_compressed(tmp_path, indptr=matrix.indptr, indices=matrix.indices,
+                            meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode("utf-8"), dtype=np.uint8))
+        os.replace(tmp_path, path)
+        drop_journal(path)
+
+    @classmethod
+    def load(cls, path=MATRIX_FILENAME):
+        import numpy as np
+
+        with np.load(path) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            indptr, indices = data["indptr"], data["indices"].tolist()
+        matrix = cls(meta["skills"])
+        for row, (key, info) in enumerate(zip(meta["keys"], meta["jobs"])):
+            matrix.rows[key] = (info, tuple(indices[indptr[row]:indptr[row + 1]]))
+        matrix.built_at = meta["built_at"]
+        extractor = None
+        for record, _ in read_journal(path):  # jobs the pipeline added since the last full save
+            extractor = extractor or SkillExtractor()
+            matrix.add(record, extractor.extract_record(record))
+        return matrix
+
+
+def cv_skills(text, extractor=None):
+    """Skill names found in free CV text (or a comma / newline separated skill list)"""
+    extractor = extractor or SkillExtractor()
+    return [extractor.names[skill_id] for skill_id in extractor.extract(text)]
+
+
+def build_matrix(csv_paths=None, extractor=None):
+    """Extract skills from the scraped CSVs ({site: path}, default: registry CSVs) into a SkillMatrix"""
+    from job_index import read_site_csv
+
+    extractor = extractor or SkillExtractor()
+    csv_paths = csv_paths or {site: info["csv"] for site, info in SITES.items()}
+    matrix = SkillMatrix(extractor.names)
+    for site, csv_path in csv_paths.items():
+        if not os.path.exists(csv_path):
+            print(f"⚠️ {csv_path} not found, skipping {site}")
+            continue
+        start, count = time.perf_counter(), 0
+        for record in read_site_csv(site, csv_path):
+            matrix.add(record, extractor.extract_record(record))
+            count += 1
+        print(f"🧩 {count} {site} jobs from {csv_path} in {time.perf_counter() - start:.1f}s")
+    matrix.built_at = time.time()
+    return matrix
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Skill extraction and CV-to-job matching")
+    parser.add_argument("--matrix", default=MATRIX_FILENAME)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    build = subparsers.add_parser("build", help="extract skills from the scraped CSVs")
+    build.add_argument("--csv", nargs="+", metavar="SITE=PATH", help="CSV per site (default: registry paths)")
+
+    match = subparsers.add_parser("match", help="rank jobs for a CV")
+    cv = match.add_mutually_exclusive_group(required=True)
+    cv.add_argument("--skills", help="comma separated skill list")
+    cv.add_argument("--cv", help="text file with the CV")
+    match.add_argument("--top", type=int, default=20)
+    match.add_argument("--site", choices=list(SITES))
+    match.add_argument("--json", action="store_true")
+
+    top = subparsers.add_parser("top", help="most requested skills")
+    top.add_argument("--site", choices=list(SITES))
+    top.add_argument("--limit", type=int, default=20)
+
+    cooccur = subparsers.add_parser("cooccur", help="skills most often requested together with a skill")
+    cooccur.add_argument("skill")
+    cooccur.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        csv_paths = dict(item.split("=", 1) for item in args.csv) if args.csv else None
+        matrix = build_matrix(csv_paths)
+        matrix.save(args.matrix)
+        print(f"💾 Saved {len(matrix)} jobs x {len(matrix.skill_names)} skills "
+              f"({matrix.csr.nnz} entries) to {args.matrix}")
+        return
+
+    matrix = SkillMatrix.load(args.matrix)
+    if args.command == "match":
+        if args.cv:
+            with open(args.cv, "r", encoding="utf-8") as f:
+                skills = cv_skills(f.read())
+        else:
+            extractor = SkillExtractor()
+            skills = [extractor.names[skill_id] for skill_id in extractor.extract_list(args.skills)]
+        matrix.csr  # build before timing the match itself
+        start = time.perf_counter()
+        results = matrix.match(skills, args.top, site=args.site)
+        elapsed = time.perf_counter() - start
+        if args.json:
+            print(json.dumps(results, indent=2, ensure_ascii=False))
+            return
+        print(f"🧑‍💼 CV skills: {', '.join(skills) or 'none recognized'}")
+        print(f"🔍 Ranked {len(matrix)} jobs in {elapsed * 1000:.1f} ms\n")
+        for job in results:
+            print(f"{job['score']:5.2f}  {job['title']} | {job['company'] or '-'} | {job['site']} "
+                  f"| covers {job['coverage']:.0%}")
+            print(f"       ✅ {', '.join(job['matched'])}" + (f"   ❌ {', '.join(job['missing'])}"
+                                                         if job["missing"] else ""))
+            print(f"       🔗 {job['url']}")
+    elif args.command == "top":
+        for skill, count in matrix.top_skills(args.limit, args.site):
+            print(f"   {count:7d}  {skill}")
+    else:
+        print(f"🧩 {args.skill}: {matrix.job_count(args.skill)} jobs; most often requested with:")
+        for skill, count in matrix.cooccurrence(args.skill, args.limit):
+            print(f"   {count:7d}  {skill}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Capture evidence for pages that are slow to fetch or extract
+
+Most job pages parse in a few milliseconds, but some take much longer, such
+as Workinga pages with long ql-editor descriptions or CamHR postings with
+hundreds of requirement bullets. Averages hide them. The profiler is an
+opt-in hook around fetch_page and parse_job_page.
+
+    - keeps a rolling window of timings per (site, phase)
+    - samples the calling thread's stack while the call runs
+    - when a call takes longer than the window's percentile (default p95)
+      and at least twice the median, saves the page, its timings and the
+      stack samples, and re-runs the extractor on the same HTML under cProfile
+
+Each capture goes to <output_dir>/<site>/<job id>_<phase>/:
+    page.html      the HTML that was fetched or extracted
+    timings.json   seconds, threshold, window median, url
+    stacks.txt     collapsed stack samples (flamegraph.pl / speedscope format)
+    profile.prof   cProfile stats from the re-run (extract only; snakeviz, pstats)
+    profile.txt    the top functions by cumulative time
+
+captures.jsonl in the output directory lists every capture, and `report`
+summarizes the worst offenders by site and phase.
+
+Usage:
+    python slow_page_profiler.py crawl camhr --start 10611925 --end 10612100
+    python slow_page_profiler.py crawl workinga --base-url http://127.0.0.1:8765/workinga/job/{} --percentile 90
+    python slow_page_profiler.py report
+    python jobscrape.py crawl camhr --pool --profile-slow slow_pages
+"""
+import argparse
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from datetime import datetime
+
+from sites import SITES, get_parser, get_site, job_id_from_url
+
+OUTPUT_DIR = "slow_pages"
+PERCENTILE = 95
+MIN_SAMPLES = 30        # pages timed before anything counts as an outlier
+MIN_SLOWDOWN = 2.0      # ...and at least this many times the window median
+WINDOW = 1000           # recent timings per (site, phase) the percentile is taken over
+SAMPLE_INTERVAL = 0.002  # seconds between stack samples
+PROFILE_LINES = 30
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty sequence"""
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+class StackSampler:
+    """
+    Background thread that samples the stacks of threads inside track()
+
+    Stacks are stored collapsed ("module:function;module:function" from the
+    root down) with a count per stack, so cost is one dict update per sample.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.active = {}  # thread id -> Counter of collapsed stacks
+        self.lock = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = None
+
+    def track(self):
+        return _Tracking(self)
+
+    def _start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while True:
+            if not self.active:
+                self.wake.wait()
+                self.wake.clear()
+            frames = sys._current_frames()
+            with self.lock:
+                for thread_id, counts in self.active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None and thread_id != own_id:
+                        counts[collapse(frame)] += 1
+            time.sleep(self.interval)
+
+
+class _Tracking:
+    def __init__(self, sampler):
+        self.sampler = sampler
+        self.samples = Counter()
+
+    def __enter__(self):
+        self.sampler._start()
+        with self.sampler.lock:
+            self.sampler.active[threading.get_ident()] = self.samples
+        self.sampler.wake.set()
+        return self.samples
+
+    def __exit__(self, *exc):
+        with self.sampler.lock:
+            self.sampler.active.pop(threading.get_ident(), None)
+        return False
+
+
+def collapse(frame):
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SlowPageProfiler:
+    """
+    Time fetch and extract calls and save captures for the slow ones
+
+    Args:
+        output_dir: where captures and captures.jsonl go
+        percentile: a call slower than this percentile of its (site, phase) window is captured
+        min_samples: calls to time before capturing starts
+        min_slowdown: only capture calls at least this many times the window median
+        min_seconds: never capture calls faster than this, whatever the percentile
+        rerun_profile: re-run slow extractions under cProfile
+    """
+
+    def __init__(self, output_dir=OUTPUT_DIR, percentile=PERCENTILE, min_samples=MIN_SAMPLES,
+                 min_slowdown=MIN_SLOWDOWN, min_seconds=0.0,
+                 window=WINDOW, sample_interval=SAMPLE_INTERVAL, rerun_profile=True):
+        self.output_dir = output_dir
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_slowdown = min_slowdown
+        self.min_seconds = min_seconds
+        self.rerun_profile = rerun_profile
+        self.timings = defaultdict(lambda: deque(maxlen=window))
+        self.sampler = StackSampler(sample_interval)
+        self.lock = threading.Lock()
+        self.captured = 0
+
+    def fetch(self, site, session, url, **kwargs):
+        """fetching.fetch_page with timing; a slow fetch saves the response body and stack samples"""
+        from fetching import fetch_page
+
+        with self.sampler.track() as samples:
+            result = fetch_page(session, url, **kwargs)
+        self.observe(site, "fetch", result["elapsed"], url, result["html"], samples,
+                     {"status": result["status"], "error": result["error"]})
+        return result
+
+    def extract(self, site, parse, html, url, parser="html.parser"):
+        """Run parse(html, url, parser); a slow call saves the HTML, stack samples and a cProfile re-run"""
+        with self.sampler.track() as samples:
+            start = time.perf_counter()
+            record = parse(html, url, parser)
+            seconds = time.perf_counter() - start
+        rerun = (lambda: parse(html, url, parser)) if self.rerun_profile else None
+        self.observe(site, "extract", seconds, url, html, samples, {"parser": parser, "empty": record is None},
+                     rerun)
+        return record
+
+    def wrap_parser(self, site, parse):
+        """parse_job_page replacement with the same signature that goes through extract()"""
+        return lambda html, url, parser="html.parser": self.extract(site, parse, html, url, parser)
+
+    def observe(self, site, phase, seconds, url, html=None, samples=None, details=None, rerun=None):
+        """Record one timing; returns the capture directory when the call counted as slow"""
+        with self.lock:
+            window = self.timings[(site, phase)]
+            threshold = percentile(window, self.percentile) if len(window) >= self.min_samples else None
+            median = percentile(window, 50) if window else None
+            window.append(seconds)
+        if threshold is None or seconds <= max(threshold, median * self.min_slowdown, self.min_seconds):
+            return None
+        return self.save(site, phase, seconds, url, html, samples, dict(details or {}, threshold=threshold,
+                                                                         median=median), rerun)
+
+    def save(self, site, phase, seconds, url, html, samples, details, rerun=None):
+        name = f"{job_id_from_url(url) or 'page'}_{phase}"
+        capture_dir = os.path.join(self.output_dir, site, name)
+        os.makedirs(capture_dir, exist_ok=True)
+        if html:
+            mode, encoding = ("wb", None) if isinstance(html, bytes) else ("w", "utf-8")
+            with open(os.path.join(capture_dir, "page.html"), mode, encoding=encoding) as f:
+                f.write(html)
+        if samples:
+            with open(os.path.join(capture_dir, "stacks.txt"), "w", encoding="utf-8") as f:
+                for stack, count in samples.most_common():
+                    f.write(f"{stack} {count}\n")
+
+        top_function = None
+        if rerun is not None:
+            profile = cProfile.Profile()
+            profile.runcall(rerun)
+            profile.dump_stats(os.path.join(capture_dir, "profile.prof"))
+            text = io.StringIO()
+            stats = pstats.Stats(profile, stream=text).sort_stats("cumulative")
+            stats.print_stats(PROFILE_LINES)
+            with open(os.path.join(capture_dir, "profile.txt"), "w", encoding="utf-8") as f:
+                f.write(text.getvalue())
+            top_function = hottest_function(stats)
+
+        entry = {
+            "site": site, "phase": phase, "url": url, "seconds": round(seconds, 4),
+            "threshold": round(details.pop("threshold"), 4), "median": round(details.pop("median"), 4),
+            "bytes": len(html) if html else 0, "samples": sum(samples.values()) if samples else 0,
+            "top_function": top_function, "dir": capture_dir,
+            "captured_at": datetime.now().isoformat(timespec="seconds"), **details,
+        }
+        with open(os.path.join(capture_dir, "timings.json"), "w", encoding="utf-8") as f:
+            json.dump(entry, f, indent=2)
+        # One short line per write, so appends from several processes do not interleave
+        with self.lock, open(os.path.join(self.output_dir, "captures.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            self.captured += 1
+        print(f"🐢 Slow {phase} ({entry['seconds']:.3f}s vs p{self.percentile} {entry['threshold']:.3f}s): {url}")
+        return capture_dir
+
+
+def hottest_function(stats):
+    """The non-builtin function with the most time spent in its own body, as 'file:line(name)'"""
+    best = None
+    for (filename, line, name), (_, _, own_time, _, _) in stats.stats.items():
+        if filename.startswith("<") or filename == "~":
+            continue
+        if best is None or own_time > best[0]:
+            best = (own_time, f"{os.path.basename(filename)}:{line}({name})")
+    return best[1] if best else None
+
+
+def load_captures(output_dir=OUTPUT_DIR):
+    path = os.path.join(output_dir, "captures.jsonl")
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def summarize(captures, top=10):
+    """
+    Group captures by site and phase
+
+    Returns:
+        list of {"site", "phase", "captures", "worst_seconds", "median_slowdown", "top_functions", "offenders"}
+        with offenders being the `top` slowest captures of that group
+    """
+    groups = defaultdict(list)
+    for entry in captures:
+        groups[(entry["site"], entry["phase"])].append(entry)
+    summary = []
+    for (site, phase), entries in sorted(groups.items()):
+        entries.sort(key=lambda entry: entry["seconds"], reverse=True)
+        slowdowns = [entry["seconds"] / entry["median"] for entry in entries if entry["median"]]
+        functions = Counter(entry["top_function"] for entry in entries if entry.get("top_function"))
+        summary.append({
+            "site": site, "phase": phase, "captures": len(entries), "worst_seconds": entries[0]["seconds"],
+            "median_slowdown": round(percentile(slowdowns, 50), 1) if slowdowns else None,
+            "top_functions": functions.most_common(3), "offenders": entries[:top],
+        })
+    return summary
+
+
+def print_report(output_dir=OUTPUT_DIR, top=10):
+    summary = summarize(load_captures(output_dir), top)
+    if not summary:
+        print(f"⚠️ No captures in {output_dir}")
+        return summary
+    for group in summary:
+        slowdown = f", typically {group['median_slowdown']}x the median" if group["median_slowdown"] else ""
+        print(f"\n🐢 {group['site']} {group['phase']}: {group['captures']} slow pages{slowdown}")
+        for function, count in group["top_functions"]:
+            print(f"   🔥 {function} (hottest in {count})")
+        for entry in group["offenders"]:
+            print(f"   {entry['seconds']:8.3f}s  {entry['bytes'] / 1024:7.0f} KB  {entry['url']}")
+            print(f"             {entry['dir']}")
+    return summary
+
+
+def profile_crawl(site, job_ids, url_template=None, parser="html.parser", profiler=None):
+    """Fetch and extract pages one at a time through the profiler (no parallelism, so timings are clean)"""
+    from fetching import create_session
+
+    profiler = profiler or SlowPageProfiler()
+    url_template = url_template or get_site(site)["base_url"]
+    parse = get_parser(site)
+    session = create_session()
+    pages = jobs = 0
+    try:
+        for job_id in job_ids:
+            url = url_template.format(job_id)
+            result = profiler.fetch(site, session, url)
+            pages += 1
+            if result["html"] and profiler.extract(site, parse, result["html"], url, parser):
+                jobs += 1
+    finally:
+        session.close()
+    print(f"✅ {jobs} jobs from {pages} pages, {profiler.captured} slow page(s) captured in {profiler.output_dir}")
+    return profiler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Find and profile job pages that are slow to fetch or extract")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    crawl = subparsers.add_parser("crawl", help="crawl an ID range through the profiler")
+    crawl.add_argument("site", choices=list(SITES))
+    crawl.add_argument("--start", type=int, required=True)
+    crawl.add_argument("--end", type=int, required=True)
+    crawl.add_argument("--base-url", help="job URL template with {} for the ID")
+    crawl.add_argument("--parser", default="html.parser")
+    crawl.add_argument("--output-dir", default=OUTPUT_DIR)
+    crawl.add_argument("--percentile", type=float, default=PERCENTILE)
+    crawl.add_argument("--min-samples", type=int, default=MIN_SAMPLES)
+    crawl.add_argument("--min-slowdown", type=float, default=MIN_SLOWDOWN,
+                       help="only capture pages at least this many times the median")
+    crawl.add_argument("--min-seconds", type=float, default=0.0, help="ignore pages faster than this")
+
+    report = subparsers.add_parser("report", help="summarize captured slow pages")
+    report.add_argument("--output-dir", default=OUTPUT_DIR)
+    report.add_argument("--top", type=int, default=10)
+    report.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "report":
+        if args.json:
+            print(json.dumps(summarize(load_captures(args.output_dir), args.top), indent=2))
+        else:
+            print_report(args.output_dir, args.top)
+        return
+
+    profiler = SlowPageProfiler(args.output_dir, args.percentile, args.min_samples, args.min_slowdown,
+                                args.min_seconds)
+    step = 1 if args.end >= args.start else -1
+    profile_crawl(args.site, range(args.start, args.end + step, step), args.base_url, args.parser, profiler)
+    print_report(args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
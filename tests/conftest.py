@@ -0,0 +1,7 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The scripts are flat modules; the replay server lives with the benchmarks
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
@@ -0,0 +1,104 @@
+"""workinga_api against recorded Workinga responses served by benchmarks/replay_server.py"""
+import json
+
+import pytest
+
+from fetching import create_session, fetch_page
+from replay_server import ReplayServer
+from sites import SITES
+from workinga_api import NEXT_DATA, discover_from_html, parse_payload
+
+JOB_ID = 10755
+
+# Job object as the site's data endpoint and __NEXT_DATA__ carry it
+JOB = {
+    "id": JOB_ID,
+    "title": "Backend Developer",
+    "company": {"name": "Mekong Digital"},
+    "salary": "$800 - $1,200",
+    "numberOfPositions": 20240115,  # number-like, must not be read as a date
+    "office": {"name": "Head Office"},
+    "location": {"name": "Phnom Penh"},
+    "employmentType": {"name": "Full Time"},
+    "closingDate": "2025-06-01T00:00:00.000Z",
+    "responsibilities": "<p>Build REST APIs</p><p>- Review code</p>",
+    "requirements": "<ul><li>Python</li><li>PostgreSQL</li></ul>",
+}
+
+EXPECTED_ROW = {
+    "Job Title": "Backend Developer",
+    "Company Name": "Mekong Digital",
+    "Salary": "$800 - $1,200",
+    "Available": "20240115",
+    "Office": "Head Office",
+    "Location": "Phnom Penh",
+    "Employment Type": "Full Time",
+    "Closing Date": "01 Jun 2025",
+    "Job Responsibilities": "Build REST APIs • Review code",
+    "Job Requirements": "Python • PostgreSQL",
+}
+
+
+@pytest.fixture
+def replay(tmp_path):
+    """Replay server over a recordings dir with one Workinga job page and its API payload"""
+    site_dir = tmp_path / "workinga"
+    site_dir.mkdir()
+    state = {"buildId": "b1", "props": {"pageProps": {"job": JOB}}}
+    (site_dir / f"{JOB_ID}.html").write_text(
+        f'<html><body><div id="__next"></div><script id="__NEXT_DATA__" type="application/json">'
+        f"{json.dumps(state)}</script></body></html>", encoding="utf-8")
+    (site_dir / f"{JOB_ID}.json").write_text(json.dumps({"data": JOB}), encoding="utf-8")
+    manifest = {"pages": {
+        f"job/{JOB_ID}": {"file": f"{JOB_ID}.html"},
+        f"api/jobs/{JOB_ID}": {"file": f"{JOB_ID}.json", "content_type": "application/json"},
+    }}
+    (site_dir / "manifest.json").write_text(json.dumps(manifest), encoding="utf-8")
+
+    server = ReplayServer(recordings_dir=str(tmp_path))
+    base_url = server.start()
+    session = create_session()
+    yield f"{base_url}/workinga", session
+    session.close()
+    server.stop()
+
+
+def expected_row(url):
+    return dict(EXPECTED_ROW, Link=url)
+
+
+def test_api_payload_maps_to_csv_row(replay):
+    site_url, session = replay
+    job_url = f"{site_url}/job/{JOB_ID}"
+    result = fetch_page(session, f"{site_url}/api/jobs/{JOB_ID}")
+    assert result["status"] == 200
+
+    record = parse_payload(result["html"], job_url)
+
+    assert record.job_id == str(JOB_ID)
+    assert record.to_row(SITES["workinga"]["placeholder"]) == expected_row(job_url)
+
+
+def test_next_data_page_is_discovered_and_maps_to_the_same_row(replay):
+    site_url, session = replay
+    job_url = f"{site_url}/job/{JOB_ID}"
+    page = fetch_page(session, job_url)["html"]
+
+    found = discover_from_html(page, JOB_ID, job_url)
+    assert found["source"] == "__NEXT_DATA__"
+    assert found["url"].endswith("/_next/data/b1/workinga/job/{}.json")
+
+    # The Next.js data route returns the page state's props
+    state = json.loads(NEXT_DATA.search(page).group(1))
+    record = parse_payload(json.dumps(state["props"]), job_url)
+    assert record.to_row(SITES["workinga"]["placeholder"]) == expected_row(job_url)
+
+
+def test_missing_fields_get_the_placeholder_only_in_the_row():
+    job = {key: value for key, value in JOB.items() if key not in ("office", "closingDate")}
+
+    record = parse_payload(json.dumps({"data": job}), f"https://workingna.com/job/{JOB_ID}")
+
+    assert record.office is None and record.closing_date is None
+    row = record.to_row(SITES["workinga"]["placeholder"])
+    assert row["Office"] == row["Closing Date"] == "Not specified"
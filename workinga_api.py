@@ -0,0 +1,340 @@
+"""
+Browser-free Workinga scraping through the site's job data endpoint
+
+Workinga job pages are a client-rendered React app: the HTML is an empty
+shell and the job is fetched as JSON after the page loads. Instead of
+rendering the page and reading hashed MUI class names, this module
+
+    1. discovers the job-detail data URL once, either from embedded page
+       state (__NEXT_DATA__ or an API URL in the page scripts) or from the
+       network log of a single headless Chrome session,
+    2. saves it as a URL template in workinga_api.json, and
+    3. fetches that payload directly for each job ID and maps it onto
+       JobRecords, writing the same CSV as Workinga.py.
+
+The payload-to-column mapping is kept in the template file ("fields": column
+-> list of dotted key paths), so a schema change is a JSON edit.
+
+Usage:
+    python workinga_api.py discover --id 10755            # page state, falls back to --browser
+    python workinga_api.py discover --id 10755 --browser  # Chrome network log
+    python workinga_api.py crawl --start 10755 --end 11683
+"""
+import argparse
+import csv
+import html
+import json
+import os
+import re
+import time
+from datetime import datetime
+from urllib.parse import urljoin, urlparse
+
+from job_record import JobRecord
+from sites import SITES
+from Workinga import JobParser, ScraperConfig
+
+# Candidate key paths per CSV column, tried in order
+FIELD_PATHS = {
+    "Job Title": ["title", "jobTitle", "job_title", "position", "name"],
+    "Company Name": ["company.name", "companyName", "company_name", "employer.name", "company"],
+    "Salary": ["salary", "salaryRange", "salary_range", "salaryText"],
+    "Available": ["available", "hiring", "vacancies", "numberOfPositions", "number_of_positions"],
+    "Office": ["office.name", "office", "branch.name", "branch"],
+    "Location": ["location.name", "location", "province.name", "city.name"],
+    "Employment Type": ["employmentType.name", "employmentType", "employment_type", "jobType.name", "jobType"],
+    "Closing Date": ["closingDate", "closing_date", "deadline", "expiredAt", "expired_at", "expiryDate"],
+    "Job Responsibilities": ["responsibilities", "jobResponsibilities", "job_responsibilities", "description"],
+    "Job Requirements": ["requirements", "jobRequirements", "job_requirements"],
+}
+
+# Columns whose ISO timestamps are shown as dates on the page
+DATE_COLUMNS = {"Closing Date"}
+
+# CSV column -> canonical field of the JobRecord
+COLUMN_FIELDS = {column: field for field, column in SITES["workinga"]["fields"].items()}
+
+TITLE_KEYS = ("title", "jobTitle", "job_title", "position")
+BLOCK_TAGS = re.compile(r"<\s*(?:/p|/li|br\s*/?|/div|/h\d)\s*>", re.IGNORECASE)
+ANY_TAG = re.compile(r"<[^>]+>")
+NEXT_DATA = re.compile(r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+QUOTED_URL = re.compile(r"""["']((?:https?:)?[^"'\s<>]*?/[^"'\s<>]*)["']""")
+
+
+def lookup(payload, path):
+    """Follow a dotted key path through nested dicts; None if any step is missing"""
+    value = payload
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def find_job_object(payload):
+    """Return the first nested dict that looks like a job (has a title key), searching breadth-first"""
+    queue = [payload]
+    while queue:
+        value = queue.pop(0)
+        if isinstance(value, dict):
+            if any(isinstance(value.get(key), str) and value.get(key) for key in TITLE_KEYS):
+                return value
+            queue.extend(value.values())
+        elif isinstance(value, list):
+            queue.extend(value)
+    return None
+
+
+def rich_text(value):
+    """Flatten an HTML fragment (the site's rich-text fields) into " • "-joined lines"""
+    lines = []
+    for chunk in BLOCK_TAGS.split(value):
+        text = " ".join(html.unescape(ANY_TAG.sub(" ", chunk)).split())
+        text = text[1:].strip() if text.startswith(("-", "–")) else text
+        if text and text.lower() not in ("job detail", "not specified"):
+            lines.append(text)
+    return " • ".join(lines)
+
+
+def to_text(value, is_date=False):
+    """Render a payload value the way the rendered page shows it (is_date: a DATE_COLUMNS value)"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, dict):
+        return to_text(value.get("name") or value.get("title") or value.get("label"), is_date)
+    if isinstance(value, list):
+        items = [to_text(item, is_date) for item in value]
+        return " • ".join(item for item in items if item) or None
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    text = str(value)
+    if "<" in text and ">" in text:
+        return rich_text(text) or None
+    if is_date and "-" in text:
+        try:
+            # ISO timestamps become the "01 Jun 2025" style shown on the page; plain numbers
+            # ("20240115" vacancies or IDs) would parse too, hence the date columns and the "-"
+            return datetime.fromisoformat(text.replace("Z", "+00:00")).strftime("%d %b %Y")
+        except ValueError:
+            pass
+    return " ".join(text.split())
+
+
+def map_job(job, url, fields=None, config=ScraperConfig):
+    """Map a job object from the payload to a Workinga JobRecord (None if it has no content)"""
+    fields = fields or FIELD_PATHS
+    values = {}
+    for column, paths in fields.items():
+        if column not in COLUMN_FIELDS:  # template column the CSV does not have
+            continue
+        for path in paths:
+            text = to_text(lookup(job, path), column in DATE_COLUMNS)
+            if text:
+                values[COLUMN_FIELDS[column]] = text
+                break
+    record = JobRecord.build("workinga", url=url, **values)
+    return None if JobParser(config).is_empty_page(record) else record
+
+
+def parse_payload(text, url, fields=None, config=ScraperConfig):
+    """Parse a raw JSON response body into a JobRecord, or None for errors and empty jobs"""
+    try:
+        payload = json.loads(text)
+    except (TypeError, ValueError):
+        return None
+    job = find_job_object(payload)
+    return map_job(job, url, fields, config) if job else None
+
+
+def _template_from_url(url, job_id):
+    """Turn a concrete data URL into a template by replacing the job ID with {}"""
+    template, count = re.subn(rf"(?<!\d){job_id}(?!\d)", "{}", url)
+    return template if count == 1 else None
+
+
+def discover_from_html(page_html, job_id, page_url):
+    """
+    Look for the job data request in embedded page state
+
+    Returns:
+        dict with "url" (template) and "source", or None
+    """
+    match = NEXT_DATA.search(page_html)
+    if match:
+        try:
+            state = json.loads(match.group(1))
+        except ValueError:
+            state = None
+        if state and state.get("buildId") and find_job_object(state.get("props", {})):
+            parsed = urlparse(page_url)
+            data_url = f"{parsed.scheme}://{parsed.netloc}/_next/data/{state['buildId']}{parsed.path}.json"
+            template = _template_from_url(data_url, job_id)
+            if template:
+                return {"url": template, "source": "__NEXT_DATA__"}
+
+    for candidate in QUOTED_URL.findall(page_html):
+        if str(job_id) not in candidate or not ("api" in candidate or candidate.endswith(".json")):
+            continue
+        template = _template_from_url(urljoin(page_url, candidate), job_id)
+        if template:
+            return {"url": template, "source": "page script"}
+    return None
+
+
+def discover_from_network(job_id, config=ScraperConfig):
+    """Load one job page in headless Chrome and pick the JSON response that carries the job"""
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    driver = webdriver.Chrome(service=Service(config.CHROME_DRIVER_PATH), options=options)
+    try:
+        driver.get(config.BASE_URL.format(job_id))
+        time.sleep(max(config.WAIT_TIMEOUT, 3))  # let the app request its data
+        for entry in driver.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            if message.get("method") != "Network.responseReceived":
+                continue
+            response = message["params"]["response"]
+            if "json" not in response.get("mimeType", "") or str(job_id) not in response["url"]:
+                continue
+            try:
+                body = driver.execute_cdp_cmd("Network.getResponseBody",
+                                              {"requestId": message["params"]["requestId"]})["body"]
+            except Exception:
+                continue
+            template = _template_from_url(response["url"], job_id)
+            if template and parse_payload(body, response["url"], config=config):
+                return {"url": template, "source": "network log"}
+    finally:
+        driver.quit()
+    return None
+
+
+def discover(job_id, config=ScraperConfig, use_browser=False, session=None):
+    """
+    Find the job data URL template, check it returns a mappable job and save it
+
+    Returns:
+        the saved template dict, or None if no data endpoint was found
+    """
+    from fetching import create_session, fetch_page
+
+    session = session or create_session()
+    found = None
+    if not use_browser:
+        page = fetch_page(session, config.BASE_URL.format(job_id))
+        if page["html"]:
+            found = discover_from_html(page["html"], job_id, page["url"])
+    if not found:
+        print("🌐 No data URL in the page source, checking the browser's network log...")
+        found = discover_from_network(job_id, config)
+    if not found:
+        print(f"❌ Could not find a job data request for ID {job_id}")
+        return None
+
+    sample = fetch_page(session, found["url"].format(job_id))
+    if not parse_payload(sample["html"], config.BASE_URL.format(job_id), config=config):
+        print(f"❌ {found['url']} did not return a usable job payload (status {sample['status']})")
+        return None
+
+    template = dict(found, sample_id=job_id, discovered_at=datetime.now().isoformat(timespec="seconds"),
+                    fields=FIELD_PATHS)
+    save_template(template, config.API_TEMPLATE_FILE)
+    print(f"✅ Job data URL ({found['source']}): {found['url']}")
+    print(f"💾 Saved to {config.API_TEMPLATE_FILE}")
+    return template
+
+
+def save_template(template, path):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(template, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_template(config=ScraperConfig):
+    """The saved template, with config.API_URL (or $WORKINGA_API_URL) taking precedence over its URL"""
+    template = {"url": None, "fields": FIELD_PATHS}
+    if os.path.exists(config.API_TEMPLATE_FILE):
+        with open(config.API_TEMPLATE_FILE, "r", encoding="utf-8") as f:
+            template.update(json.load(f))
+    if config.API_URL:
+        template["url"] = config.API_URL
+    return template
+
+
+def fetch_jobs(config, template, session=None):
+    """Yield (job_id, JobRecord or None, HTTP status) for config.JOB_IDS, or the START_ID..END_ID range"""
+    from fetching import create_session, fetch_page
+
+    session = session or create_session()
+    job_ids = config.JOB_IDS if config.JOB_IDS is not None else range(config.START_ID, config.END_ID + 1)
+    for job_id in job_ids:
+        for attempt in range(config.MAX_RETRIES + 1):
+            result = fetch_page(session, template["url"].format(job_id))
+            if result["status"] is not None and result["status"] < 500:
+                break
+        yield job_id, parse_payload(result["html"], config.BASE_URL.format(job_id), template["fields"], config), \
+            result["status"]
+        time.sleep(config.DELAY)
+
+
+def crawl(config=None):
+    """Fetch every job ID from the data endpoint and append the rows to config.OUTPUT_FILENAME"""
+    config = config or ScraperConfig()
+    template = load_template(config)
+    if not template["url"]:
+        print("❌ No job data URL; run `python workinga_api.py discover` or set WORKINGA_API_URL")
+        return 0
+
+    print(f"🚀 Fetching Workinga jobs from {template['url']}")
+    file_exists = os.path.exists(config.OUTPUT_FILENAME)
+    scraped = skipped = 0
+    with open(config.OUTPUT_FILENAME, mode="a", newline="", encoding="utf-8-sig") as file:
+        writer = csv.DictWriter(file, fieldnames=config.COLUMNS)
+        if not file_exists:
+            writer.writeheader()
+        for job_id, record, status in fetch_jobs(config, template):
+            if record is None:
+                skipped += 1
+                print(f"⏩ {job_id}: skipped (status {status})")
+            else:
+                scraped += 1
+                writer.writerow(record.to_row(SITES["workinga"]["placeholder"]))
+                print(f"✅ {job_id}: {record['title']} | {record['company']}")
+
+    print(f"\n✅ Successful: {scraped} | ⏩ Skipped: {skipped}")
+    print(f"💾 Data saved to {config.OUTPUT_FILENAME}")
+    return scraped
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape Workinga through its job data endpoint")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    discover_parser = subparsers.add_parser("discover", help="find and save the job data URL template")
+    discover_parser.add_argument("--id", type=int, default=ScraperConfig.START_ID, help="a job ID that exists")
+    discover_parser.add_argument("--browser", action="store_true", help="use Chrome's network log directly")
+
+    crawl_parser = subparsers.add_parser("crawl", help="fetch jobs from the saved data URL")
+    crawl_parser.add_argument("--start", type=int)
+    crawl_parser.add_argument("--end", type=int)
+    crawl_parser.add_argument("--output")
+
+    args = parser.parse_args(argv)
+    config = ScraperConfig()
+    if args.command == "discover":
+        discover(args.id, config, args.browser)
+    else:
+        config.START_ID = args.start or config.START_ID
+        config.END_ID = args.end or config.END_ID
+        config.OUTPUT_FILENAME = args.output or config.OUTPUT_FILENAME
+        crawl(config)
+
+
+if __name__ == "__main__":
+    main()